@@ -1,17 +1,35 @@
 import random
 import logging
-from config import PERSONA
-from safety import SafetyGuard
-from analyzer import ScamAnalyzer
+from collections import Counter
+from config import PERSONA, STREAM_THRESHOLD, CONVERSATION_LIMITS, REPORT_DISPATCH, IOC_SETTINGS
+from safety import SafetyGuard, iter_chunks
+from analyzer import ScamAnalyzer, ConversationState
+from conversation_store import ConversationStore
+from dispatcher import ReportDispatcher, make_sink
+from iocs import extract_iocs
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [AGENT] - %(message)s')
 
 class HoneypotAgent:
-    def __init__(self):
-        self.conversation_history = {} # store history per conversation_id
-        self.classification_cache = {}
+    def __init__(self, store=None, dispatcher=None):
+        # Bounded, evicting per-conversation state (history, classification, scores)
+        self.store = store or ConversationStore(**CONVERSATION_LIMITS)
+        # Reports are rendered and delivered off the ingest path
+        self.dispatcher = dispatcher or ReportDispatcher(
+            sink=make_sink(REPORT_DISPATCH["sink"], REPORT_DISPATCH["directory"], REPORT_DISPATCH["url"]),
+            coalesce_window=REPORT_DISPATCH["coalesce_window"],
+            max_pending=REPORT_DISPATCH["max_pending"],
+            workers=REPORT_DISPATCH["workers"],
+            max_retries=REPORT_DISPATCH["max_retries"]
+        )
         self.analyzer = ScamAnalyzer()
-        self.sophistication_cache = {} # store sophistication score per conv_id
+
+        # Read-only dict-style views, keyed by conversation_id
+        self.conversation_history = self.store.view("messages")
+        self.classification_cache = self.store.view("classification")
+        self.sophistication_cache = self.store.view("sophistication")
+        self.analysis_state = self.store.view("analysis")
+        self.ioc_cache = self.store.view("iocs")
 
     def ingest(self, message):
         """
@@ -21,24 +39,29 @@ class HoneypotAgent:
         text = message['text']
         
         # 1. Redact incoming PII immediately for storage/logs
-        safe_text = SafetyGuard.redact_pii(text)
+        if len(text) > STREAM_THRESHOLD:
+            safe_text = "".join(SafetyGuard.redact_pii_stream(iter_chunks(text)))
+        else:
+            safe_text = SafetyGuard.redact_pii(text)
         logging.info(f"Ingested from {conv_id}: {safe_text}")
         
-        if conv_id not in self.conversation_history:
-            self.conversation_history[conv_id] = []
-        
-        self.conversation_history[conv_id].append({"role": "scammer", "content": safe_text})
+        conv = self.store.append(conv_id, "scammer", safe_text)
         
         # 2. Classify (Scam vs Benign)
         classification = self._classify(safe_text)
-        self.classification_cache[conv_id] = classification
+        conv.classification = classification
         
-        # 3. Analyze Sophistication
-        score, category, neuro_matrix = self.analyzer.analyze_behavior(self.conversation_history[conv_id])
-        self.sophistication_cache[conv_id] = {"score": score, "category": category, "matrix": neuro_matrix}
+        # 3. Analyze Sophistication (incremental: only the new message is processed)
+        if conv.analysis is None:
+            conv.analysis = ConversationState()
+        self.analyzer.update_state(conv.analysis, safe_text)
+        result = self.analyzer.analyze_state(conv.analysis)
+        conv.sophistication = {"score": result.score, "category": result.classification,
+                               "intent": result.intent, "matrix": result.neuro_matrix}
         
-        # 4. Extract IOCs
-        self._extract_iocs(safe_text)
+        # 4. Extract IOCs from the redacted text (PII stays out of reports), unless
+        # raw evidence was explicitly enabled (IOC_RAW_EVIDENCE=1)
+        self._extract_iocs(conv, text if IOC_SETTINGS["raw_evidence"] else safe_text)
 
         # 5. AUTOMATED REPORTING (New)
         if classification in ["scam", "likely_scam"]:
@@ -48,12 +71,18 @@ class HoneypotAgent:
 
     def report_to_cyber_cell(self, conversation_id, threat_level):
         """
-        Simulates sending a formal report (JSON + PDF) to the Cyber Cell.
+        Queues a formal report (JSON + PDF) for the Cyber Cell. Returns immediately;
+        repeats for the same conversation and threat level are merged or dropped.
         """
-        logging.info(f"🚨 [AUTO-REPORT] High threat detected for {conversation_id} ({threat_level})")
-        logging.info(f"📤 [AUTO-REPORT] Generating JSON metadata...")
-        logging.info(f"📄 [AUTO-REPORT] Generating Evidence_Report_{conversation_id}.pdf...")
-        logging.info(f"✅ [AUTO-REPORT] Successfully transmitted to Cyber Cell reporting portal.")
+        conv = self.store.get(conversation_id)
+        if conv is None:
+            return False
+        transcript = list(conv.messages)  # at most max_messages references
+        iocs = [ioc._asdict() for ioc in conv.iocs or ()]
+        queued = self.dispatcher.submit(conversation_id, threat_level, transcript, conv.sophistication, iocs)
+        if queued:
+            logging.info(f"🚨 [AUTO-REPORT] High threat detected for {conversation_id} ({threat_level})")
+        return queued
 
     def _classify(self, text):
         """
@@ -72,12 +101,16 @@ class HoneypotAgent:
             
         return "benign"
 
-    def _extract_iocs(self, text):
+    def _extract_iocs(self, conv, text):
         """
-        Extracts non-sensitive IOCs like URLs.
+        Adds the message's typed indicators to the conversation (each one once,
+        capped by the store) and returns the new ones. Only counts are logged,
+        never the values.
         """
-        if "http" in text:
-             logging.info(f"IOC Captured [URL]: {text}") 
+        new = self.store.add_iocs(conv, extract_iocs(text))
+        if new:
+            logging.info(f"IOC Captured: {dict(Counter(ioc.type for ioc in new))}")
+        return new
 
     def generate_response(self, conversation_id):
         """
@@ -97,7 +130,7 @@ class HoneypotAgent:
             response = "I'm not comfortable with that."
             
         # Log our response
-        self.conversation_history[conversation_id].append({"role": "agent", "content": response})
+        self.store.append(conversation_id, "agent", response)
         logging.info(f"Responding to {conversation_id}: {response}")
         return response
 
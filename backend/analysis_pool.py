@@ -0,0 +1,210 @@
+"""
+Executors for ScamAnalyzer work.
+
+TextBlob tokenization and pattern sentiment are pure Python and hold the GIL,
+so extra request threads don't add analysis throughput. In "process" mode,
+requests are micro-batched and scored on a pool of warm worker processes,
+each with its own analyzer, lexicon index and loaded corpora.
+
+Modes:
+- inline:  score in the calling thread (default, lowest latency on one core)
+- thread:  batches on a thread pool (mainly a baseline for the benchmark)
+- process: batches on a spawned process pool
+
+A pool that breaks (a worker crashed or was killed) is replaced on the next
+submit; callers wait at most result_timeout seconds for any result.
+"""
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from analyzer import ScamAnalyzer, ensure_corpora
+
+WARMUP_HISTORY = [{"role": "scammer", "content": "Warm-up message, please ignore."}]
+
+# Per worker process analyzer, created by the pool initializer
+_worker_analyzer = None
+
+def _init_worker():
+    global _worker_analyzer
+    logging.disable(logging.INFO)  # workers would otherwise log every scored message
+    ensure_corpora()
+    _worker_analyzer = ScamAnalyzer()
+    _worker_analyzer.analyze_many([WARMUP_HISTORY])  # loads tokenizers and the sentiment lexicon
+
+def _analyze_batch(histories):
+    return _worker_analyzer.analyze_many(histories)
+
+def _worker_ready():
+    return True
+
+class AnalysisExecutor:
+    """
+    Scores conversation histories in the configured mode.
+    analyze() blocks the caller until its result is ready; in pooled modes
+    concurrent callers are grouped into batches of up to max_batch, waiting at
+    most batch_window seconds for a batch to fill.
+    """
+
+    def __init__(self, mode="inline", workers=2, max_batch=32, batch_window=0.002, analyzer=None,
+                 result_timeout=30.0):
+        self.mode = mode
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.result_timeout = result_timeout
+        self.analyzer = analyzer or ScamAnalyzer()
+        self.pool = None
+        self.pool_lock = threading.Lock()  # serializes pool replacement
+        self.requests = queue.Queue()
+        self.batcher = None
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.pool_restarts = 0
+
+    def start(self):
+        """
+        Spins up the worker pool and waits until every worker is warm.
+        """
+        if self.mode == "inline" or self.pool is not None:
+            return
+        self.pool = self._create_pool()
+        self.batcher = threading.Thread(target=self._batch_loop, name="analysis-batcher", daemon=True)
+        self.batcher.start()
+        logging.info(f"[NLP Core] {self.mode} analysis pool ready ({self.workers} workers)")
+
+    def _create_pool(self):
+        if self.mode != "process":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   mp_context=multiprocessing.get_context("spawn"))
+        # One trivial task per worker forces every process through the initializer now
+        for f in [pool.submit(_worker_ready) for _ in range(self.workers)]:
+            f.result()
+        return pool
+
+    def stop(self):
+        if self.pool is None:
+            return
+        self.requests.put(None)
+        self.batcher.join()
+        self.pool.shutdown(wait=True)
+        self.pool = None
+
+    def _run_batch(self, histories):
+        """
+        Submits one batch, replacing the pool once if it turns out to be broken.
+        Scores inline if the executor was stopped meanwhile.
+        """
+        pool = self.pool
+        if pool is not None:
+            try:
+                return self._submit(pool, histories)
+            except BrokenExecutor as e:
+                logging.warning(f"[NLP Core] Analysis pool broken, restarting workers: {e}")
+                pool = self._replace_pool(pool)
+        if pool is None:
+            done = Future()
+            done.set_result(self.analyzer.analyze_many(histories))
+            return done
+        return self._submit(pool, histories)
+
+    def _submit(self, pool, histories):
+        if self.mode == "process":
+            return pool.submit(_analyze_batch, histories)
+        return pool.submit(self.analyzer.analyze_many, histories)
+
+    def _replace_pool(self, broken):
+        with self.pool_lock:
+            if self.pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._create_pool()
+                with self.lock:
+                    self.pool_restarts += 1
+            return self.pool
+
+    def analyze(self, history):
+        """
+        Returns the AnalysisResult for one history.
+        """
+        if self.mode == "inline" or self.pool is None:
+            return self.analyzer.analyze(history)
+        future = Future()
+        self.requests.put((history, future))
+        return future.result(timeout=self.result_timeout)
+
+    def analyze_many(self, histories):
+        """
+        Scores many histories, spread over the workers in max_batch chunks.
+        """
+        if self.mode == "inline" or self.pool is None:
+            return self.analyzer.analyze_many(histories)
+        chunks = [histories[i:i + self.max_batch] for i in range(0, len(histories), self.max_batch)]
+        futures = [self._run_batch(chunk) for chunk in chunks]
+        self._count(len(chunks), len(histories))
+        return [r for f in futures for r in f.result(timeout=self.result_timeout)]
+
+    def _batch_loop(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.requests.put(None)  # finish this batch, then stop
+                    break
+                batch.append(item)
+            self._count(1, len(batch))
+            try:
+                pending = self._run_batch([h for h, _ in batch])
+            except Exception as e:
+                # Never let a failed submit take the batcher down with it
+                logging.error(f"[NLP Core] Could not submit analysis batch: {e}")
+                self._fail(batch, e)
+                continue
+            pending.add_done_callback(lambda done, batch=batch: self._deliver(batch, done))
+
+    def _deliver(self, batch, done):
+        try:
+            results = done.result()
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _fail(self, batch, error):
+        with self.lock:
+            self.failed_batches += 1
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _count(self, batches, items):
+        with self.lock:
+            self.batches += batches
+            self.items += items
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers if self.mode != "inline" else 0,
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "failed_batches": self.failed_batches,
+                "pool_restarts": self.pool_restarts
+            }
@@ -1,8 +1,186 @@
 ﻿import re
 import logging
 import math
-from textblob import TextBlob
-from collections import Counter
+from collections import Counter, deque, namedtuple
+from feature_cache import FeatureCache
+from lexicon import LexiconIndex
+from config import LEXICONS, PHRASE_MARKERS
+
+# Everything the NLP core needs from a single scammer message. Computed once per
+# message and folded into a ConversationState, never recomputed on later turns.
+MessageFeatures = namedtuple("MessageFeatures", [
+    "words",            # lower-cased tokens (tuple of str)
+    "urgency_tokens",   # time compression + coercion hits
+    "term_counts",      # lexicon category -> hits
+    "phrase_counts",    # phrase marker -> substring occurrences
+    "subjectivity",
+    "sentiment_tokens", # pattern sentiment tokens, fed to the conversation's SentimentStream
+])
+
+# Outcome of one analysis. Built fresh per call and never stored on the analyzer,
+# so a shared ScamAnalyzer can serve concurrent requests.
+AnalysisResult = namedtuple("AnalysisResult", ["score", "classification", "intent", "neuro_matrix"])
+
+def empty_result():
+    return AnalysisResult(0.0, "unknown", "unknown", {})
+
+# NLTK data used by TextBlob, with the resource path nltk.data.find expects
+NLTK_CORPORA = {
+    "punkt_tab": "tokenizers/punkt_tab",
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+    "brown": "corpora/brown",
+    "wordnet": "corpora/wordnet"
+}
+
+def ensure_corpora():
+    """
+    Best effort corpora download, skipped if it fails. Meant to run once per process.
+    """
+    import nltk
+
+    for name, path in NLTK_CORPORA.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            try:
+                nltk.download(name, quiet=True)
+            except Exception as e:
+                logging.warning(f"[NLP Core] Could not download NLTK corpus '{name}': {e}")
+
+# Longest possible _structural_link_check match ("download" + 30 + "attachment").
+# Keeping this much of the previous text lets the check see matches that
+# straddle two messages without holding on to the whole conversation.
+LINK_WINDOW = 64
+
+# Per-conversation state is capped so a long-running conversation uses flat memory.
+# Past the caps, escalation and the urgency mean look at the last URGENCY_WINDOW
+# messages only, and vocabulary richness counts at most MAX_UNIQUE_WORDS words.
+URGENCY_WINDOW = 256
+MAX_UNIQUE_WORDS = 10000
+
+def pattern_sentiment():
+    """
+    TextBlob's pattern sentiment lexicon (loaded on first use, like TextBlob itself).
+    """
+    from textblob.en import sentiment
+    return sentiment
+
+_emoticon_polarity = None
+
+def emoticon_polarity():
+    """
+    {emoticon: polarity}, keeping the first EMOTICONS entry that matches like pattern does.
+    """
+    global _emoticon_polarity
+    if _emoticon_polarity is None:
+        from textblob._text import EMOTICONS
+        table = {}
+        for (_, polarity), emoticons in EMOTICONS.items():
+            for e in emoticons:
+                table.setdefault(e.lower(), polarity)
+        _emoticon_polarity = table
+    return _emoticon_polarity
+
+class SentimentStream:
+    """
+    TextBlob's pattern sentiment over a whole conversation, fed one message at a time.
+    Gives the same polarity/subjectivity as scoring the messages joined with spaces:
+    the open assessment and any pending modifier or negation carry over into the
+    next message ("very" ending one message, "!!!" starting the next).
+    Mirrors pattern's Sentiment.assessments with pos=None, as TextBlob calls it.
+    """
+    __slots__ = ("polarity_sum", "subjectivity_sum", "closed", "last", "modifier", "negation")
+
+    def __init__(self):
+        self.polarity_sum = 0.0       # finalized assessments only
+        self.subjectivity_sum = 0.0
+        self.closed = 0
+        self.last = None              # [polarity, subjectivity, intensity, negated], still modifiable
+        self.modifier = None
+        self.negation = None
+
+    def feed(self, tokens):
+        from textblob._text import PUNCTUATION
+        lexicon = pattern_sentiment()
+        for w in tokens:
+            entry = lexicon[w] if w in lexicon else None
+            if entry is not None and None in entry:
+                p, s, i = entry[None]
+                # Known word, alone ("good") or modified ("really good")
+                if self.modifier is None:
+                    self._open(p, s, i)
+                else:
+                    last = self.last
+                    last[0] = max(-1.0, min(p * last[2], +1.0))
+                    last[1] = max(-1.0, min(s * last[2], +1.0))
+                    last[2] = i
+                # Negated ("not really good")
+                if self.negation is not None:
+                    self.last[2] = 1.0 / self.last[2]
+                    self.last[3] = True
+                self.modifier = w if any(map(entry.__contains__, lexicon.modifiers)) else None
+                self.negation = w if w in lexicon.negations else None
+            else:
+                # Unknown word; negations survive small words ("not a good")
+                if w in lexicon.negations:
+                    self.negation = w
+                elif self.negation and len(w.strip("'")) > 1:
+                    self.negation = None
+                # "really not good"
+                if self.negation is not None and self.modifier is not None and lexicon.modifier(self.modifier):
+                    self.last[3] = True
+                    self.negation = None
+                elif self.modifier and len(w) > 2:
+                    self.modifier = None
+                # Exclamation marks boost the previous assessment
+                if w == "!" and self.last is not None:
+                    self.last[0] = max(-1.0, min(self.last[0] * 1.25, +1.0))
+                if w == "(!)":
+                    self._open(0.0, 1.0, 1.0)
+                if w.isalpha() is False and len(w) <= 5 and w not in PUNCTUATION:
+                    p = emoticon_polarity().get(w)
+                    if p is not None:
+                        self._open(p, 1.0, 1.0)
+        return self
+
+    def _open(self, p, s, i):
+        if self.last is not None:
+            self.polarity_sum += self._final_polarity()
+            self.subjectivity_sum += self.last[1]
+            self.closed += 1
+        self.last = [p, s, i, False]
+
+    def _final_polarity(self):
+        # "not good" = slightly bad, "not bad" = slightly good
+        return self.last[0] * -0.5 if self.last[3] else self.last[0]
+
+    def polarity(self):
+        if self.last is None:
+            return 0.0
+        return (self.polarity_sum + self._final_polarity()) / float(self.closed + 1)
+
+    def subjectivity(self):
+        if self.last is None:
+            return 0.0
+        return (self.subjectivity_sum + self.last[1]) / float(self.closed + 1)
+
+class ConversationState:
+    """
+    Running accumulators for one conversation.
+    Lets the analyzer score a new message without re-processing the history.
+    """
+
+    def __init__(self):
+        self.message_count = 0
+        self.urgency_graph = deque(maxlen=URGENCY_WINDOW)
+        self.term_counts = Counter()
+        self.phrase_counts = Counter()
+        self.total_words = 0
+        self.unique_words = set()
+        self.sentiment = SentimentStream()
+        self.kindly = False
+        self.link_hit = False
+        self.text_tail = ""
 
 class ScamAnalyzer:
     """
@@ -11,37 +189,225 @@ class ScamAnalyzer:
     and Dynamic Coercion Escalation tracking.
     """
     
-    def __init__(self):
-        self.sophistication_score = 0.0
-        self.intent = "unknown"
+    def __init__(self, feature_cache_size=4096, lexicons=None, phrase_markers=None):
+        # Only configuration and thread-safe caches live on the instance; every
+        # analysis result is returned, never stored
+        self.feature_cache = FeatureCache(feature_cache_size)
         
-        # Vectorized Topic Lexicons (instead of binary triggers)
-        self.lexicons = {
-            "financial_assets": ["money", "card", "bank", "transfer", "wire", "deposit", "payment", "fee", "charge", "cost", "dollar", "rupee", "usd", "cash", "crypto", "btc", "wallet", "usdt", "eth", "coin"],
-            "identity_assets": ["password", "pin", "otp", "code", "credential", "login", "ssn", "identity", "account", "social", "verification", "phrase", "seed"],
-            "coercion_vectors": ["police", "lawsuit", "jail", "arrest", "warrant", "legal", "court", "suspended", "blocked", "banned", "fbi", "interpol", "frozen", "investigate", "seized"],
-            "time_compression": ["urgent", "immediately", "now", "hurry", "fast", "seconds", "expires", "deadline", "today", "quick", "asap", "limited", "soon"],
-            "action_verbs": ["send", "pay", "give", "share", "tell", "click", "download", "install", "submit", "verify", "confirm", "provide"]
-        }
+        # Vectorized Topic Lexicons (instead of binary triggers), compiled once
+        self.lexicons = LEXICONS if lexicons is None else lexicons
+        self.phrase_markers = PHRASE_MARKERS if phrase_markers is None else phrase_markers
+        self.lexicon_index = LexiconIndex(self.lexicons, self.phrase_markers)
+
+    def analyze(self, history):
+        """
+        Scores a full conversation history and returns an AnalysisResult.
+        Pure and reentrant: equivalent to folding every scammer message into a
+        fresh ConversationState.
+        """
+        state = ConversationState()
+        for m in history or []:
+            if m["role"] == "scammer":
+                self.update_state(state, m["content"])
+        return self.analyze_state(state)
 
     def analyze_behavior(self, history):
-        if not history:
-            return 0.0, "unknown"
+        """
+        Tuple form of analyze(): (score, classification, neuro_matrix).
+        """
+        result = self.analyze(history)
+        return result.score, result.classification, result.neuro_matrix
+
+    def analyze_many(self, histories):
+        """
+        Bulk entry point for backfills: scores many histories at once.
+        Per-message features still come from the (cached) scalar path; the scoring
+        math runs as NumPy array ops over a document x lexicon count matrix.
+        Results are identical to analyze() and returned in input order.
+        """
+        import numpy as np
+        states = []
+        for history in histories:
+            state = ConversationState()
+            for m in history or []:
+                if m["role"] == "scammer":
+                    self.update_state(state, m["content"])
+            states.append(state)
+
+        results = [None] * len(states)
+        live = [i for i, s in enumerate(states) if s.message_count]
+        for i, s in enumerate(states):
+            if not s.message_count:
+                results[i] = empty_result()
+        if not live:
+            return results
+
+        categories = self.lexicon_index.categories
+        docs = [states[i] for i in live]
+        counts = np.array([[s.term_counts[c] for c in categories] for s in docs], dtype=np.float64)
+        total_words = np.array([max(s.total_words, 1) for s in docs], dtype=np.int64)
+        crypto_hits = np.array([s.phrase_counts["crypto"] + s.phrase_counts["btc"] + s.phrase_counts["wallet"] for s in docs], dtype=np.float64)
+        lottery_hits = np.array([s.phrase_counts["won"] + s.phrase_counts["prize"] + s.phrase_counts["lottery"] for s in docs], dtype=np.float64)
+
+        # Urgency graph reductions stay in Python so the float summation order matches the scalar path
+        graphs = [list(s.urgency_graph) for s in docs]
+        graph_len = np.array([len(g) for g in graphs], dtype=np.int64)
+        half = graph_len // 2
+        early_avg = np.array([sum(g[:h]) / max(h, 1) for g, h in zip(graphs, half)])
+        late_avg = np.array([sum(g[h:]) / max(n - h, 1) for g, h, n in zip(graphs, half, graph_len)])
+        urgency_mean = np.array([sum(g) / max(len(g), 1) for g in graphs])
+        polarity = np.array([s.sentiment.polarity() for s in docs])
+        richness = np.array([len(s.unique_words) for s in docs]) / total_words
+        kindly = np.array([s.kindly for s in docs])
+        link_hit = np.array([s.link_hit for s in docs])
+
+        escalation = np.where((graph_len >= 3) & (late_avg > early_avg + 0.1), 1.4, 1.0)
+
+        tf = counts / total_words[:, None]
+        tf_finance = tf[:, categories.index("financial_assets")]
+        tf_identity = tf[:, categories.index("identity_assets")]
+        tf_coercion = tf[:, categories.index("coercion_vectors")]
+        tf_action = tf[:, categories.index("action_verbs")]
+
+        intents = ["FINANCIAL_THEFT", "GENERAL_PHISHING", "AUTHORITY_IMPERSONATION", "CRYPTO_SCAM", "LOTTERY_SCAM"]
+        vector_scores = np.column_stack([
+            (tf_finance * 1.5) + (tf_action * 1.0),
+            (tf_identity * 1.8) + (tf_action * 1.0),
+            (tf_coercion * 2.0) + (tf_finance * 0.5),
+            (tf_finance * 1.2) + crypto_hits / total_words * 3.0,
+            (tf_finance * 0.8) + lottery_hits / total_words * 2.5
+        ])
+        dominant = vector_scores.argmax(axis=1)
+        magnitude = vector_scores[np.arange(len(docs)), dominant]
+
+        short_burst = (total_words <= 8) & (magnitude > 0.4)
+        base_risk = np.minimum(magnitude * np.where(short_burst, 15.0, 10.0), np.where(short_burst, 0.85, 0.6))
+        risk = base_risk * escalation
+        risk = np.where(polarity < -0.3, risk + 0.2, risk)
+
+        sophistication = np.where(richness > 0.6, 0.5 + 0.2, 0.5)
+        sophistication = np.where(kindly, sophistication - 0.3, sophistication)
+        score = np.maximum(0.0, np.minimum(1.0, risk + (sophistication * 0.2)))
+
+        malicious_link = (magnitude < 0.05) & link_hit
+        is_scam = (risk > 0.65) | malicious_link
+        is_likely = ~is_scam & (risk > 0.35)
+        score = np.where(is_scam, np.maximum(score, 0.90), score)
+        score = np.where(is_likely, np.maximum(score, 0.70), score)
 
-        scammer_msgs = [m["content"] for m in history if m["role"] == "scammer"]
-        if not scammer_msgs:
-            return 0.0, "unknown"
+        financial_node = np.minimum(1.0, tf_finance * 4.0)
+        coercion_node = np.minimum(1.0, tf_coercion * 5.0 * escalation)
+        urgency_node = np.minimum(1.0, urgency_mean * 3.0)
+
+        for row, i in enumerate(live):
+            if is_scam[row]:
+                classification = "scam"
+            elif is_likely[row]:
+                classification = "likely_scam"
+            else:
+                classification = "benign"
+
+            if classification == "benign":
+                intent = "GENERAL_INQUIRY"
+            elif magnitude[row] < 0.05:
+                intent = "MALICIOUS_LINK" if link_hit[row] else "GENERAL_INQUIRY"
+            else:
+                intent = intents[dominant[row]]
+
+            results[i] = AnalysisResult(
+                score=float(score[row]),
+                classification=classification,
+                intent=intent,
+                neuro_matrix={
+                    "financial_risk_node": float(financial_node[row]),
+                    "coercion_risk_node": float(coercion_node[row]),
+                    "urgency_spike_node": float(urgency_node[row]),
+                    "deception_complexity_node": float(score[row])
+                }
+            )
+
+        logging.info(f"[NLP Core] Batch analyzed {len(histories)} histories ({len(live)} with scammer messages)")
+        return results
+
+    def update_state(self, state, content):
+        """
+        Incremental entry point: folds one new scammer message into `state`.
+        Only this message is tokenized and scored.
+        """
+        text = content.lower()
+        features = self._message_features(text)
 
         # 1. Psychological Urgency Graphing
-        # Analyze the *rate of change* in urgency over the conversation
-        urgency_graph = []
-        for msg in scammer_msgs:
-            blob = TextBlob(msg.lower())
-            # Count time compression + coercion tokens in this specific message
-            urgency_tokens = sum(1 for word in blob.words if word in self.lexicons["time_compression"] or word in self.lexicons["coercion_vectors"])
-            # Normalize by message length to find word density, plus base sentiment subjectivity
-            density = (urgency_tokens / max(len(blob.words), 1)) + (blob.sentiment.subjectivity * 0.2)
-            urgency_graph.append(density)
+        # Normalize by message length to find word density, plus base sentiment subjectivity
+        density = (features.urgency_tokens / max(len(features.words), 1)) + (features.subjectivity * 0.2)
+        state.urgency_graph.append(density)
+
+        # 2. Lexicon / vocabulary accumulators
+        state.term_counts.update(features.term_counts)
+        state.phrase_counts.update(features.phrase_counts)
+        state.total_words += len(features.words)
+        if len(state.unique_words) < MAX_UNIQUE_WORDS:
+            state.unique_words.update(features.words)
+            while len(state.unique_words) > MAX_UNIQUE_WORDS:
+                state.unique_words.pop()  # only the count is read, any word can go
+        state.sentiment.feed(features.sentiment_tokens)
+
+        # 3. Raw text markers (messages are joined with a space in the batch view)
+        window = state.text_tail + " " + text if state.message_count else text
+        state.kindly = state.kindly or "kindly" in text
+        state.link_hit = state.link_hit or self._structural_link_check(window) == "MALICIOUS_LINK"
+        state.text_tail = window[-LINK_WINDOW:]
+        state.message_count += 1
+        return state
+
+    def _message_features(self, text):
+        normalized = FeatureCache.normalize(text)
+        key = FeatureCache.key(normalized)
+        features = self.feature_cache.get(key)
+        if features is None:
+            features = self._compute_features(normalized)
+            self.feature_cache.put(key, features)
+        return features
+
+    def _compute_features(self, text):
+        # TextBlob (and NLTK behind it) is only loaded when the first message is
+        # scored, so importing the analyzer stays cheap for every API worker
+        from textblob import TextBlob
+
+        blob = TextBlob(text)
+        words = tuple(str(w) for w in blob.words)
+        # Same tokens TextBlob's sentiment pass uses; messages joined with a space
+        # tokenize to the concatenation of these
+        sentiment_tokens = tuple(w.lower() for w in " ".join(pattern_sentiment().tokenizer(text)).split())
+
+        # One dictionary probe per token for every lexicon + urgency (time compression / coercion)
+        term_counts, urgency_tokens = self.lexicon_index.count_tokens(words)
+        phrase_counts = self.lexicon_index.count_phrases(text)
+
+        return MessageFeatures(
+            words=words,
+            urgency_tokens=urgency_tokens,
+            term_counts=term_counts,
+            phrase_counts=phrase_counts,
+            subjectivity=SentimentStream().feed(sentiment_tokens).subjectivity(),
+            sentiment_tokens=sentiment_tokens,
+        )
+
+    def evaluate(self, state):
+        """
+        Tuple form of analyze_state(): (score, classification, neuro_matrix).
+        """
+        result = self.analyze_state(state)
+        return result.score, result.classification, result.neuro_matrix
+
+    def analyze_state(self, state):
+        """
+        Turns the accumulated state into an AnalysisResult. Reads `state` only.
+        """
+        if not state.message_count:
+            return empty_result()
+
+        urgency_graph = list(state.urgency_graph)
 
         # Detect Exponential Escalation (scammer getting impatient/aggressive)
         escalation_multiplier = 1.0
@@ -54,26 +420,23 @@ class ScamAnalyzer:
                 escalation_multiplier = 1.4 # 40% Threat Spike
                 logging.info("[NLP Core] Coercion Escalation Detected: Scammer is applying pressure.")
 
-        # 2. Vectorized Intent Processing (TF-IDF approximation for contexts)
-        full_text = " ".join(scammer_msgs).lower()
-        blob = TextBlob(full_text)
-        words = blob.words
-        word_freq = Counter(words)
-        total_words = max(len(words), 1)
+        # Vectorized Intent Processing (TF-IDF approximation for contexts)
+        total_words = max(state.total_words, 1)
+        phrases = state.phrase_counts
 
         # Calculate Lexicon Densities (Term Frequencies)
-        tf_finance = sum(word_freq[w] for w in self.lexicons["financial_assets"] if w in word_freq) / total_words
-        tf_identity = sum(word_freq[w] for w in self.lexicons["identity_assets"] if w in word_freq) / total_words
-        tf_coercion = sum(word_freq[w] for w in self.lexicons["coercion_vectors"] if w in word_freq) / total_words
-        tf_action = sum(word_freq[w] for w in self.lexicons["action_verbs"] if w in word_freq) / total_words
+        tf_finance = state.term_counts["financial_assets"] / total_words
+        tf_identity = state.term_counts["identity_assets"] / total_words
+        tf_coercion = state.term_counts["coercion_vectors"] / total_words
+        tf_action = state.term_counts["action_verbs"] / total_words
 
         # Cross-Vector Matrix Multiplication to determine Intent
         vector_scores = {
             "FINANCIAL_THEFT": (tf_finance * 1.5) + (tf_action * 1.0),
             "GENERAL_PHISHING": (tf_identity * 1.8) + (tf_action * 1.0),
             "AUTHORITY_IMPERSONATION": (tf_coercion * 2.0) + (tf_finance * 0.5),
-            "CRYPTO_SCAM": (tf_finance * 1.2) + (full_text.count("crypto") + full_text.count("btc") + full_text.count("wallet")) / total_words * 3.0,
-            "LOTTERY_SCAM": (tf_finance * 0.8) + (full_text.count("won") + full_text.count("prize") + full_text.count("lottery")) / total_words * 2.5
+            "CRYPTO_SCAM": (tf_finance * 1.2) + (phrases["crypto"] + phrases["btc"] + phrases["wallet"]) / total_words * 3.0,
+            "LOTTERY_SCAM": (tf_finance * 0.8) + (phrases["won"] + phrases["prize"] + phrases["lottery"]) / total_words * 2.5
         }
 
         # Find the dominant intent vector
@@ -81,9 +444,9 @@ class ScamAnalyzer:
         
         # If the highest vector score is negligible, fallback to regex structural checks for deep-linked malware/phishing
         if dominant_intent[1] < 0.05:
-            self.intent = self._structural_link_check(full_text)
+            intent = "MALICIOUS_LINK" if state.link_hit else "GENERAL_INQUIRY"
         else:
-            self.intent = dominant_intent[0]
+            intent = dominant_intent[0]
 
         # 3. Final Mathematical Risk Calculation
         # Short messages with high command density ("send otp") are highly suspicious
@@ -100,30 +463,31 @@ class ScamAnalyzer:
         mathematical_risk = base_risk * escalation_multiplier
         
         # Add Sentiment Penality
-        if blob.sentiment.polarity < -0.3: # Highly negative/threatening language
+        polarity = state.sentiment.polarity()
+        if polarity < -0.3: # Highly negative/threatening language
             mathematical_risk += 0.2
             
         # Sophistication Logic 
-        unique_words = len(set(words))
+        unique_words = len(state.unique_words)
         vocab_richness = unique_words / total_words
         
         # Smart scammers use rich vocabulary; dumb scammers script-kiddie paste
         sophistication = 0.5
         if vocab_richness > 0.6: sophistication += 0.2
-        if "kindly" in full_text: sophistication -= 0.3 # Classic script giveaway
+        if state.kindly: sophistication -= 0.3 # Classic script giveaway
         
-        self.sophistication_score = max(0.0, min(1.0, mathematical_risk + (sophistication * 0.2)))
+        score = max(0.0, min(1.0, mathematical_risk + (sophistication * 0.2)))
 
         # Map to Threat Classification based on rigorous threshold
-        if mathematical_risk > 0.65 or self.intent in ["MALICIOUS_LINK"]:
+        if mathematical_risk > 0.65 or intent in ["MALICIOUS_LINK"]:
             threat_classification = "scam"
-            self.sophistication_score = max(self.sophistication_score, 0.90)
+            score = max(score, 0.90)
         elif mathematical_risk > 0.35:
             threat_classification = "likely_scam"
-            self.sophistication_score = max(self.sophistication_score, 0.70)
+            score = max(score, 0.70)
         else:
             threat_classification = "benign"
-            self.intent = "GENERAL_INQUIRY"
+            intent = "GENERAL_INQUIRY"
 
         # Construct the Multi-Layer Neural Output
         # This gives a granular breakdown of *why* the model made its decision
@@ -131,11 +495,11 @@ class ScamAnalyzer:
             "financial_risk_node": min(1.0, tf_finance * 4.0),
             "coercion_risk_node": min(1.0, tf_coercion * 5.0 * escalation_multiplier),
             "urgency_spike_node": min(1.0, sum(urgency_graph) / max(len(urgency_graph), 1) * 3.0) if urgency_graph else 0.0,
-            "deception_complexity_node": self.sophistication_score
+            "deception_complexity_node": score
         }
 
         logging.info(f"[NLP Core] Vector Magnitude: {dominant_intent[1]:.4f} | Escalation: {escalation_multiplier} | Threat: {threat_classification}")
-        return self.sophistication_score, threat_classification, neuro_matrix
+        return AnalysisResult(score, threat_classification, intent, neuro_matrix)
 
     def _structural_link_check(self, text):
         link_pattern = r"(click|tap|visit|open|download|install).{0,30}(link|url|website|page|attachment|app|.apk|.exe)"
@@ -0,0 +1,60 @@
+"""
+Throughput of the analysis executor modes (inline, thread, process).
+CLIENTS threads submit single-message histories, as concurrent /api/analyze
+requests would. Every message is unique so the feature caches don't help.
+Run from the backend directory: python bench_analyzer.py [requests] [workers]
+"""
+import os
+import sys
+import time
+import random
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logging.disable(logging.INFO)
+
+from analysis_pool import AnalysisExecutor
+from analyzer import ScamAnalyzer
+
+CLIENTS = 32
+
+FRAGMENTS = [
+    "URGENT your account is suspended", "kindly verify your wallet", "send the processing fee today",
+    "you have won the lottery prize", "the police will arrest you", "click the link to claim",
+    "share the otp to confirm", "invest in btc for guaranteed returns", "hello how are you doing",
+    "can we meet for lunch tomorrow", "your parcel is held at customs", "pay the fine immediately"
+]
+
+def make_histories(n, seed=11):
+    rng = random.Random(seed)
+    histories = []
+    for i in range(n):
+        text = " ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(2, 6)))
+        histories.append([{"role": "scammer", "content": f"{text} ref {i} code {rng.randint(1000, 9999)}"}])
+    return histories
+
+def run(mode, histories, workers):
+    executor = AnalysisExecutor(mode=mode, workers=workers, analyzer=ScamAnalyzer())
+    t = time.perf_counter()
+    executor.start()
+    startup = time.perf_counter() - t
+
+    t = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+        results = list(clients.map(executor.analyze, histories))
+    elapsed = time.perf_counter() - t
+    metrics = executor.metrics()
+    executor.stop()
+
+    print(f"{mode:8} | {len(histories) / elapsed:8.1f} req/s | {elapsed:6.2f} s | "
+          f"startup {startup:5.2f} s | avg batch {metrics['avg_batch']}")
+    return results
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    histories = make_histories(count)
+    print(f"{count} requests, {CLIENTS} client threads, {workers} workers, {os.cpu_count()} CPUs")
+    baseline = run("inline", histories, workers)
+    for mode in ("thread", "process"):
+        assert run(mode, histories, workers) == baseline, f"{mode} results differ from inline"
@@ -0,0 +1,116 @@
+"""
+Concurrent read/write benchmark for the SQLite engine profiles.
+Reader threads run the /api/cases page and /api/stats counter queries while
+writer threads file reports, against a throwaway database per profile.
+Run from the backend directory: python bench_db.py [seconds]
+"""
+import os
+import sys
+import time
+import logging
+import tempfile
+import threading
+
+logging.disable(logging.CRITICAL)
+
+from sqlalchemy.orm import sessionmaker
+
+from counters import read_counters
+from database import Base, Case, make_engine
+from reports import file_reports
+
+READERS = 8
+WRITERS = 4
+SEED_CASES = 2000
+
+def make_report(i):
+    return {
+        "conversationId": f"bench-{i}",
+        "scammerName": f"scammer-{i % 50}",
+        "platform": "sms",
+        "classification": ["romance", "crypto", "job"][i % 3],
+        "iocs": {},
+        "transcript": [{"role": "scammer", "content": "kindly send the fee"}] * 5,
+        "timestamp": "2026-01-01T00:00:00Z"
+    }
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+def run_profile(profile, seconds):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = make_engine(f"sqlite:///{path}", profile)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    file_reports(db, [make_report(i) for i in range(SEED_CASES)])
+    db.commit()
+    db.close()
+
+    counter = iter(range(SEED_CASES, 10**9))
+    counter_lock = threading.Lock()
+    results = {"read": [], "write": [], "errors": 0}
+    results_lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        latencies = []
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            session = Session()
+            try:
+                session.query(Case.id, Case.scammer_name, Case.timestamp) \
+                    .order_by(Case.created_at.desc(), Case.id.desc()).limit(50).all()
+                read_counters(session)
+                latencies.append(time.perf_counter() - t)
+            except Exception:
+                with results_lock:
+                    results["errors"] += 1
+            finally:
+                session.close()
+        with results_lock:
+            results["read"].extend(latencies)
+
+    def writer():
+        latencies = []
+        while time.perf_counter() < deadline:
+            with counter_lock:
+                i = next(counter)
+            t = time.perf_counter()
+            session = Session()
+            try:
+                file_reports(session, [make_report(i)])
+                session.commit()
+                latencies.append(time.perf_counter() - t)
+            except Exception:
+                session.rollback()
+                with results_lock:
+                    results["errors"] += 1
+            finally:
+                session.close()
+        with results_lock:
+            results["write"].extend(latencies)
+
+    threads = [threading.Thread(target=reader) for _ in range(READERS)] + \
+              [threading.Thread(target=writer) for _ in range(WRITERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    for kind in ("read", "write"):
+        samples = results[kind]
+        print(f"{profile:>8} | {kind:5} | {len(samples) / seconds:8.1f} ops/s | "
+              f"p50 {percentile(samples, 0.50) * 1000:7.2f} ms | p99 {percentile(samples, 0.99) * 1000:8.2f} ms")
+    print(f"{profile:>8} | errors (locked/busy) {results['errors']}")
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    print(f"{READERS} readers + {WRITERS} writers, {duration:.0f}s per profile")
+    for name in ("default", "tuned"):
+        run_profile(name, duration)
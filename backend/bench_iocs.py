@@ -0,0 +1,61 @@
+"""
+Micro-benchmark for IOC extraction on link-heavy spam.
+Compares the legacy /api/analyze extraction (four regexes plus the
+any(d in u for u in urls) domain check) against the single-pass iocs engine.
+Run from the backend directory: python bench_iocs.py
+"""
+import re
+import random
+import timeit
+import logging
+
+logging.disable(logging.CRITICAL)
+
+from iocs import extract_iocs
+
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+DOMAIN_PATTERN = re.compile(r'[a-zA-Z0-9-]+\.(?:com|net|org|io|biz|info)')
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+CRYPTO_PATTERN = re.compile(r'\b(?:1|3|bc1|0x)[a-zA-Z0-9]{25,40}\b')
+
+def legacy_iocs(text):
+    iocs = []
+    urls = URL_PATTERN.findall(text)
+    domains = DOMAIN_PATTERN.findall(text)
+    iocs.extend(urls)
+    for d in domains:
+        if not any(d in u for u in urls):
+            iocs.append(d)
+    iocs.extend(PHONE_PATTERN.findall(text))
+    iocs.extend(CRYPTO_PATTERN.findall(text))
+    return list(set(iocs))
+
+TEMPLATES = [
+    "Claim your reward at https://{host}/claim?id={n} before midnight!",
+    "URGENT: verify now http://{host}/login/{n} or your account is blocked.",
+    "Mirror: www.{host}/r/{n} (backup {host})",
+    "Pay the fee to 1BoatSLRHtKNngkdXEeobR76b53LETtpyT and call +91 98765 4{n:04d}.",
+    "Questions? Write to help-{n}@{host} or WhatsApp 98765-4{n:04d}.",
+]
+TLDS = ["com", "net", "xyz", "top", "co.in", "info"]
+
+def make_spam(links, seed=5):
+    rng = random.Random(seed)
+    parts = []
+    for n in range(links):
+        host = f"{rng.choice(['secure', 'kyc', 'prize', 'refund'])}-{rng.randint(1, links // 4 + 1)}.{rng.choice(TLDS)}"
+        parts.append(rng.choice(TEMPLATES).format(host=host, n=n % 10000))
+    return " ".join(parts)
+
+def bench(links, number):
+    text = make_spam(links)
+    legacy = timeit.timeit(lambda: legacy_iocs(text), number=number) / number
+    engine = timeit.timeit(lambda: extract_iocs(text), number=number) / number
+    found = extract_iocs(text)
+    types = sorted({i.type for i in found})
+    print(f"{links:>5} links | {len(text) // 1024:>4} KB | legacy {legacy * 1000:9.2f} ms | "
+          f"engine {engine * 1000:8.2f} ms | x{legacy / engine:6.1f} | {len(found)} indicators ({', '.join(types)})")
+
+if __name__ == "__main__":
+    for links, number in [(10, 500), (100, 100), (500, 10), (2000, 3)]:
+        bench(links, number)
@@ -0,0 +1,115 @@
+"""
+Login latency while /api/analyze is saturated.
+Starts the API on a local port (throwaway SQLite DB, rate limits off), keeps
+ANALYZE_CLIENTS threads posting analysis requests and measures login p50/p99
+for the auth-pool endpoint and for an inline (legacy) variant that hashes on
+the request threadpool.
+Run from the backend directory: python bench_login.py [seconds]
+"""
+import os
+import sys
+import time
+import socket
+import logging
+import tempfile
+import threading
+
+import requests
+import uvicorn
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session, sessionmaker
+
+logging.disable(logging.CRITICAL)
+
+import security
+import server
+from database import Base, make_engine
+
+ANALYZE_CLIENTS = 32
+HEADERS = {"X-Rakshak-Token": "rakshak-core-v1"}
+ANALYZE_TEXT = " ".join(["URGENT: your account is suspended, kindly verify your wallet at http://secure-check.biz "
+                         "and pay the processing fee today or the police will be informed."] * 20)
+
+@server.app.post("/api/bench/login-inline")
+def login_inline(creds: server.LoginRequest, request: Request, db: Session = Depends(server.get_db)):
+    # The pre-pool login path: verification runs on the shared request threadpool
+    user = server.find_user(db, creds.username)
+    if not user or not security.verify_password(creds.password, user.hashed_password):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"status": "success", "token": security.create_access_token(data={"sub": user.username})}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] if samples else 0.0
+
+def measure_logins(base, path, seconds):
+    latencies = []
+    session = requests.Session()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t = time.perf_counter()
+        r = session.post(base + path, json={"username": "admin", "password": "password123"}, headers=HEADERS)
+        latencies.append(time.perf_counter() - t)
+        assert r.status_code == 200, r.text
+    return latencies
+
+def run(seconds):
+    engine = make_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    server.app.dependency_overrides[server.get_db] = override_db
+    server.limiter.enabled = False
+
+    port = free_port()
+    api = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=api.run, daemon=True).start()
+    while not api.started:
+        time.sleep(0.05)
+    base = f"http://127.0.0.1:{port}"
+
+    # First login creates the operator from the users.json bootstrap
+    measure_logins(base, "/api/login", 0.1)
+
+    for path in ("/api/login", "/api/bench/login-inline"):
+        idle = measure_logins(base, path, seconds / 2)
+        stop = threading.Event()
+        analyzed = [0]
+
+        def analyze_client():
+            session = requests.Session()
+            while not stop.is_set():
+                session.post(base + "/api/analyze", json={"text": ANALYZE_TEXT}, headers=HEADERS)
+                analyzed[0] += 1
+
+        clients = [threading.Thread(target=analyze_client, daemon=True) for _ in range(ANALYZE_CLIENTS)]
+        for c in clients:
+            c.start()
+        time.sleep(0.5)
+        loaded = measure_logins(base, path, seconds)
+        stop.set()
+        for c in clients:
+            c.join()
+
+        print(f"{path:26} | idle p50 {percentile(idle, 0.5) * 1000:7.1f} ms p99 {percentile(idle, 0.99) * 1000:7.1f} ms"
+              f" | under load p50 {percentile(loaded, 0.5) * 1000:7.1f} ms p99 {percentile(loaded, 0.99) * 1000:7.1f} ms"
+              f" | {len(loaded)} logins, {analyzed[0]} analyses")
+
+    api.should_exit = True
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    print(f"{ANALYZE_CLIENTS} /api/analyze clients, auth pool {security.AUTH_WORKERS} workers")
+    run(duration)
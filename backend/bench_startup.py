@@ -0,0 +1,57 @@
+"""
+Import-time budget for the API module.
+Imports server.py in fresh interpreters under `python -X importtime`, reports the
+best and median wall time plus the heaviest top-level imports, and fails if
+- the best run exceeds the budget, or
+- a lazily loaded subsystem (NLP core, WebAuthn) got imported eagerly.
+Run from the backend directory: python bench_startup.py [runs] [budget_ms]
+"""
+import os
+import re
+import subprocess
+import sys
+import statistics
+
+RUNS = 7
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "1300"))
+# Must only load on first use (first scored message / first biometric request)
+LAZY_MODULES = ("textblob", "nltk", "webauthn")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def import_once(module="server"):
+    """
+    One fresh interpreter; returns {module: (cumulative_us, depth)} from -X importtime.
+    """
+    env = dict(os.environ, PYTHONPATH="")  # no sitecustomize or shims from the caller
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(2)), len(match.group(3)) // 2)
+    return modules
+
+def run(runs, budget_ms):
+    samples = [import_once() for _ in range(runs)]
+    totals = sorted(s["server"][0] / 1000 for s in samples)
+    best = min(samples, key=lambda s: s["server"][0])
+
+    print(f"import server: best {totals[0]:7.1f} ms | median {statistics.median(totals):7.1f} ms "
+          f"| budget {budget_ms:.0f} ms ({runs} runs)")
+    top = sorted(((us, name) for name, (us, depth) in best.items() if depth == 1), reverse=True)[:10]
+    for us, name in top:
+        print(f"  {name:28} {us / 1000:7.1f} ms")
+
+    eager = sorted({name.split(".")[0] for s in samples for name in s} & set(LAZY_MODULES))
+    assert not eager, f"imported eagerly: {', '.join(eager)}"
+    assert totals[0] <= budget_ms, f"import time {totals[0]:.1f} ms over the {budget_ms:.0f} ms budget"
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else BUDGET_MS
+    run(runs, budget)
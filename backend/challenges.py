@@ -0,0 +1,149 @@
+"""
+WebAuthn challenge stores. A challenge is written by a */start endpoint and
+consumed exactly once by the matching */finish; anything older than ttl is
+treated as missing and swept in the background. Start endpoints are
+unauthenticated, so each store also keeps at most max_entries challenges,
+evicting the oldest first.
+
+- MemoryChallengeStore (default): in-process TTL map. Only valid when a single
+  worker serves both halves of a ceremony.
+- DBChallengeStore: rows in webauthn_challenges, for multi-worker deployments.
+"""
+import base64
+import datetime
+import logging
+import threading
+import time
+
+from sqlalchemy import delete, select
+
+from database import WebAuthnChallenge
+
+# Same base64url (unpadded) text as webauthn.helpers, so older rows stay readable
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+class Sweeper:
+    """
+    Daemon thread calling store.sweep() every interval seconds.
+    """
+    def __init__(self, store, interval):
+        self.store = store
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="challenge-sweeper", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.store.sweep()
+            except Exception as e:
+                logging.error(f"[WEBAUTHN] Challenge sweep failed: {e}")
+
+    def stop(self):
+        self.stopped.set()
+
+class MemoryChallengeStore:
+    def __init__(self, ttl=300, sweep_interval=60, max_entries=10000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.challenges = {}  # key -> (challenge bytes, expires_at), oldest first
+        self.swept = 0
+        self.evicted = 0
+        self.sweeper = Sweeper(self, sweep_interval) if sweep_interval else None
+
+    def put(self, key, challenge):
+        with self.lock:
+            self.challenges.pop(key, None)  # a re-issued challenge moves to the back
+            while len(self.challenges) >= self.max_entries:
+                del self.challenges[next(iter(self.challenges))]
+                self.evicted += 1
+            self.challenges[key] = (challenge, self.clock() + self.ttl)
+
+    def pop(self, key):
+        with self.lock:
+            entry = self.challenges.pop(key, None)
+        if entry is None or self.clock() >= entry[1]:
+            return None
+        return entry[0]
+
+    def sweep(self):
+        now = self.clock()
+        with self.lock:
+            expired = [k for k, (_, expires_at) in self.challenges.items() if now >= expires_at]
+            for k in expired:
+                del self.challenges[k]
+            self.swept += len(expired)
+        return len(expired)
+
+    def metrics(self):
+        with self.lock:
+            return {"store": "memory", "pending": len(self.challenges), "swept": self.swept,
+                    "evicted": self.evicted}
+
+class DBChallengeStore:
+    def __init__(self, session_factory, ttl=300, sweep_interval=60, max_entries=10000):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.swept = 0
+        self.evicted = 0
+        self.sweeper = Sweeper(self, sweep_interval) if sweep_interval else None
+
+    def _cutoff(self):
+        return datetime.datetime.utcnow() - datetime.timedelta(seconds=self.ttl)
+
+    def put(self, key, challenge):
+        db = self.session_factory()
+        try:
+            db.merge(WebAuthnChallenge(key=key, challenge=_b64encode(challenge), created_at=datetime.datetime.utcnow()))
+            db.flush()
+            # Everything past the newest max_entries rows goes (an index range scan on created_at)
+            overflow = select(WebAuthnChallenge.key).order_by(WebAuthnChallenge.created_at.desc()) \
+                .offset(self.max_entries).scalar_subquery()
+            evicted = db.execute(delete(WebAuthnChallenge).where(WebAuthnChallenge.key.in_(overflow))).rowcount
+            db.commit()
+        finally:
+            db.close()
+        self.evicted += evicted
+
+    def pop(self, key):
+        db = self.session_factory()
+        try:
+            record = db.query(WebAuthnChallenge.challenge, WebAuthnChallenge.created_at) \
+                .filter(WebAuthnChallenge.key == key).first()
+            if record is None:
+                return None
+            # Delete only the row we read, so a concurrent finish can't reuse it
+            deleted = db.execute(delete(WebAuthnChallenge).where(
+                WebAuthnChallenge.key == key, WebAuthnChallenge.challenge == record.challenge)).rowcount
+            db.commit()
+            if deleted != 1 or record.created_at is None or record.created_at < self._cutoff():
+                return None
+            return _b64decode(record.challenge)
+        finally:
+            db.close()
+
+    def sweep(self):
+        db = self.session_factory()
+        try:
+            removed = db.execute(delete(WebAuthnChallenge).where(WebAuthnChallenge.created_at < self._cutoff())).rowcount
+            db.commit()
+        finally:
+            db.close()
+        self.swept += removed
+        return removed
+
+    def metrics(self):
+        return {"store": "db", "swept": self.swept, "evicted": self.evicted}
+
+def make_challenge_store(kind, session_factory, ttl=300, sweep_interval=60, max_entries=10000):
+    if kind == "db":
+        return DBChallengeStore(session_factory, ttl=ttl, sweep_interval=sweep_interval, max_entries=max_entries)
+    return MemoryChallengeStore(ttl=ttl, sweep_interval=sweep_interval, max_entries=max_entries)
@@ -1,3 +1,4 @@
+import os
 import re
 
 # Persona Configuration
@@ -43,6 +44,21 @@ PERSONA = {
     }
 }
 
+# NLP Lexicons (token -> topic category), compiled into a LexiconIndex by the analyzer
+LEXICONS = {
+    "financial_assets": ["money", "card", "bank", "transfer", "wire", "deposit", "payment", "fee", "charge", "cost", "dollar", "rupee", "usd", "cash", "crypto", "btc", "wallet", "usdt", "eth", "coin"],
+    "identity_assets": ["password", "pin", "otp", "code", "credential", "login", "ssn", "identity", "account", "social", "verification", "phrase", "seed"],
+    "coercion_vectors": ["police", "lawsuit", "jail", "arrest", "warrant", "legal", "court", "suspended", "blocked", "banned", "fbi", "interpol", "frozen", "investigate", "seized"],
+    "time_compression": ["urgent", "immediately", "now", "hurry", "fast", "seconds", "expires", "deadline", "today", "quick", "asap", "limited", "soon"],
+    "action_verbs": ["send", "pay", "give", "share", "tell", "click", "download", "install", "submit", "verify", "confirm", "provide"]
+}
+
+# Raw substring markers (counted in the message text, not in the token stream)
+PHRASE_MARKERS = {
+    "crypto": ["crypto", "btc", "wallet"],
+    "lottery": ["won", "prize", "lottery"]
+}
+
 # Redaction Patterns (Regex)
 SENSITIVE_PATTERNS = {
     "CREDIT_CARD": r"\b(?:\d[ -]*?){13,16}\b",
@@ -53,7 +69,91 @@ SENSITIVE_PATTERNS = {
     "CRYPTO_ADDRESS_ETH": r"\b0x[a-fA-F0-9]{40}\b"
 }
 
+# Streaming scan settings for large pasted payloads (fake invoices, base64 blobs)
+STREAM_THRESHOLD = 64 * 1024   # inputs above this many chars are scanned chunk by chunk
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_OVERLAP = 256           # must exceed the longest expected single match
+
+# HoneypotAgent conversation store bounds (LRU cap, idle TTL in seconds, turns and
+# indicators kept per conversation; the least recently seen indicators go first)
+CONVERSATION_LIMITS = {
+    "max_conversations": 10000,
+    "idle_ttl": 3600,
+    "max_messages": 200,
+    "max_iocs": 500
+}
+
+# EngagementEngine (main.py): adapter poll delay while messages keep arriving, and
+# agent threads. A conversation's turns always run one at a time in order (per-conversation
+# mailbox) and the conversation store is locked, so several workers are safe.
+ENGAGEMENT = {
+    "poll_interval": float(os.environ.get("ENGAGEMENT_POLL_INTERVAL", "0")),
+    "agent_workers": int(os.environ.get("ENGAGEMENT_AGENT_WORKERS", "4"))
+}
+
+# /api/analyze executor: "inline", "thread" or "process" (warm worker processes, micro-batched)
+ANALYZER_EXECUTOR = {
+    "mode": os.environ.get("ANALYZER_MODE", "inline"),
+    "workers": int(os.environ.get("ANALYZER_WORKERS", "0")) or os.cpu_count() or 1,
+    "max_batch": 32,          # histories per worker round-trip
+    "batch_window": 0.002,    # seconds to wait for a batch to fill
+    "result_timeout": 30.0    # seconds a request waits for its batch before the fallback heuristics
+}
+
+# HoneypotAgent auto-report dispatch (sink: "log" stand-in, "dir" or "http")
+REPORT_DISPATCH = {
+    "sink": os.environ.get("REPORT_SINK", "log"),
+    "directory": os.environ.get("REPORT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cyber_cell_reports")),
+    "url": os.environ.get("CYBER_CELL_URL", ""),
+    "coalesce_window": 5.0,   # seconds follow-up messages are folded into a pending report
+    "max_pending": 1000,      # reports waiting to be sent; further ones are dropped and counted
+    "workers": 2,             # render + deliver threads
+    "max_retries": 3
+}
+
+# Optional write-behind for /api/report: ack after journaling, flush to the DB in batches.
+# Each worker process locks its own journal slot (report_journal.log, report_journal.1.log, ...)
+# next to journal_path; on Windows there is no locking, so run a single worker there.
+WRITE_BEHIND = {
+    "enabled": os.environ.get("REPORT_WRITE_BEHIND", "0") == "1",
+    "journal_path": os.environ.get("REPORT_JOURNAL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "report_journal.log")),
+    "flush_size": 200,       # flush as soon as this many reports are pending
+    "flush_interval": 0.5,   # ...or when the oldest pending report is this many seconds old
+    "fsync": True,           # fsync each journal append before acknowledging
+    "max_attempts": 3,       # a report failing this many times on its own is quarantined
+    "compact_after": 1000    # compact once this many (and more than the pending) filed reports are journaled
+}
+
 # Safety Policy
 UNSAFE_KEYWORDS = [
     "send money", "transfer", "bank account", "password", "login", "otp", "pin", "cvv"
 ]
+
+# WebAuthn challenge store: "memory" (single worker) or "db" (shared across workers)
+WEBAUTHN_CHALLENGES = {
+    "store": os.environ.get("WEBAUTHN_CHALLENGE_STORE", "memory"),
+    "ttl": 300,             # seconds a start -> finish ceremony may take
+    "sweep_interval": 60,
+    "max_entries": 10000    # pending challenges kept; the oldest are evicted past this
+}
+
+# IOC extraction (iocs.py)
+IOC_SETTINGS = {
+    # Country code for phone numbers written without one (+91: India)
+    "default_country_code": os.environ.get("IOC_DEFAULT_COUNTRY_CODE", "91"),
+    # Bare domains (no scheme) are only picked up for these TLDs, so "invoice.pdf" isn't one
+    "domain_tlds": [
+        "com", "net", "org", "info", "biz", "io", "co", "in", "me", "us", "uk", "cc", "tv", "ly",
+        "xyz", "top", "online", "site", "live", "app", "club", "shop", "store", "vip", "icu",
+        "link", "click", "win", "loan", "work", "support", "ru", "cn", "tk", "ml", "ga", "cf", "gq"
+    ],
+    # Public suffixes with two labels, so the registrable domain of a.b.co.in is b.co.in
+    "multi_part_suffixes": [
+        "co.in", "net.in", "org.in", "firm.in", "gen.in", "ind.in", "gov.in", "nic.in", "ac.in", "edu.in",
+        "co.uk", "org.uk", "ac.uk", "gov.uk", "com.au", "net.au", "org.au", "co.nz", "co.za",
+        "com.br", "com.cn", "com.sg", "com.my", "com.pk", "com.bd", "co.jp", "co.id", "com.ng"
+    ],
+    # Extract from the original message instead of the PII-redacted one. Off by default:
+    # raw indicators (phones, emails, account numbers) then end up in reports on disk or over HTTP
+    "raw_evidence": os.environ.get("IOC_RAW_EVIDENCE", "0") == "1"
+}
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+
+class Message:
+    """
+    Compact per-turn record. Supports m["role"] / m["content"] so existing
+    history consumers (ScamAnalyzer.analyze_behavior) keep working.
+    """
+    __slots__ = ("role", "content")
+
+    def __init__(self, role, content):
+        self.role = role
+        self.content = content
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f"Message({self.role!r}, {self.content!r})"
+
+class Conversation:
+    __slots__ = ("messages", "classification", "sophistication", "analysis", "iocs", "last_seen")
+
+    def __init__(self, max_messages, now):
+        self.messages = deque(maxlen=max_messages)
+        self.classification = None
+        self.sophistication = None
+        self.analysis = None
+        self.iocs = None  # {IOC: None}, least recently seen first; replaced, never mutated
+        self.last_seen = now
+
+class ConversationStore:
+    """
+    Bounded per-conversation state for HoneypotAgent.
+    Caps the number of live conversations (LRU eviction), drops conversations idle
+    for longer than `idle_ttl` seconds, and keeps at most `max_messages` turns and
+    `max_iocs` indicators (least recently seen dropped first) each.
+    """
+
+    def __init__(self, max_conversations=10000, idle_ttl=3600, max_messages=200, max_iocs=500,
+                 clock=time.monotonic):
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self.max_messages = max_messages
+        self.max_iocs = max_iocs
+        self._clock = clock
+        self._conversations = OrderedDict()
+        self._lock = threading.RLock()
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+        self.truncated_messages = 0
+        self.truncated_iocs = 0
+        self.stored_messages = 0
+        self.stored_chars = 0
+        self.stored_iocs = 0
+
+    def get(self, conv_id):
+        with self._lock:
+            self._expire(self._clock())
+            return self._conversations.get(conv_id)
+
+    def get_or_create(self, conv_id):
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            conv = self._conversations.get(conv_id)
+            if conv is None:
+                conv = Conversation(self.max_messages, now)
+                self._conversations[conv_id] = conv
+                while len(self._conversations) > self.max_conversations:
+                    self._drop(self._conversations.popitem(last=False)[1])
+                    self.evicted_lru += 1
+            else:
+                conv.last_seen = now
+                self._conversations.move_to_end(conv_id)
+            return conv
+
+    def append(self, conv_id, role, content):
+        with self._lock:
+            conv = self.get_or_create(conv_id)
+            if len(conv.messages) == conv.messages.maxlen:
+                dropped = conv.messages[0]
+                self.truncated_messages += 1
+                self.stored_messages -= 1
+                self.stored_chars -= len(dropped.content)
+            conv.messages.append(Message(role, content))
+            self.stored_messages += 1
+            self.stored_chars += len(content)
+            return conv
+
+    def add_iocs(self, conv, iocs):
+        """
+        Records indicators seen in a message and returns the ones the conversation
+        didn't have yet. The set is rebuilt rather than mutated, so reports can
+        iterate conv.iocs without the lock.
+        """
+        with self._lock:
+            updated = dict(conv.iocs or {})
+            before = len(updated)
+            new = []
+            for ioc in iocs:
+                if ioc in updated:
+                    del updated[ioc]  # seen again: move to the most recent end
+                else:
+                    new.append(ioc)
+                updated[ioc] = None
+            while len(updated) > self.max_iocs:
+                del updated[next(iter(updated))]
+                self.truncated_iocs += 1
+            conv.iocs = updated
+            self.stored_iocs += len(updated) - before
+            return new
+
+    def sweep(self):
+        """
+        Drops idle conversations. Also runs lazily on every access.
+        """
+        with self._lock:
+            self._expire(self._clock())
+
+    def _expire(self, now):
+        # Entries are kept in last-access order, so idle ones are always at the front
+        cutoff = now - self.idle_ttl
+        while self._conversations:
+            conv = next(iter(self._conversations.values()))
+            if conv.last_seen >= cutoff:
+                break
+            self._drop(self._conversations.popitem(last=False)[1])
+            self.evicted_idle += 1
+
+    def _drop(self, conv):
+        self.stored_messages -= len(conv.messages)
+        self.stored_chars -= sum(len(m.content) for m in conv.messages)
+        self.stored_iocs -= len(conv.iocs or ())
+
+    def view(self, field):
+        return FieldView(self, field)
+
+    def __len__(self):
+        return len(self._conversations)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "conversations": len(self._conversations),
+                "max_conversations": self.max_conversations,
+                "messages": self.stored_messages,
+                "message_chars": self.stored_chars,
+                "evicted_lru": self.evicted_lru,
+                "evicted_idle": self.evicted_idle,
+                "truncated_messages": self.truncated_messages,
+                "iocs": self.stored_iocs,
+                "truncated_iocs": self.truncated_iocs
+            }
+
+class FieldView(Mapping):
+    """
+    Read-only {conv_id: value} view of one Conversation field.
+    Keeps the agent's old dict-style attributes (sophistication_cache etc.) working.
+    """
+
+    def __init__(self, store, field):
+        self._store = store
+        self._field = field
+
+    def __getitem__(self, conv_id):
+        conv = self._store.get(conv_id)
+        value = getattr(conv, self._field) if conv is not None else None
+        if value is None:
+            raise KeyError(conv_id)
+        return value
+
+    def __iter__(self):
+        with self._store._lock:
+            keys = [k for k, c in self._store._conversations.items() if getattr(c, self._field) is not None]
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
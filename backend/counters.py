@@ -0,0 +1,125 @@
+"""
+Dashboard totals stored as one row per counter in stats_counters.
+Writers apply deltas with atomic `count = count + n` upserts, so concurrent
+reports never lose increments and never contend on a shared JSON blob.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import Stats, StatsCounter
+
+# Reserved totals are lowercase; scam types are always upper-cased
+REPORTS_FILED = "reports_filed"
+SCAMS_DETECTED = "scams_detected"
+TOTALS = (REPORTS_FILED, SCAMS_DETECTED)
+
+def increment(db, deltas):
+    """
+    Adds each delta to its counter in the current transaction (caller commits).
+    """
+    deltas = {k: n for k, n in deltas.items() if n}
+    if not deltas:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(StatsCounter).values([{"type": k, "count": n} for k, n in sorted(deltas.items())])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatsCounter.type],
+            set_={"count": StatsCounter.count + stmt.excluded.count},
+        )
+        db.execute(stmt)
+        return
+
+    # Generic fallback: atomic UPDATE, insert only counters that don't exist yet
+    for key, n in sorted(deltas.items()):
+        result = db.execute(update(StatsCounter).where(StatsCounter.type == key).values(count=StatsCounter.count + n))
+        if result.rowcount == 0:
+            db.add(StatsCounter(type=key, count=n))
+            db.flush()
+
+def report_deltas(classifications):
+    """
+    Counter deltas for a group of filed reports.
+    """
+    deltas = {REPORTS_FILED: 0, SCAMS_DETECTED: 0}
+    for classification in classifications:
+        deltas[REPORTS_FILED] += 1
+        deltas[SCAMS_DETECTED] += 1
+        scam_type = classification.upper()
+        deltas[scam_type] = deltas.get(scam_type, 0) + 1
+    return deltas
+
+def read_counters(db):
+    """
+    Returns {"reports_filed", "scams_detected", "types"} from the counters table.
+    """
+    counts = dict(db.query(StatsCounter.type, StatsCounter.count).all())
+    return {
+        "reports_filed": counts.pop(REPORTS_FILED, 0),
+        "scams_detected": counts.pop(SCAMS_DETECTED, 0),
+        "types": counts,
+    }
+
+def seed_from_legacy(db):
+    """
+    Copies totals from the old single-row stats table into stats_counters.
+    """
+    legacy = db.query(Stats).first()
+    if legacy is None:
+        return
+    deltas = {REPORTS_FILED: legacy.reports_filed or 0, SCAMS_DETECTED: legacy.scams_detected or 0}
+    for scam_type, n in (legacy.types_json or {}).items():
+        deltas[scam_type] = deltas.get(scam_type, 0) + n
+    increment(db, deltas)
+    db.commit()
+    logging.info(f"[DB] Seeded stats_counters from legacy stats row ({len(deltas)} counters)")
+
+class CounterCache:
+    """
+    Short-lived snapshot of the counters for read-heavy dashboards.
+    Writes in this process invalidate it; other workers' writes show up within ttl seconds.
+    """
+    def __init__(self, ttl=5.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.loaded_at = 0.0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db):
+        with self.lock:
+            if self.snapshot is not None and self.clock() - self.loaded_at < self.ttl:
+                self.hits += 1
+                return self.snapshot
+            self.misses += 1
+            generation = self.generation
+        snapshot = read_counters(db)
+        with self.lock:
+            # Don't publish a read that raced with a local write
+            if generation == self.generation:
+                self.snapshot = snapshot
+                self.loaded_at = self.clock()
+        return snapshot
+
+    def invalidate(self):
+        with self.lock:
+            self.generation += 1
+            self.snapshot = None
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, Text, Boolean, JSON, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Float, Text, Boolean, JSON, DateTime, LargeBinary, Index, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, validates
+from contextlib import contextmanager
 import datetime
+import hashlib
+import logging
 import os
 
 # Determine database URL - always use a path we can write to
@@ -17,8 +20,58 @@ else:
     # Render gives postgres:// but SQLAlchemy needs postgresql://
     SQLALCHEMY_DATABASE_URL = _db_url.replace("postgres://", "postgresql://", 1)
 
-connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
+# Engine profile: "tuned" (WAL + pragmas, sized pools) or "default" (plain driver defaults)
+DB_PROFILE = os.environ.get("DB_PROFILE", "tuned")
+# Worker threads serving sync endpoints; server.py sizes the AnyIO threadpool to match
+THREADPOOL_SIZE = int(os.environ.get("THREADPOOL_SIZE", "40"))
+
+# The page cache is private to each connection and the tuned pool holds up to
+# THREADPOOL_SIZE + DB_MAX_OVERFLOW of them (50 by default), so worst-case cache
+# memory is SQLITE_CACHE_KB x 50 (8 MB x 50 = 400 MB). The mmap is of the shared
+# database file, backed by the OS page cache, so it costs address space only once.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",          # readers no longer block the writer (and vice versa)
+    "synchronous": "NORMAL",        # fsync at checkpoints only; safe with WAL
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -int(os.environ.get("SQLITE_CACHE_KB", "8000")),  # negative = KiB per connection
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_MB", "256")) * 1024 * 1024
+}
+
+def make_engine(url, profile=DB_PROFILE):
+    """
+    Builds the SQLAlchemy engine for a URL with the given profile.
+    """
+    if url.startswith("sqlite"):
+        connect_args = {"check_same_thread": False}
+        if profile != "tuned":
+            return create_engine(url, connect_args=connect_args)
+        new_engine = create_engine(
+            url, connect_args=connect_args,
+            pool_size=THREADPOOL_SIZE,
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+        )
+
+        @event.listens_for(new_engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        return new_engine
+
+    if profile != "tuned":
+        return create_engine(url)
+    return create_engine(
+        url,
+        pool_size=int(os.environ.get("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=int(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=1800,   # hosted Postgres drops idle connections
+        pool_pre_ping=True
+    )
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -30,7 +83,7 @@ class User(Base):
     username = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     role = Column(String, default="operator")
-    webauthn_credentials = Column(JSON, default=[]) # Store list of registered credentials
+    webauthn_credentials = Column(JSON, default=[]) # Legacy; credentials now live in webauthn_credentials
 
 class Case(Base):
     __tablename__ = "cases"
@@ -43,8 +96,32 @@ class Case(Base):
     iocs = Column(JSON)
     transcript = Column(JSON)
     timestamp = Column(String)
+    created_at = Column(DateTime)  # naive UTC, derived from `timestamp` for indexed range queries
     auto_reported = Column(Boolean, default=True)
 
+    # Covering index: /api/stats windows only ever read these three columns
+    __table_args__ = (Index("ix_cases_created_at_type_scammer", "created_at", "threat_level", "scammer_name"),)
+
+    @validates("timestamp")
+    def _sync_created_at(self, key, value):
+        self.created_at = parse_timestamp(value)
+        return value
+
+def parse_timestamp(ts_str):
+    """
+    ISO-8601 string (trailing Z allowed) -> naive UTC datetime, or None if unparseable.
+    """
+    if not ts_str:
+        return None
+    try:
+        ts = datetime.datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+    except (TypeError, ValueError) as e:
+        logging.error(f"Error parsing timestamp {ts_str}: {e}")
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ts
+
 class Stats(Base):
     __tablename__ = "stats"
 
@@ -53,12 +130,215 @@ class Stats(Base):
     scams_detected = Column(Integer, default=0)
     types_json = Column(JSON, default={}) # Store scam types count as JSON
 
+class StatsCounter(Base):
+    __tablename__ = "stats_counters"
+
+    type = Column(String, primary_key=True)  # scam type, or a reserved lowercase total ("reports_filed")
+    count = Column(Integer, default=0, nullable=False)
+
+class StatsRollup(Base):
+    __tablename__ = "stats_rollups"
+
+    bucket = Column(DateTime, primary_key=True)  # start of the hour, naive UTC
+    cases = Column(Integer, default=0)
+    types_json = Column(JSON, default={})       # THREAT_TYPE -> count
+    platforms_json = Column(JSON, default={})   # platform -> count
+    scammers_hll = Column(LargeBinary)          # HyperLogLog sketch of scammer names
+
+class WebAuthnCredential(Base):
+    __tablename__ = "webauthn_credentials"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    credential_id = Column(String, unique=True, index=True, nullable=False)  # base64url
+    credential_public_key = Column(Text, nullable=False)                    # base64url
+    sign_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
 class WebAuthnChallenge(Base):
     __tablename__ = "webauthn_challenges"
 
     key = Column(String, primary_key=True)  # e.g. "LOGIN_username" or "REGISTER_username"
     challenge = Column(Text)  # base64url encoded challenge bytes
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)  # expiry sweeps
+
+class SchemaInfo(Base):
+    __tablename__ = "schema_info"
+
+    key = Column(String, primary_key=True)  # "fingerprint"
+    value = Column(String)
+
+# Bump when init_db()/migrate_db() gain a data migration that the models alone don't reveal
+SCHEMA_REVISION = 1
+# pg_advisory_lock key serializing schema upgrades across workers
+SCHEMA_LOCK_KEY = 7461023
+
+def schema_fingerprint():
+    """
+    Short hash of every table, column and index the models define (plus SCHEMA_REVISION).
+    """
+    parts = [str(SCHEMA_REVISION)]
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts += sorted(f"{c.name}:{c.type}" for c in table.columns)
+        parts += sorted(",".join(c.name for c in index.columns) for index in table.indexes)
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+def stored_fingerprint():
+    if not inspect(engine).has_table(SchemaInfo.__tablename__):
+        return None
+    db = SessionLocal()
+    try:
+        row = db.get(SchemaInfo, "fingerprint")
+        return row.value if row else None
+    finally:
+        db.close()
+
+@contextmanager
+def schema_lock():
+    """
+    Cross-process lock held while the schema is created or upgraded: an advisory
+    lock on Postgres, a lock file next to the database on SQLite.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        return
+
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None  # Windows: the desktop launcher only runs one worker
+    path = engine.url.database
+    if fcntl is None or engine.dialect.name != "sqlite" or not path or path == ":memory:":
+        yield
+        return
+    with open(path + ".init.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def init_db_once():
+    """
+    Runs init_db() only if the database wasn't set up for the current models yet.
+    The first worker to start does the work under schema_lock(); the others, and
+    every later restart, just compare the stored fingerprint. Returns True if it ran.
+    """
+    fingerprint = schema_fingerprint()
+    if stored_fingerprint() == fingerprint:
+        return False
+    with schema_lock():
+        if stored_fingerprint() == fingerprint:
+            return False  # another worker finished while we waited
+        init_db()
+        db = SessionLocal()
+        try:
+            db.merge(SchemaInfo(key="fingerprint", value=fingerprint))
+            db.commit()
+        finally:
+            db.close()
+    logging.info(f"[DB] Schema initialized (fingerprint {fingerprint})")
+    return True
 
 def init_db():
+    had_rollups = inspect(engine).has_table("stats_rollups")
+    had_counters = inspect(engine).has_table("stats_counters")
+    had_credentials = inspect(engine).has_table("webauthn_credentials")
     Base.metadata.create_all(bind=engine)
+    migrate_db()
+
+    # Existing databases carry their totals over from the legacy stats row
+    if not had_counters:
+        from counters import seed_from_legacy
+        db = SessionLocal()
+        try:
+            seed_from_legacy(db)
+        finally:
+            db.close()
+
+    # Credentials registered before the table existed are copied out of users.webauthn_credentials
+    if not had_credentials:
+        db = SessionLocal()
+        try:
+            migrate_webauthn_credentials(db)
+        finally:
+            db.close()
+
+    # Existing databases get their hourly rollups generated once
+    if not had_rollups:
+        from rollups import rebuild_rollups
+        db = SessionLocal()
+        try:
+            rebuild_rollups(db)
+        finally:
+            db.close()
+
+def migrate_webauthn_credentials(db):
+    """
+    Copies credentials from the legacy per-user JSON list into webauthn_credentials.
+    Idempotent: credential IDs already in the table are skipped.
+    """
+    known = {cid for (cid,) in db.query(WebAuthnCredential.credential_id)}
+    moved = 0
+    for user_id, credentials in db.query(User.id, User.webauthn_credentials):
+        for cred in credentials or []:
+            cid = cred.get("credential_id") if isinstance(cred, dict) else None
+            if not cid or cid in known or not cred.get("credential_public_key"):
+                continue
+            db.add(WebAuthnCredential(user_id=user_id, credential_id=cid,
+                                      credential_public_key=cred["credential_public_key"],
+                                      sign_count=cred.get("sign_count") or 0))
+            known.add(cid)
+            moved += 1
+    db.commit()
+    if moved:
+        logging.info(f"[DB] Migrated {moved} WebAuthn credentials to webauthn_credentials")
+    return moved
+
+def migrate_db(batch_size=1000):
+    """
+    Idempotent in-place upgrades for databases created by older versions.
+    Adds cases.created_at, backfills it from the string timestamp and builds its index.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("cases")}
+    if "created_at" not in columns:
+        column_type = Case.__table__.c.created_at.type.compile(engine.dialect)
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE cases ADD COLUMN created_at {column_type}"))
+        logging.info("[DB] Added cases.created_at column")
+
+    for index in list(Case.__table__.indexes) + list(WebAuthnChallenge.__table__.indexes):
+        index.create(bind=engine, checkfirst=True)
+
+    backfilled = 0
+    last_id = ""
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.query(Case.id, Case.timestamp) \
+                .filter(Case.created_at.is_(None), Case.timestamp.isnot(None), Case.id > last_id) \
+                .order_by(Case.id).limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updates = [{"id": cid, "created_at": parse_timestamp(ts)} for cid, ts in rows]
+            updates = [u for u in updates if u["created_at"] is not None]
+            if updates:
+                db.bulk_update_mappings(Case, updates)
+                db.commit()
+                backfilled += len(updates)
+    finally:
+        db.close()
+    if backfilled:
+        logging.info(f"[DB] Backfilled created_at for {backfilled} cases")
+
+if __name__ == "__main__":
+    # Deploy-time setup, e.g. a release step before the API workers start
+    if not init_db_once():
+        print("Schema already up to date")
@@ -0,0 +1,306 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - [DISPATCH] - %(message)s')
+
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
+
+def safe_filename(name):
+    """
+    Conversation IDs come from clients: no path separators or leading dots in file names.
+    """
+    return UNSAFE_FILENAME_CHARS.sub("_", str(name)).lstrip(".") or "_"
+
+class ReportSink(ABC):
+    """
+    Destination for rendered Cyber Cell reports.
+    """
+
+    @abstractmethod
+    def deliver(self, report_id, artifacts):
+        """Delivers {filename: bytes}; raises on failure so the dispatcher retries."""
+
+class LogSink(ReportSink):
+    """
+    Stand-in for the Cyber Cell portal: logs what would have been transmitted.
+    """
+
+    def deliver(self, report_id, artifacts):
+        for name, data in artifacts.items():
+            logging.info(f"📄 [AUTO-REPORT] {name} ({len(data)} bytes)")
+        logging.info(f"✅ [AUTO-REPORT] Successfully transmitted {report_id} to Cyber Cell reporting portal.")
+
+class LocalDirectorySink(ReportSink):
+    """
+    Writes each report's artifacts into <directory>/<report_id>/.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def deliver(self, report_id, artifacts):
+        target = os.path.join(self.directory, safe_filename(report_id))
+        os.makedirs(target, exist_ok=True)
+        for name, data in artifacts.items():
+            path = os.path.join(target, safe_filename(name))
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)  # readers never see a half-written file
+
+class HttpSink(ReportSink):
+    """
+    POSTs the artifacts as multipart/form-data to a reporting endpoint.
+    """
+
+    def __init__(self, url, timeout=10.0):
+        import requests
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def deliver(self, report_id, artifacts):
+        files = {name: (name, data) for name, data in artifacts.items()}
+        response = self.session.post(self.url, data={"report_id": report_id}, files=files, timeout=self.timeout)
+        response.raise_for_status()
+
+def _pdf_escape(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def render_pdf(title, lines, lines_per_page=48, width=90):
+    """
+    Minimal single-font PDF (no external dependencies) with one text line per row.
+    """
+    wrapped = []
+    for line in lines:
+        line = line.replace("\r", " ").replace("\n", " ")
+        while len(line) > width:
+            wrapped.append(line[:width])
+            line = line[width:]
+        wrapped.append(line)
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>"]
+    page_ids = []
+    for number, page in enumerate(pages, 1):
+        rows = [f"({_pdf_escape(title)} - page {number}/{len(pages)}) Tj", "0 -24 Td"]
+        rows += [f"({_pdf_escape(row)}) Tj 0 -14 Td" for row in page]
+        stream = "BT /F1 10 Tf 40 800 Td " + " ".join(rows) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def render_report(report):
+    """
+    Builds the JSON metadata and PDF evidence file for one report.
+    """
+    report_id = report["report_id"]
+    transcript = [{"role": m["role"], "content": m["content"]} for m in report["transcript"]]
+    iocs = report.get("iocs") or []
+    metadata = {
+        "report_id": report_id,
+        "conversation_id": report["conversation_id"],
+        "threat_level": report["threat_level"],
+        "sophistication": report.get("sophistication"),
+        "iocs": iocs,
+        "first_detected": report["first_detected"],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "updates_coalesced": report["updates"],
+        "transcript": transcript
+    }
+    lines = [f"Conversation: {report['conversation_id']}", f"Threat level: {report['threat_level']}",
+             f"First detected: {report['first_detected']}", ""]
+    if iocs:
+        lines += [f"IOC [{ioc['type']}] {ioc['value']}" for ioc in iocs] + [""]
+    lines += [f"[{m['role']}] {m['content']}" for m in transcript]
+    return {
+        f"{safe_filename(report_id)}.json": json.dumps(metadata, indent=2, default=str).encode("utf-8"),
+        f"Evidence_Report_{safe_filename(report['conversation_id'])}.pdf": render_pdf(f"Evidence Report {report_id}", lines)
+    }
+
+class ReportDispatcher:
+    """
+    Takes report requests off the ingest path.
+
+    - One report per (conversation, threat level): repeats are dropped once it
+      has been sent, and merged into the pending report while it waits.
+    - A pending report is held for `coalesce_window` seconds after the first
+      trigger so follow-up messages land in the same report.
+    - Rendering and delivery run on a worker pool with retries and backoff; at
+      most `workers` reports are in flight, the rest stay pending (and keep
+      coalescing) until a worker frees up.
+    - At most `max_pending` reports wait at once; beyond that new ones are dropped
+      (and counted) rather than blocking ingest.
+    """
+
+    def __init__(self, sink=None, coalesce_window=5.0, max_pending=1000, workers=2,
+                 max_retries=3, retry_backoff=1.0, max_sent_keys=100000, clock=time.monotonic):
+        self.sink = sink or LogSink()
+        self.coalesce_window = coalesce_window
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_sent_keys = max_sent_keys
+        self.clock = clock
+        self.workers = workers
+
+        self.lock = threading.Condition()
+        self.pending = OrderedDict()   # (conversation_id, threat_level) -> report, in due order
+        self.sent = OrderedDict()      # keys already dispatched (bounded LRU)
+        self.in_flight = 0
+        self.pool = None
+        self.scheduler = None
+        self.running = False
+
+        self.counters = {"submitted": 0, "coalesced": 0, "deduplicated": 0, "dropped": 0,
+                         "delivered": 0, "failed": 0, "retries": 0}
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report")
+        self.scheduler = threading.Thread(target=self._schedule, name="report-dispatcher", daemon=True)
+        self.scheduler.start()
+
+    def stop(self, flush=True, timeout=30.0):
+        """
+        Stops the scheduler; with flush=True, pending reports are sent first.
+        """
+        with self.lock:
+            if not self.running:
+                return
+            if flush:
+                for report in self.pending.values():
+                    report["due"] = 0.0
+            else:
+                self.pending.clear()
+            self.running = False
+            self.lock.notify_all()
+        self.scheduler.join(timeout)
+        self.pool.shutdown(wait=True)
+
+    def submit(self, conversation_id, threat_level, transcript, sophistication=None, iocs=None):
+        """
+        Non-blocking: records (or refreshes) the pending report and returns.
+        """
+        if self.scheduler is None:
+            self.start()  # threads are only spun up once something is worth reporting
+        key = (conversation_id, threat_level)
+        now = self.clock()
+        with self.lock:
+            self.counters["submitted"] += 1
+            if not self.running:
+                self.counters["dropped"] += 1
+                return False
+            if key in self.sent:
+                self.counters["deduplicated"] += 1
+                return False
+            report = self.pending.get(key)
+            if report is not None:
+                report["transcript"] = transcript
+                report["sophistication"] = sophistication
+                report["iocs"] = iocs
+                report["updates"] += 1
+                self.counters["coalesced"] += 1
+                return True
+            if len(self.pending) >= self.max_pending:
+                self.counters["dropped"] += 1
+                return False
+            self.pending[key] = {
+                "key": key,
+                "report_id": f"RPT-{conversation_id}-{threat_level}",
+                "conversation_id": conversation_id,
+                "threat_level": threat_level,
+                "transcript": transcript,
+                "sophistication": sophistication,
+                "iocs": iocs,
+                "first_detected": datetime.now(timezone.utc).isoformat(),
+                "updates": 0,
+                "due": now + self.coalesce_window
+            }
+            self.lock.notify_all()
+            return True
+
+    def _schedule(self):
+        while True:
+            with self.lock:
+                while True:
+                    if self.pending and self.in_flight < self.workers:
+                        key, report = next(iter(self.pending.items()))
+                        wait = report["due"] - self.clock()
+                        if wait <= 0:
+                            break
+                    elif not self.pending and not self.running:
+                        return
+                    else:
+                        wait = None  # woken by submit() or a finished delivery
+                    self.lock.wait(wait)
+                del self.pending[key]
+                self.sent[key] = True
+                while len(self.sent) > self.max_sent_keys:
+                    self.sent.popitem(last=False)
+                self.in_flight += 1
+            self.pool.submit(self._process, report)
+
+    def _process(self, report):
+        try:
+            artifacts = render_report(report)
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.sink.deliver(report["report_id"], artifacts)
+                    self._count("delivered")
+                    return
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    self._count("retries")
+                    logging.warning(f"[AUTO-REPORT] Delivery of {report['report_id']} failed ({e}), retrying")
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+        except Exception as e:
+            with self.lock:
+                self.counters["failed"] += 1
+                self.sent.pop(report["key"], None)  # a later update may report it again
+            logging.error(f"[AUTO-REPORT] Giving up on {report['report_id']}: {e}")
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.lock.notify_all()
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def metrics(self):
+        with self.lock:
+            return dict(self.counters, pending=len(self.pending), in_flight=self.in_flight)
+
+def make_sink(kind, directory=None, url=None):
+    if kind == "dir":
+        return LocalDirectorySink(directory)
+    if kind == "http" and url:
+        return HttpSink(url)
+    return LogSink()
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - [ENGINE] - %(message)s')
+
+class AsyncScammerAdapter(ABC):
+    """
+    Async transport the engagement engine talks to.
+    Messages are dicts with conversation_id / text / timestamp, as in MockScammerAPI.
+    """
+
+    @abstractmethod
+    async def receive(self):
+        """Returns the next inbound message, or None if nothing is waiting."""
+
+    @abstractmethod
+    async def send(self, conversation_id, text):
+        """Delivers our reply; returns the scammer's follow-up message (or None)."""
+
+class EngagementEngine:
+    """
+    Asyncio engagement loop replacing the one-conversation-at-a-time polling loop.
+
+    - Inbound messages go through a bounded inbox; when it is full, receiving stops (backpressure).
+    - Each conversation has its own mailbox drained by a single task, so turns stay in order
+      while thousands of conversations progress concurrently.
+    - At most `max_in_flight` messages are queued or being handled across all mailboxes.
+    - Agent calls run on a dedicated executor so NLP work never blocks the event loop.
+    """
+
+    def __init__(self, agent, adapter, inbox_size=1000, max_in_flight=5000, poll_interval=0.0, agent_workers=1):
+        self.agent = agent
+        self.adapter = adapter
+        self.inbox = asyncio.Queue(maxsize=inbox_size)
+        self.poll_interval = poll_interval
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # Each conversation's mailbox hands the agent one turn at a time and the agent's
+        # store is locked, so different conversations can be handled on several workers
+        self._executor = ThreadPoolExecutor(max_workers=agent_workers, thread_name_prefix="agent")
+        self._mailboxes = {}
+        self._tasks = set()
+        self._stopping = asyncio.Event()
+        self.received = 0
+        self.processed = 0
+        self.responses = 0
+        self.errors = 0
+
+    async def submit(self, message):
+        """
+        Queues an inbound message; waits while the inbox is full.
+        """
+        await self.inbox.put(message)
+        self.received += 1
+
+    async def run(self, limit=None):
+        """
+        Pulls from the adapter and dispatches until stop() or `limit` inbound messages have been pulled.
+        """
+        dispatcher = asyncio.create_task(self._dispatch())
+        pulled = 0
+        try:
+            while not self._stopping.is_set():
+                if limit is not None and pulled >= limit:
+                    break
+                msg = await self.adapter.receive()
+                if msg:
+                    pulled += 1
+                    await self.submit(msg)
+                # Always yield so the dispatcher and conversation tasks get to run
+                await asyncio.sleep(self.poll_interval if msg else max(self.poll_interval, 0.1))
+            await self.drain()
+        finally:
+            dispatcher.cancel()
+            self._executor.shutdown(wait=False)
+
+    def stop(self):
+        self._stopping.set()
+
+    async def drain(self):
+        """
+        Waits until every queued message and follow-up has been handled.
+        """
+        await self.inbox.join()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _dispatch(self):
+        while True:
+            msg = await self.inbox.get()
+            await self._slots.acquire()
+            self._enqueue(msg)
+            self.inbox.task_done()
+
+    def _enqueue(self, msg):
+        conv_id = msg["conversation_id"]
+        mailbox = self._mailboxes.get(conv_id)
+        if mailbox is not None:
+            mailbox.append(msg)
+            return
+        self._mailboxes[conv_id] = deque([msg])
+        task = asyncio.create_task(self._drain_conversation(conv_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain_conversation(self, conv_id):
+        mailbox = self._mailboxes[conv_id]
+        try:
+            while mailbox:
+                msg = mailbox.popleft()
+                follow_up = None
+                try:
+                    follow_up = await self._handle(msg)
+                except Exception as e:
+                    self.errors += 1
+                    logging.error(f"Failed to handle message for {conv_id}: {e}")
+                self.processed += 1
+                if follow_up and follow_up.get("conversation_id") == conv_id:
+                    # The follow-up inherits this message's in-flight slot
+                    mailbox.append(follow_up)
+                    self.received += 1
+                else:
+                    self._slots.release()
+        finally:
+            del self._mailboxes[conv_id]
+
+    async def _handle(self, msg):
+        loop = asyncio.get_running_loop()
+        conv_id = msg["conversation_id"]
+
+        classification = await loop.run_in_executor(self._executor, self.agent.ingest, msg)
+        if classification not in ["scam", "likely_scam"]:
+            return None
+
+        response = await loop.run_in_executor(self._executor, self.agent.generate_response, conv_id)
+        if not response:
+            return None
+
+        self.responses += 1
+        return await self.adapter.send(conv_id, response)
+
+    def metrics(self):
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "responses": self.responses,
+            "errors": self.errors,
+            "inbox": self.inbox.qsize(),
+            "active_conversations": len(self._mailboxes)
+        }
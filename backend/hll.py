@@ -0,0 +1,55 @@
+import hashlib
+import math
+import numpy as np
+
+class HyperLogLog:
+    """
+    Small HyperLogLog sketch for approximate distinct counts.
+    2**p one-byte registers (p=10 -> 1 KB, ~3% standard error); sketches merge by
+    taking the register-wise max, so per-bucket sketches can be combined for any window.
+    """
+
+    def __init__(self, p=10, registers=None):
+        self.p = p
+        self.m = 1 << p
+        if registers is None:
+            self.registers = np.zeros(self.m, dtype=np.uint8)
+        else:
+            self.registers = np.frombuffer(registers, dtype=np.uint8).copy()
+
+    def add(self, value):
+        h = int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @classmethod
+    def union(cls, blobs, p=10):
+        """
+        Merges serialized sketches in one vectorized pass.
+        """
+        blobs = [b for b in blobs if b]
+        sketch = cls(p)
+        if blobs:
+            stacked = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), sketch.m)
+            sketch.registers = stacked.max(axis=0)
+        return sketch
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Small-range correction (linear counting) is near-exact for the low counts a bucket sees
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self):
+        return self.registers.tobytes()
@@ -0,0 +1,167 @@
+"""
+Indicator-of-compromise extraction shared by HoneypotAgent ingest and /api/analyze.
+
+All indicator patterns are merged into one precompiled alternation of named
+groups (like safety.PIIRedactor), so a message is scanned once. A URL, email
+or wallet consumes its own text, so the domain branch never re-matches inside
+it. Indicators are normalized and deduplicated with a set:
+
+- URL:          scheme and host lower-cased, default port and fragment dropped
+- DOMAIN:       registrable domain of every URL host and bare domain mention
+- PHONE:        E.164 (+<country><number>), using the default country code if none given.
+                Only phone shapes count: +/00 international numbers, or 10-digit
+                national numbers (optional trunk 0) written whole, 3-3-4 or 5-5.
+                Dates, times, epoch timestamps and IPs are not phones.
+- EMAIL:        lower-cased
+- BTC_ADDRESS:  base58 as written, bech32 lower-cased
+- ETH_ADDRESS:  lower-cased
+"""
+import re
+from collections import namedtuple
+
+from config import IOC_SETTINGS, STREAM_THRESHOLD
+from safety import iter_stream_segments, iter_chunks
+
+IOC = namedtuple("IOC", ["type", "value"])
+
+# Branch order matters: at a given position the first branch that matches wins.
+# Possessive quantifiers (Python 3.11+) stop words that aren't emails or domains
+# from being backtracked character by character.
+IOC_PATTERNS = {
+    "URL": r"(?i:(?:https?://|www\.)[^\s<>\"'`{}|\\^\[\]]+)",
+    "EMAIL": r"\b[A-Za-z0-9._%+-]++@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,24}\b",
+    "ETH_ADDRESS": r"\b0x[a-fA-F0-9]{40}\b",
+    "BTC_ADDRESS": r"\b(?:bc1[ac-hj-np-z02-9]{11,71}|[13][a-km-zA-HJ-NP-Z1-9]{25,34})\b",
+    "PHONE": r"(?<![:/])(?:(?:\+|00)[1-9]\d{0,2}[ .-]?\(?\d{1,4}\)?(?:[ .-]?\d{2,5}){1,4}"
+             r"|\(0?[2-9]\d{2}\) ?\d{3}[ .-]?\d{4}|0?[2-9]\d{2}[ .-]?\d{3}[ .-]?\d{4}|0?[2-9]\d{4}[ .-]?\d{5})"
+             r"(?![\w:/]|[.-]\d)",
+    "DOMAIN": r"(?i:\b(?:[a-z0-9-]{1,63}+\.)+(?:{tlds})\b)"
+}
+
+# Every indicator starts a token: skipping positions inside words, hostnames and
+# numbers up front saves trying each branch there
+TOKEN_START = r"(?<![\w.+-])"
+
+TRAILING_PUNCTUATION = ".,;:!?'\""
+CLOSING_BRACKETS = {")": "(", "]": "[", "}": "{", ">": "<"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+# scheme, userinfo, host, port, path, query (the fragment is dropped)
+URL_PARTS = re.compile(r"(?i)(https?)://(?:([^/?#@]*)@)?([^/?#:]*)(?::(\d*))?([^?#]*)(?:\?([^#]*))?")
+NON_DIGITS = re.compile(r"\D")
+# yyyy-mm-dd / dd.mm.yyyy inside a loosely grouped international number
+DATE_LIKE = re.compile(r"\d{4}[-./]\d{1,2}[-./]\d{1,2}|\d{1,2}[-./]\d{1,2}[-./]\d{4}")
+
+class IOCExtractor:
+    """
+    Precompiled single-pass IOC scanner. extract() returns IOC tuples in order of
+    first appearance, each (type, value) at most once.
+    """
+
+    def __init__(self, settings=None):
+        settings = IOC_SETTINGS if settings is None else settings
+        self.country_code = settings["default_country_code"]
+        self.multi_part_suffixes = frozenset(settings["multi_part_suffixes"])
+
+        tlds = "|".join(sorted(settings["domain_tlds"], key=len, reverse=True))
+        patterns = dict(IOC_PATTERNS, DOMAIN=IOC_PATTERNS["DOMAIN"].replace("{tlds}", tlds))
+        alternation = "|".join(f"(?P<{ioc_type}>{pattern})" for ioc_type, pattern in patterns.items())
+        self.regex = re.compile(f"{TOKEN_START}(?:{alternation})")
+
+        self.normalizers = {
+            "URL": self._normalize_url,
+            "EMAIL": lambda raw: [IOC("EMAIL", raw.lower())],
+            "ETH_ADDRESS": lambda raw: [IOC("ETH_ADDRESS", raw.lower())],
+            "BTC_ADDRESS": lambda raw: [IOC("BTC_ADDRESS", raw.lower() if raw[:3].lower() == "bc1" else raw)],
+            "PHONE": self._normalize_phone,
+            "DOMAIN": self._normalize_domain
+        }
+
+    def extract(self, text):
+        """
+        Returns the typed, normalized, deduplicated indicators found in text.
+        Large pasted payloads are scanned chunk by chunk, like the PII redactor.
+        """
+        if len(text) <= STREAM_THRESHOLD:
+            matches = self.regex.finditer(text)
+        else:
+            matches = (m for _, m in iter_stream_segments(self.regex, iter_chunks(text)) if m is not None)
+
+        seen = set()
+        seen_raw = set()  # repeated spam links are normalized once
+        found = []
+        for match in matches:
+            raw = (match.lastgroup, match.group())
+            if raw in seen_raw:
+                continue
+            seen_raw.add(raw)
+            for ioc in self.normalizers[raw[0]](raw[1]):
+                if ioc not in seen:
+                    seen.add(ioc)
+                    found.append(ioc)
+        return found
+
+    def registrable_domain(self, host):
+        """
+        example.com for a.b.example.com, example.co.in for a.example.co.in; None for IPs.
+        """
+        labels = host.lower().rstrip(".").split(".")
+        if len(labels) < 2 or not all(labels) or labels[-1].isdigit():
+            return None
+        size = 3 if ".".join(labels[-2:]) in self.multi_part_suffixes else 2
+        if len(labels) < size:
+            return None
+        return ".".join(labels[-size:])
+
+    def _normalize_url(self, raw):
+        url = raw.rstrip(TRAILING_PUNCTUATION)
+        # Drop closing brackets that belong to the surrounding prose, e.g. "(see http://x.io/a)"
+        while url and url[-1] in CLOSING_BRACKETS and url.count(url[-1]) > url.count(CLOSING_BRACKETS[url[-1]]):
+            url = url[:-1].rstrip(TRAILING_PUNCTUATION)
+        if url[:4].lower() == "www.":
+            url = "http://" + url
+        parts = URL_PARTS.match(url)
+        if parts is None:
+            return []
+        scheme, userinfo, host, port, path, query = parts.groups()
+        scheme = scheme.lower()
+        host = host.lower().rstrip(".")
+        if not host:
+            return []
+
+        netloc = host
+        if port and port != DEFAULT_PORTS[scheme]:
+            netloc = f"{netloc}:{port}"
+        if userinfo is not None:
+            netloc = f"{userinfo}@{netloc}"  # "http://bank.com@evil.io" tricks are evidence too
+        url = f"{scheme}://{netloc}{path or '/'}" + (f"?{query}" if query else "")
+
+        iocs = [IOC("URL", url)]
+        domain = self.registrable_domain(host)
+        if domain:
+            iocs.append(IOC("DOMAIN", domain))
+        return iocs
+
+    def _normalize_domain(self, raw):
+        domain = self.registrable_domain(raw)
+        return [IOC("DOMAIN", domain)] if domain else []
+
+    def _normalize_phone(self, raw):
+        if DATE_LIKE.search(raw):
+            return []
+        digits = NON_DIGITS.sub("", raw)
+        if raw.startswith("+"):
+            international = digits
+        elif raw.startswith("00"):
+            international = digits[2:]
+        elif len(digits) == 11:
+            international = self.country_code + digits[1:]  # national trunk prefix
+        else:
+            international = self.country_code + digits
+        if not 8 <= len(international) <= 15 or international.startswith("0"):
+            return []
+        return [IOC("PHONE", "+" + international)]
+
+_extractor = IOCExtractor()
+
+def extract_iocs(text):
+    return _extractor.extract(text)
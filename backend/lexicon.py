@@ -0,0 +1,65 @@
+import re
+
+class LexiconIndex:
+    """
+    Compiled lexicon matcher.
+    Each token is looked up once in a token -> category bitmask map, and all
+    phrase markers are found by a single compiled multi-pattern scan, so adding
+    lexicons or markers doesn't add passes over the message.
+    """
+
+    def __init__(self, lexicons, phrase_markers=None, urgency_categories=("time_compression", "coercion_vectors")):
+        self.categories = list(lexicons)
+        self.bits = {category: 1 << i for i, category in enumerate(self.categories)}
+
+        self.token_masks = {}
+        for category, terms in lexicons.items():
+            for term in terms:
+                self.token_masks[term] = self.token_masks.get(term, 0) | self.bits[category]
+
+        self.urgency_mask = 0
+        for category in urgency_categories:
+            self.urgency_mask |= self.bits.get(category, 0)
+
+        self.markers = [m for group in (phrase_markers or {}).values() for m in group]
+        for m in self.markers:
+            if any(other != m and other.startswith(m) for other in self.markers):
+                raise ValueError(f"Phrase marker '{m}' is a prefix of another marker")
+            if any(m[:k] == m[-k:] for k in range(1, len(m))):
+                raise ValueError(f"Phrase marker '{m}' can overlap itself")
+
+        # Zero-width lookahead reports a match at every position, overlaps included.
+        # No marker starts another or overlaps itself (checked above), so at most one
+        # marker matches per position and each count equals str.count for that marker.
+        self.phrase_pattern = None
+        if self.markers:
+            alternation = "|".join(re.escape(m) for m in sorted(self.markers, key=len, reverse=True))
+            self.phrase_pattern = re.compile(f"(?=({alternation}))")
+
+    def count_tokens(self, words):
+        """
+        Returns ({category: hits}, urgency_tokens) in one pass over the tokens.
+        """
+        counts = [0] * len(self.categories)
+        urgency_tokens = 0
+        token_masks = self.token_masks
+        for word in words:
+            mask = token_masks.get(word)
+            if not mask:
+                continue
+            if mask & self.urgency_mask:
+                urgency_tokens += 1
+            i = 0
+            while mask:
+                if mask & 1:
+                    counts[i] += 1
+                mask >>= 1
+                i += 1
+        return dict(zip(self.categories, counts)), urgency_tokens
+
+    def count_phrases(self, text):
+        counts = dict.fromkeys(self.markers, 0)
+        if self.phrase_pattern is not None:
+            for match in self.phrase_pattern.finditer(text):
+                counts[match.group(1)] += 1
+        return counts
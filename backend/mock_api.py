@@ -1,7 +1,10 @@
+import asyncio
+import logging
 import random
 import time
+from engine import AsyncScammerAdapter
 
-class MockScammerAPI:
+class MockScammerAPI(AsyncScammerAdapter):
     """
     Simulates an API provided for the challenge.
     Generates incoming messages from 'scammers' and 'benign users'.
@@ -44,6 +47,9 @@ class MockScammerAPI:
         }
     ]
 
+    CLOSED_TEXT = "[Connection Closed by Remote User]"
+    NETWORK_DELAY = 0.5
+
     def __init__(self):
         self.active_conversations = {} # map conversation_id to index in scenario
 
@@ -51,6 +57,8 @@ class MockScammerAPI:
         """Simulates receiving a new conversation starter."""
         scenario = random.choice(self.SCENARIOS)
         conv_id = f"conv_{int(time.time())}_{random.randint(100,999)}"
+        while conv_id in self.active_conversations:
+            conv_id = f"conv_{int(time.time())}_{random.randint(100,999999)}"
         
         self.active_conversations[conv_id] = {
             "scenario": scenario,
@@ -70,7 +78,27 @@ class MockScammerAPI:
         The mock API will respond with the next message in the script if available.
         """
         print(f"[API] > Agent sent to {conversation_id}: {message_text}")
-        
+        reply = self._advance(conversation_id)
+        if reply and reply["text"] != self.CLOSED_TEXT:
+            time.sleep(self.NETWORK_DELAY) # Simulate network delay
+        return reply
+
+    # --- AsyncScammerAdapter (used by the EngagementEngine) ---
+
+    async def receive(self):
+        return self.get_new_message()
+
+    async def send(self, conversation_id, text):
+        logging.info(f"[API] > Agent sent to {conversation_id}: {text}")
+        reply = self._advance(conversation_id)
+        if reply and reply["text"] != self.CLOSED_TEXT:
+            await asyncio.sleep(self.NETWORK_DELAY) # Simulated network delay without blocking the loop
+        elif reply:
+            # Script finished: forget the conversation so the mock doesn't grow forever
+            self.active_conversations.pop(conversation_id, None)
+        return reply
+
+    def _advance(self, conversation_id):
         if conversation_id not in self.active_conversations:
             return None
 
@@ -84,16 +112,12 @@ class MockScammerAPI:
         if next_index < len(scenario["messages"]):
             conv_data["msg_index"] = next_index
             response_text = scenario["messages"][next_index]
-            time.sleep(0.5) # Simulate network delay
-            return {
-                "conversation_id": conversation_id,
-                "text": response_text,
-                "timestamp": time.time()
-            }
         else:
             # End of script
-            return {
-                "conversation_id": conversation_id,
-                "text": "[Connection Closed by Remote User]",
-                "timestamp": time.time()
-            }
+            response_text = self.CLOSED_TEXT
+
+        return {
+            "conversation_id": conversation_id,
+            "text": response_text,
+            "timestamp": time.time()
+        }
@@ -0,0 +1,462 @@
+"""
+Report persistence shared by /api/report, /api/report/batch and the optional
+write-behind queue. Reports are plain dicts with the ReportRequest fields.
+
+Write-behind mode (config.WRITE_BEHIND): each report is appended to an on-disk
+journal and queued, the request is acknowledged, and a worker thread files the
+queue in batches. After every committed batch a checkpoint record (the last
+filed seq) is appended; once the filed reports outnumber the pending ones the
+journal is compacted to the pending reports (written aside outside the queue
+lock, fsynced, renamed over the old one). On startup whatever is past the last
+checkpoint is replayed. A crash between a commit and its checkpoint replays
+that batch: cases are deduplicated by ID, and replayed reports only count
+towards the stats if their case was actually inserted.
+
+A batch that fails is retried one report at a time, so a single bad report
+cannot hold up the rest. A report that still fails after max_attempts (for
+anything but a lost DB connection) is moved to <journal>.quarantine for manual
+inspection and dropped from the queue.
+
+Every process claims its own journal slot (report_journal.log,
+report_journal.1.log, ...) with an exclusive lock, so API workers never share
+a journal; slots left behind by workers that no longer run are adopted.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: the desktop launcher only runs one worker
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from counters import increment as increment_counters, report_deltas
+from database import Case, parse_timestamp
+from rollups import record_cases as record_rollups
+
+MAX_JOURNAL_SLOTS = 64
+
+def file_reports(db, reports, count_duplicates=True):
+    """
+    Files reports in the current transaction (caller commits) and returns a
+    status per report: "created", or "duplicate" if the case ID already exists
+    in the DB or earlier in the list. Every report counts towards the stats,
+    unless count_duplicates is False (journal replay): then only reports whose
+    case was inserted count, so replaying an already committed batch is a no-op.
+    """
+    ids = {r["conversationId"] for r in reports}
+    existing = {cid for (cid,) in db.query(Case.id).filter(Case.id.in_(ids))} if ids else set()
+
+    statuses = []
+    new_cases = []
+    for r in reports:
+        if r["conversationId"] in existing:
+            statuses.append("duplicate")
+            continue
+        existing.add(r["conversationId"])
+        statuses.append("created")
+        new_cases.append({
+            "id": r["conversationId"],
+            "scammer_name": r.get("scammerName"),
+            "platform": r.get("platform"),
+            "status": "closed",
+            "threat_level": r["classification"],
+            "iocs": r.get("iocs"),
+            "transcript": r.get("transcript"),
+            "timestamp": r.get("timestamp"),
+            "created_at": parse_timestamp(r.get("timestamp")),  # bulk insert bypasses the ORM validator
+            "auto_reported": True
+        })
+
+    if new_cases:
+        db.execute(insert(Case), new_cases)
+        record_rollups(db, [(c["created_at"], c["threat_level"], c["platform"], c["scammer_name"]) for c in new_cases])
+    counted = reports if count_duplicates else [r for r, s in zip(reports, statuses) if s == "created"]
+    increment_counters(db, report_deltas([r["classification"] for r in counted]))
+    return statuses
+
+def journal_slot_path(journal_path, slot):
+    if slot == 0:
+        return journal_path
+    base, ext = os.path.splitext(journal_path)
+    return f"{base}.{slot}{ext}"
+
+def lock_journal(path):
+    """
+    Non-blocking exclusive lock on <journal>.lock; returns the open lock file, or None if taken.
+    """
+    lock_file = open(path + ".lock", "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+def read_journal(path):
+    """
+    Returns ([(seq, report)] past the last checkpoint in seq order, highest seq seen).
+    A checkpoint record marks every report up to its seq as filed.
+    """
+    entries = {}
+    checkpoint = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write from a crash mid-append; it was never acknowledged
+            if "checkpoint" in record:
+                checkpoint = max(checkpoint, record["checkpoint"])
+            else:
+                entries[record["seq"]] = record["report"]
+    pending = [(seq, entries[seq]) for seq in sorted(entries) if seq > checkpoint]
+    return pending, max([checkpoint] + list(entries))
+
+def fsync_directory(path):
+    """
+    Makes a rename in path's directory durable (not supported on Windows).
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class ReportWriteBehind:
+    """
+    Journal-backed report queue flushed to the DB by a background thread.
+    journal_path is the base name; the journal actually used is the first slot
+    this process could lock.
+    """
+    def __init__(self, session_factory, journal_path, flush_size=200, flush_interval=0.5,
+                 fsync=True, on_flush=None, max_attempts=3, compact_after=1000):
+        self.session_factory = session_factory
+        self.base_journal_path = journal_path
+        self.journal_path = None
+        self.journal_lock = None
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.on_flush = on_flush  # called after each committed batch (e.g. cache invalidation)
+        self.max_attempts = max_attempts  # failed attempts before a single report is quarantined
+        self.compact_after = compact_after  # filed reports left in the journal before it is compacted
+
+        self.lock = threading.Condition()
+        self.pending = deque()  # (seq, report, enqueued_at, replayed)
+        self.seq = 0
+        self.journal = None
+        self.worker = None
+        self.running = False
+
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.replayed = 0
+        self.compactions = 0
+        self.quarantined = 0
+        self.attempts = {}  # seq -> failed attempts of the report on its own
+        self.filed_in_journal = 0  # journal records behind the last checkpoint
+
+    def start(self):
+        """
+        Replays unflushed journal entries, then starts the flush worker.
+        """
+        with self.lock:
+            if self.running:
+                return
+            orphans = self._claim_journal()
+            self._replay(self.journal_path)
+            for path, _ in orphans:
+                self._replay(path)
+            self._rewrite_journal()  # adopted reports are now durable in our own journal
+            for path, lock_file in orphans:
+                os.remove(path)
+                lock_file.close()
+            self.running = True
+        self.worker = threading.Thread(target=self._run, name="report-write-behind", daemon=True)
+        self.worker.start()
+        logging.info(f"[REPORTS] Write-behind started on {self.journal_path} "
+                     f"({self.replayed} replayed, {len(orphans)} orphaned journals adopted)")
+
+    def stop(self, timeout=10.0):
+        """
+        Flushes whatever is queued and stops the worker.
+        """
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            self.lock.notify_all()
+        self.worker.join(timeout)
+        with self.lock:
+            if not self.worker.is_alive():  # a stuck worker may be mid-compaction
+                try:
+                    self._rewrite_journal()
+                except OSError as e:
+                    logging.error(f"[REPORTS] Journal compaction failed: {e}")
+            self.journal.close()
+            self.journal = None
+            if self.journal_lock is not None:
+                self.journal_lock.close()
+                self.journal_lock = None
+
+    def submit(self, reports):
+        """
+        Journals and queues reports; returns once they are durable on disk.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if not self.running:
+                raise RuntimeError("write-behind queue is not running")
+            lines = []
+            for report in reports:
+                self.seq += 1
+                self.pending.append((self.seq, report, now, False))
+                lines.append(json.dumps({"seq": self.seq, "report": report}))
+            self.journal.write("\n".join(lines) + "\n")
+            self.journal.flush()
+            if self.fsync:
+                os.fsync(self.journal.fileno())
+            if len(self.pending) >= self.flush_size:
+                self.lock.notify_all()
+
+    def _claim_journal(self):
+        """
+        Locks the first free journal slot for this process and returns the
+        [(path, lock_file)] of other slots whose owner is gone (left locked for adoption).
+        """
+        self.journal_path = None
+        if fcntl is None:
+            self.journal_path = self.base_journal_path
+            return []
+        orphans = []
+        for slot in range(MAX_JOURNAL_SLOTS):
+            path = journal_slot_path(self.base_journal_path, slot)
+            if self.journal_path is not None and not os.path.exists(path):
+                continue
+            lock_file = lock_journal(path)
+            if lock_file is None:
+                continue  # a live worker owns it
+            if self.journal_path is None:
+                self.journal_path, self.journal_lock = path, lock_file
+            else:
+                orphans.append((path, lock_file))
+        if self.journal_path is None:
+            raise RuntimeError(f"all {MAX_JOURNAL_SLOTS} report journal slots are locked")
+        return orphans
+
+    def _replay(self, path):
+        if not os.path.exists(path):
+            return
+        entries, last_seq = read_journal(path)
+        now = time.monotonic()
+        if path == self.journal_path:
+            self.seq = last_seq
+        for seq, report in entries:
+            if path != self.journal_path:
+                self.seq += 1  # adopted reports are renumbered into this journal
+                seq = self.seq
+            self.pending.append((seq, report, now, True))
+        self.replayed += len(entries)
+
+    def _rewrite_journal(self):
+        """
+        Replaces the journal with just the pending reports (caller holds the lock
+        and the worker is not running, i.e. on start and stop): written aside,
+        fsynced, renamed over the old one, directory fsynced.
+        """
+        if self.journal is not None:
+            self.journal.close()
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for seq, report, _, _ in self.pending:
+                f.write(json.dumps({"seq": seq, "report": report}) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        if self.fsync:
+            fsync_directory(self.journal_path)
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+        self.filed_in_journal = 0
+        self.compactions += 1
+
+    def _compact(self):
+        """
+        Compacts the journal without holding the lock for the bulk of the work:
+        the pending reports are written aside and fsynced unlocked, then, under
+        the lock, whatever was appended meanwhile is copied over and the file is
+        renamed into place. Only the worker thread checkpoints, so the appended
+        tail holds nothing but new reports.
+        """
+        with self.lock:
+            self.journal.flush()
+            offset = self.journal.tell()
+            snapshot = [(seq, report) for seq, report, _, _ in self.pending]
+        tmp_path = self.journal_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for seq, report in snapshot:
+                    f.write((json.dumps({"seq": seq, "report": report}) + "\n").encode("utf-8"))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                with self.lock:
+                    self.journal.flush()
+                    with open(self.journal_path, "rb") as journal:
+                        journal.seek(offset)
+                        f.write(journal.read())
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.journal_path)
+                    if self.fsync:
+                        fsync_directory(self.journal_path)
+                    self.journal.close()
+                    self.journal = open(self.journal_path, "a", encoding="utf-8")
+                    self.filed_in_journal = 0
+                    self.compactions += 1
+        except OSError as e:
+            # The old journal is intact; its filed reports stay behind their checkpoints
+            logging.error(f"[REPORTS] Journal compaction failed: {e}")
+            with self.lock:
+                if self.journal.closed:
+                    self.journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _compaction_due(self):
+        with self.lock:
+            return self.filed_in_journal >= max(self.compact_after, len(self.pending))
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while self.running and not self._due():
+                    timeout = self.flush_interval
+                    if self.pending:
+                        timeout = max(0.0, self.pending[0][2] + self.flush_interval - time.monotonic())
+                    self.lock.wait(timeout)
+                if not self.pending and not self.running:
+                    return
+                # Replayed reports (always at the head) are never batched with new ones
+                batch = []
+                for entry in self.pending:
+                    if len(batch) == self.flush_size or (batch and entry[3] != batch[0][3]):
+                        break
+                    batch.append(entry)
+            if batch and not self._file(batch):
+                if not self.running:
+                    return  # leave the rest in the journal for the next start
+                time.sleep(self.flush_interval)  # back off, then retry from the report that failed
+            if self._compaction_due():
+                self._compact()
+
+    def _due(self):
+        if len(self.pending) >= self.flush_size:
+            return True
+        return bool(self.pending) and time.monotonic() - self.pending[0][2] >= self.flush_interval
+
+    def _flush(self, batch):
+        """
+        Files the batch in one transaction and drops it from the queue; returns
+        the exception on failure (the batch stays queued), None on success.
+        """
+        db = self.session_factory()
+        try:
+            file_reports(db, [entry[1] for entry in batch], count_duplicates=not batch[0][3])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failures += 1
+            logging.error(f"[REPORTS] Write-behind flush of {len(batch)} reports failed: {e}")
+            return e
+        finally:
+            db.close()
+
+        with self.lock:
+            self._drop(len(batch))
+            self.flushed += len(batch)
+            self.batches += 1
+        if self.on_flush:
+            self.on_flush()
+        return None
+
+    def _file(self, batch):
+        """
+        Files a batch, retrying its reports one at a time if it fails. Returns
+        False if the worker should back off and retry from the head of the queue.
+        """
+        error = self._flush(batch)
+        if error is None:
+            return True
+        if isinstance(error, OperationalError):
+            return False  # DB unreachable or locked, not the reports' fault
+        if len(batch) > 1:
+            return all(self._file([entry]) for entry in batch)  # stops at the first report that fails
+        seq = batch[0][0]
+        self.attempts[seq] = self.attempts.get(seq, 0) + 1
+        if self.attempts[seq] < self.max_attempts:
+            return False
+        self._quarantine(batch[0], error)
+        return True
+
+    def _quarantine(self, entry, error):
+        """
+        Moves a report that keeps failing (the head of the queue) to the quarantine file.
+        """
+        seq, report, _, _ = entry
+        with open(self.journal_path + ".quarantine", "a", encoding="utf-8") as f:
+            f.write(json.dumps({"seq": seq, "report": report, "error": str(error)}) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        with self.lock:
+            self._drop(1)
+            self.quarantined += 1
+        logging.error(f"[REPORTS] Quarantined report {report.get('conversationId')!r} after "
+                      f"{self.max_attempts} failed attempts: {error}")
+
+    def _drop(self, count):
+        """
+        Removes filed (or quarantined) reports from the head of the queue and
+        checkpoints them in the journal (caller holds the lock).
+        """
+        for _ in range(count):
+            seq = self.pending.popleft()[0]
+            self.attempts.pop(seq, None)
+        self.filed_in_journal += count
+        self._checkpoint(seq)
+
+    def _checkpoint(self, seq):
+        """
+        Appends a checkpoint record; not fsynced, losing it only replays filed reports as no-ops.
+        """
+        try:
+            self.journal.write(json.dumps({"checkpoint": seq}) + "\n")
+            self.journal.flush()
+        except OSError as e:
+            logging.error(f"[REPORTS] Journal checkpoint failed: {e}")
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "pending": len(self.pending),
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "failures": self.failures,
+                "replayed": self.replayed,
+                "compactions": self.compactions,
+                "quarantined": self.quarantined,
+                "journal": self.journal_path
+            }
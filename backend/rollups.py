@@ -0,0 +1,163 @@
+"""
+Hourly stats rollups for the dashboard.
+submit_report folds each new case into its hour bucket, and /api/stats sums at
+most 720 buckets (30 days) instead of scanning cases.
+
+Rebuild from the cases table (e.g. after a manual import):
+    python rollups.py rebuild
+"""
+import datetime
+import logging
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from database import Case, StatsRollup
+from hll import HyperLogLog
+
+THREAT_TYPES = ["ROMANCE", "CRYPTO", "JOB", "IMPERSONATION", "LOTTERY", "TECHNICAL_SUPPORT", "AUTHORITY", "OTHER"]
+
+def bucket_for(ts):
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+def _type_key(threat_level):
+    return threat_level.upper() if threat_level else "OTHER"
+
+def _fold_rows(rows):
+    """
+    Groups (created_at, threat_level, platform, scammer_name) rows into per-hour deltas.
+    """
+    buckets = {}
+    for created_at, threat_level, platform, scammer_name in rows:
+        if created_at is None:
+            continue
+        b = buckets.setdefault(bucket_for(created_at), {"cases": 0, "types": {}, "platforms": {}, "hll": HyperLogLog()})
+        b["cases"] += 1
+        ctype = _type_key(threat_level)
+        b["types"][ctype] = b["types"].get(ctype, 0) + 1
+        platform = platform or "unknown"
+        b["platforms"][platform] = b["platforms"].get(platform, 0) + 1
+        if scammer_name:
+            b["hll"].add(scammer_name)
+    return buckets
+
+def record_case(db, case):
+    """
+    Adds one new case to its hour bucket (same transaction as the case insert).
+    """
+    record_cases(db, [(case.created_at, case.threat_level, case.platform, case.scammer_name)])
+
+def ensure_buckets(db, buckets):
+    """
+    Creates any missing (empty) bucket rows. FOR UPDATE can't lock a row that
+    doesn't exist yet, so concurrent first reports of an hour would otherwise
+    race to insert the same bucket.
+    """
+    dialect = db.get_bind().dialect.name
+    rows = [{"bucket": bucket, "cases": 0, "types_json": {}, "platforms_json": {}} for bucket in sorted(buckets)]
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        db.execute(insert(StatsRollup).values(rows).on_conflict_do_nothing(index_elements=[StatsRollup.bucket]))
+        return
+
+    # Generic fallback: insert each missing bucket in a savepoint, losing a race is fine
+    present = {bucket for (bucket,) in db.query(StatsRollup.bucket).filter(StatsRollup.bucket.in_(list(buckets)))}
+    for row in rows:
+        if row["bucket"] in present:
+            continue
+        try:
+            with db.begin_nested():
+                db.add(StatsRollup(**row))
+        except IntegrityError:
+            pass
+
+def record_cases(db, rows):
+    """
+    Adds a group of new cases, touching each hour bucket once.
+    """
+    buckets = _fold_rows(rows)
+    if not buckets:
+        return
+    ensure_buckets(db, buckets)
+    existing = {r.bucket: r for r in db.query(StatsRollup)
+                .filter(StatsRollup.bucket.in_(list(buckets))).with_for_update().all()}
+    for bucket, b in buckets.items():
+        rollup = existing[bucket]
+        types = dict(rollup.types_json or {})
+        for t, n in b["types"].items():
+            types[t] = types.get(t, 0) + n
+        platforms = dict(rollup.platforms_json or {})
+        for p, n in b["platforms"].items():
+            platforms[p] = platforms.get(p, 0) + n
+
+        rollup.cases = (rollup.cases or 0) + b["cases"]
+        rollup.types_json = types # Reassign to trigger update
+        rollup.platforms_json = platforms
+        sketch = HyperLogLog(registers=rollup.scammers_hll) if rollup.scammers_hll else HyperLogLog()
+        sketch.merge(b["hll"])
+        rollup.scammers_hll = sketch.to_bytes()
+
+def rebuild_rollups(db, batch_size=1000):
+    """
+    Regenerates every rollup row from the cases table.
+    """
+    query = db.query(Case.created_at, Case.threat_level, Case.platform, Case.scammer_name) \
+        .filter(Case.created_at.isnot(None)).yield_per(batch_size)
+    buckets = _fold_rows(query)
+
+    db.query(StatsRollup).delete()
+    db.bulk_save_objects([
+        StatsRollup(bucket=bucket, cases=b["cases"], types_json=b["types"], platforms_json=b["platforms"],
+                    scammers_hll=b["hll"].to_bytes())
+        for bucket, b in buckets.items()
+    ])
+    db.commit()
+    logging.info(f"[ROLLUP] Rebuilt {len(buckets)} hourly buckets")
+    return len(buckets)
+
+def summarize(db, now=None):
+    """
+    Today / week / month counts, type + platform breakdowns and distinct scammers.
+    Windows have hour granularity: a bucket counts if its hour overlaps the window.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    windows = {"today": now - datetime.timedelta(days=1),
+               "week": now - datetime.timedelta(days=7),
+               "month": now - datetime.timedelta(days=30)}
+
+    rows = db.query(StatsRollup).filter(StatsRollup.bucket >= bucket_for(windows["month"])).all()
+
+    summary = {}
+    for name, since in windows.items():
+        start = bucket_for(since)
+        in_window = [r for r in rows if r.bucket >= start]
+        types = {t: 0 for t in THREAT_TYPES}
+        platforms = {}
+        for r in in_window:
+            for t, n in (r.types_json or {}).items():
+                key = t if t in types else "OTHER"
+                types[key] += n
+            for p, n in (r.platforms_json or {}).items():
+                platforms[p] = platforms.get(p, 0) + n
+        summary[name] = {
+            "count": sum(r.cases or 0 for r in in_window),
+            "types": types,
+            "platforms": platforms,
+            "scammers": HyperLogLog.union([r.scammers_hll for r in in_window]).count()
+        }
+    return summary
+
+if __name__ == "__main__":
+    import sys
+    from database import SessionLocal, init_db
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("usage: python rollups.py rebuild")
+        sys.exit(1)
+
+    init_db()
+    session = SessionLocal()
+    try:
+        print(f"Rebuilt {rebuild_rollups(session)} hourly rollup buckets")
+    finally:
+        session.close()
@@ -1,30 +1,131 @@
 import re
 import logging
-from config import SENSITIVE_PATTERNS, UNSAFE_KEYWORDS
+from collections import Counter
+from config import SENSITIVE_PATTERNS, UNSAFE_KEYWORDS, STREAM_CHUNK_SIZE, STREAM_OVERLAP
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [SAFETY] - %(message)s')
 
+def iter_chunks(text, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Slices an in-memory string into chunks for the streaming scanners.
+    """
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
+
+def iter_stream_segments(regex, chunks, overlap=STREAM_OVERLAP):
+    """
+    Scans an iterable of text chunks with `regex` in constant memory.
+    Yields (plain_text, match) pairs in stream order; match is None for plain text
+    that precedes no match yet. The last `overlap` characters of each window are
+    held back and rescanned with the next chunk, so any match shorter than
+    `overlap` that straddles a chunk boundary is still found (exactly once).
+    """
+    tail = ""   # held-back text, prefixed by one already-emitted char for \b context
+    start = 0   # where the unemitted part of `tail` begins
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf = tail + chunk
+        cut = len(buf) - overlap
+        if cut <= start:
+            tail = buf
+            continue
+
+        pos = start
+        for match in regex.finditer(buf, start):
+            if match.start() >= cut:
+                break
+            yield buf[pos:match.start()], match
+            pos = match.end()
+        if pos < cut:
+            yield buf[pos:cut], None
+            pos = cut
+
+        keep_from = pos - 1 if pos > 0 else 0
+        tail = buf[keep_from:]
+        start = pos - keep_from
+
+    # Flush whatever is still held back
+    pos = start
+    for match in regex.finditer(tail, start):
+        yield tail[pos:match.start()], match
+        pos = match.end()
+    if pos < len(tail):
+        yield tail[pos:], None
+
+class PIIRedactor:
+    """
+    Precompiled single-pass redaction engine.
+    All SENSITIVE_PATTERNS are merged into one alternation of named groups, so a
+    message is scanned once and only real regex matches are replaced.
+    """
+
+    def __init__(self, patterns=None):
+        self.patterns = SENSITIVE_PATTERNS if patterns is None else patterns
+
+        # Every built-in pattern starts at a word boundary; checking it once up front
+        # lets the scanner skip mid-word positions without trying each branch
+        prefix = ""
+        branches = dict(self.patterns)
+        if branches and all(p.startswith(r"\b") for p in branches.values()):
+            prefix = r"\b"
+            branches = {pii_type: p[2:] for pii_type, p in branches.items()}
+
+        alternation = "|".join(f"(?P<{pii_type}>{pattern})" for pii_type, pattern in branches.items())
+        self.regex = re.compile(f"{prefix}(?:{alternation})")
+
+    def redact(self, text):
+        """
+        Returns (redacted_text, {pii_type: count}).
+        """
+        counts = Counter()
+
+        def _replace(match):
+            # The named wrapper group always closes last, so lastgroup is the PII type
+            pii_type = match.lastgroup
+            counts[pii_type] += 1
+            return f"[REDACTED: {pii_type}]"
+
+        return self.regex.sub(_replace, text), counts
+
+    def redact_stream(self, chunks, counts=None, overlap=STREAM_OVERLAP):
+        """
+        Generator version of redact() for huge pasted payloads.
+        Yields redacted text pieces; per-type counts are accumulated into `counts` if given.
+        """
+        for text, match in iter_stream_segments(self.regex, chunks, overlap):
+            if match is None:
+                yield text
+                continue
+            if counts is not None:
+                counts[match.lastgroup] = counts.get(match.lastgroup, 0) + 1
+            yield f"{text}[REDACTED: {match.lastgroup}]"
+
+_redactor = PIIRedactor()
+
 class SafetyGuard:
     @staticmethod
     def redact_pii(text):
         """
         Scans text for sensitive patterns and replaces them with [REDACTED: <TYPE>].
         """
-        redacted_text = text
-        
-        for pii_type, pattern in SENSITIVE_PATTERNS.items():
-            matches = re.findall(pattern, redacted_text)
-            for match in matches:
-                # Handle tuple matches from complex regex
-                if isinstance(match, tuple):
-                    match_str = "".join([m for m in match if m])
-                else:
-                    match_str = match
-                    
-                if match_str:
-                    redacted_text = redacted_text.replace(match_str, f"[REDACTED: {pii_type}]")
-        
-        return redacted_text
+        return _redactor.redact(text)[0]
+
+    @staticmethod
+    def redact_pii_with_counts(text):
+        """
+        Same as redact_pii, but also reports how many matches of each PII type were redacted.
+        """
+        redacted_text, counts = _redactor.redact(text)
+        return redacted_text, dict(counts)
+
+    @staticmethod
+    def redact_pii_stream(chunks, counts=None):
+        """
+        Streaming redaction over an iterable of text chunks (constant memory).
+        """
+        return _redactor.redact_stream(chunks, counts)
 
     @staticmethod
     def check_policy(response_text):
@@ -1,9 +1,16 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+import asyncio
+import json
+import logging
 import os
+import threading
+import time
 
 # Configuration
 SECRET_KEY = os.environ.get("SECRET_KEY", "HACKME_PLEASE_CHANGE_THIS_IN_PROD_BUT_IT_IS_A_HONEYPOT_SO_MAYBE_NOT")
@@ -18,6 +25,65 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# Dedicated pool for login/register work (password hashing plus their short user
+# lookups) so auth bursts can't starve the request threadpool, and a saturated
+# request threadpool can't stall logins. hashlib's PBKDF2 releases the GIL.
+AUTH_WORKERS = int(os.environ.get("AUTH_WORKERS", "4"))
+AUTH_MAX_PENDING = int(os.environ.get("AUTH_MAX_PENDING", "64"))  # running + queued
+AUTH_RETRY_AFTER = 1  # seconds, sent with the 503 when the pool is full
+
+auth_pool = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+_auth_slots = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+
+class AuthPoolBusy(Exception):
+    """
+    Raised when AUTH_MAX_PENDING auth tasks are already running or queued.
+    """
+
+async def run_auth_task(fn, *args):
+    if not _auth_slots.acquire(blocking=False):
+        raise AuthPoolBusy()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(auth_pool, fn, *args)
+    finally:
+        _auth_slots.release()
+
+async def verify_password_async(plain_password, hashed_password):
+    return await run_auth_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await run_auth_task(get_password_hash, password)
+
+class BootstrapUsers:
+    """
+    users.json (username -> password) used to auto-create operators on first login.
+    Parsed once and re-read only when the file's mtime changes.
+    """
+    FALLBACK = {"admin": "password123"}
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.mtime = None
+        self.users = None
+
+    def get(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None  # missing: the fallback is cached until the file appears
+        with self.lock:
+            if self.users is not None and mtime == self.mtime:
+                return self.users
+            try:
+                with open(self.path, "r") as f:
+                    self.users = json.load(f)
+            except Exception as e:
+                logging.error(f"Could not load users.json: {e}")
+                self.users = self.FALLBACK
+            self.mtime = mtime
+            return self.users
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -28,9 +94,77 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class TokenCache:
+    """
+    Verified token -> payload, so repeat requests with the same token skip
+    jwt.decode. An entry never outlives the token's own exp (or ttl, if sooner).
+    """
+    def __init__(self, max_entries=1024, ttl=300, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # token -> (payload, valid_until)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, token):
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, valid_until = entry
+            if now >= valid_until:
+                del self.entries[token]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(token)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, token, payload):
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return  # no expiry claim: always verify
+        valid_until = min(exp, self.clock() + self.ttl)
+        with self.lock:
+            self.entries[token] = (dict(payload), valid_until)
+            self.entries.move_to_end(token)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+token_cache = TokenCache()
+
 def decode_access_token(token: str):
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    token_cache.put(token, payload)
+    return payload
@@ -1,14 +1,19 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Query
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta, timezone
 import logging
+import re
 import time
 import json
 import os
+import base64
+import traceback
+import anyio
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -22,17 +27,21 @@ if backend_dir not in sys.path:
     sys.path.append(backend_dir)
 
 # Internal Modules
-from analyzer import ScamAnalyzer
+from analyzer import ScamAnalyzer, ensure_corpora
+from analysis_pool import AnalysisExecutor
 from agent import HoneypotAgent
-from database import SessionLocal, engine, init_db, User, Case, Stats, WebAuthnChallenge
+from database import SessionLocal, engine, init_db_once, THREADPOOL_SIZE, User, Case, WebAuthnCredential
 import security
+from challenges import make_challenge_store
+from counters import CounterCache
+from reports import ReportWriteBehind, file_reports
+from rollups import summarize as summarize_rollups
+from config import WRITE_BEHIND, WEBAUTHN_CHALLENGES, ANALYZER_EXECUTOR
+from iocs import extract_iocs
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [API] - %(message)s')
 
-# Initialize DB tables
-init_db()
-
 app = FastAPI(title="Honeypot Cyber Cell API")
 
 # Enable CORS for frontend
@@ -50,6 +59,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*", "X-Rakshak-Token"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Initialize Rate Limiter
@@ -79,6 +89,34 @@ async def secure_headers_and_obfuscation(request: Request, call_next):
 # Initialize Core Logic
 analyzer = ScamAnalyzer()
 agent = HoneypotAgent()
+# ANALYZER_MODE=process moves /api/analyze scoring onto warm worker processes
+analysis_executor = AnalysisExecutor(
+    mode=ANALYZER_EXECUTOR["mode"], workers=ANALYZER_EXECUTOR["workers"],
+    max_batch=ANALYZER_EXECUTOR["max_batch"], batch_window=ANALYZER_EXECUTOR["batch_window"],
+    analyzer=analyzer, result_timeout=ANALYZER_EXECUTOR["result_timeout"]
+)
+
+@app.on_event("startup")
+def prepare_schema():
+    # Registered first: later startup hooks and every request need the tables.
+    # Only the first worker to boot creates/upgrades them, the rest compare a stamp.
+    init_db_once()
+
+@app.on_event("startup")
+def prepare_nlp():
+    # Check/download NLTK corpora once per process instead of on every request,
+    # then warm the tokenizer so the first /api/analyze call doesn't pay for loading it
+    ensure_corpora()
+    try:
+        analyzer.analyze([{"role": "scammer", "content": "Warm-up message, please ignore."}])
+        analysis_executor.start()
+    except Exception as e:
+        logging.error(f"NLP warm-up failed, /api/analyze will use fallback heuristics: {e}")
+
+@app.on_event("startup")
+async def size_threadpool():
+    # Sync endpoints run on AnyIO's threadpool; keep it in step with the DB connection pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
 
 # Dependency
 def get_db():
@@ -93,6 +131,15 @@ class AnalysisRequest(BaseModel):
     text: str
     context: Optional[str] = "general"
 
+MAX_BATCH_HISTORIES = 1000
+
+class HistoryMessage(BaseModel):
+    role: str
+    content: str
+
+class BatchAnalysisRequest(BaseModel):
+    histories: List[List[HistoryMessage]]
+
 class ReportRequest(BaseModel):
     conversationId: str
     scammerName: Optional[str] = "Unknown"
@@ -103,6 +150,11 @@ class ReportRequest(BaseModel):
     iocs: Dict[str, Any]
     timestamp: str
 
+MAX_REPORT_BATCH = 500
+
+class ReportBatchRequest(BaseModel):
+    reports: List[Dict[str, Any]]  # each item is validated as a ReportRequest
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -113,58 +165,49 @@ class LoginRequest(BaseModel):
 def read_root():
     return {"status": "active", "system": "Cyber Cell Core", "version": "2.0.0 (Fortified)"}
 
+@app.get("/api/metrics")
+@limiter.limit("30/minute")
+def get_metrics(request: Request):
+    """
+    Internal counters used to size caches and queues.
+    """
+    return {
+        "feature_cache": {
+            "analyze": analyzer.feature_cache.stats(),
+            "agent": agent.analyzer.feature_cache.stats()
+        },
+        "analysis_executor": analysis_executor.metrics(),
+        "conversations": agent.store.metrics(),
+        "report_dispatch": agent.dispatcher.metrics(),
+        "stats_cache": stats_cache.stats(),
+        "token_cache": security.token_cache.stats(),
+        "webauthn_challenges": challenge_store.metrics(),
+        "report_queue": report_queue.metrics() if report_queue is not None else None
+    }
+
 @app.post("/api/analyze")
 @limiter.limit("20/minute")
 def analyze_text(payload: AnalysisRequest, request: Request):
     """
     Performs deep heuristic analysis on a text snippet with robust NLTK fallback.
     """
-    import re
-    import traceback
-    
     start_time = time.time()
     classification = "benign"
     intent = "GENERAL INQUIRY"
     score = 0.1
-    iocs = []
     neuro_matrix = {}
     
-    # Very basic regex for URLs/domains/phones/crypto (always runs)
+    # Typed, normalized URLs/domains/phones/emails/wallets (always runs)
     req_text = payload.text
-    urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', req_text)
-    domains = re.findall(r'[a-zA-Z0-9-]+\.(?:com|net|org|io|biz|info)', req_text)
-    
-    iocs.extend(urls)
-    for d in domains:
-        if not any(d in u for u in urls):
-            iocs.append(d)
-            
-    phones = re.findall(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', req_text)
-    iocs.extend(phones)
-    
-    crypto = re.findall(r'\b(?:1|3|bc1|0x)[a-zA-Z0-9]{25,40}\b', req_text)
-    iocs.extend(crypto)
+    indicators = extract_iocs(req_text)
     
     try:
-        from backend.analyzer import ScamAnalyzer
-        import nltk
-        
-        # Best effort corpora download, skip if it fails
-        corpora = ['punkt_tab', 'averaged_perceptron_tagger', 'brown', 'wordnet']
-        for c in corpora:
-            try:
-                nltk.data.find(f'tokenizers/{c}' if 'punkt' in c else f'corpora/{c}')
-            except LookupError:
-                try:
-                    nltk.download(c, quiet=True)
-                except Exception:
-                    pass
-        
-        # Reusing the globally instantiated analyzer for performance
+        # Reusing the globally instantiated analyzer for performance (corpora are loaded at startup)
         # analyzer is defined globally in server.py
         history = [{"role": "scammer", "content": req_text}]
-        score, classification, neuro_matrix = analyzer.analyze_behavior(history)
-        intent = analyzer.intent.replace("_", " ")
+        result = analysis_executor.analyze(history)
+        score, classification, neuro_matrix = result.score, result.classification, result.neuro_matrix
+        intent = result.intent.replace("_", " ")
         
     except Exception as e:
         logging.error(f"NLP Analyzer failed, falling back to basic heuristics: {e}")
@@ -180,113 +223,214 @@ def analyze_text(payload: AnalysisRequest, request: Request):
             classification = "scam"
             intent = "MALICIOUS PHISHING"
             score = 0.95
-        if urls or crypto:
+        if any(i.type in ("URL", "BTC_ADDRESS", "ETH_ADDRESS") for i in indicators):
             classification = "scam"
-            
-    # Simulate processing delay for "Deep Scan" effect
-    time.sleep(0.5) 
-    
+
     return {
         "classification": classification,
         "score": score,
         "intent": intent,
-        "iocs": list(set(iocs)),
+        "iocs": [i.value for i in indicators],
+        "indicators": [i._asdict() for i in indicators],
         "neuro_matrix": neuro_matrix,
         "processing_time": time.time() - start_time,
         "verified": True
     }
 
+@app.post("/api/analyze/batch")
+@limiter.limit("5/minute")
+def analyze_batch(payload: BatchAnalysisRequest, request: Request):
+    """
+    Scores many conversation histories in one call (historical transcript backfills).
+    Results come back in input order.
+    """
+    if len(payload.histories) > MAX_BATCH_HISTORIES:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_HISTORIES} histories)")
+
+    start_time = time.time()
+    histories = [[m.model_dump() for m in history] for history in payload.histories]
+    results = [r._replace(intent=r.intent.replace("_", " "))._asdict()
+               for r in analysis_executor.analyze_many(histories)]
+
+    return {
+        "results": results,
+        "count": len(results),
+        "processing_time": time.time() - start_time
+    }
 
 # --- Stats Management ---
+stats_cache = CounterCache()
+
+# Optional write-behind for reports (REPORT_WRITE_BEHIND=1), started with the app
+report_queue = None
+if WRITE_BEHIND["enabled"]:
+    report_queue = ReportWriteBehind(
+        SessionLocal, WRITE_BEHIND["journal_path"],
+        flush_size=WRITE_BEHIND["flush_size"], flush_interval=WRITE_BEHIND["flush_interval"],
+        fsync=WRITE_BEHIND["fsync"], on_flush=stats_cache.invalidate,
+        max_attempts=WRITE_BEHIND["max_attempts"], compact_after=WRITE_BEHIND["compact_after"]
+    )
+
+@app.on_event("startup")
+def start_report_queue():
+    if report_queue is not None:
+        report_queue.start()
+
+@app.on_event("shutdown")
+def stop_report_queue():
+    if report_queue is not None:
+        report_queue.stop()
+    agent.dispatcher.stop()
+    analysis_executor.stop()
+
 def get_or_create_stats(db: Session):
-    stats = db.query(Stats).first()
-    if not stats:
-        stats = Stats(reports_filed=0, scams_detected=0, types_json={})
-        db.add(stats)
-        db.commit()
-        db.refresh(stats)
-    return stats
+    """
+    Cached snapshot of the stats counters (rows are upserted on first report).
+    """
+    return stats_cache.get(db)
 
 @app.get("/api/stats")
 @limiter.limit("30/minute")
 def get_stats(request: Request, db: Session = Depends(get_db)):
-    # Calculate time-based stats dynamically from Cases
-    now = datetime.now(timezone.utc)
-    day_ago = now - timedelta(days=1)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    # helper to filter and count + breakdown + unique scammers
-    def get_stats_for_range(time_threshold):
-        cases = db.query(Case).all()
-        count = 0
-        breakdown = {t: 0 for t in ["ROMANCE", "CRYPTO", "JOB", "IMPERSONATION", "LOTTERY", "TECHNICAL_SUPPORT", "AUTHORITY", "OTHER"]}
-        scammers = set()
-        
-        for c in cases:
-            try:
-                # Handle ISO format Z (trailing Z)
-                ts_str = c.timestamp.replace('Z', '+00:00')
-                c_time = datetime.fromisoformat(ts_str)
-                
-                # Ensure c_time is aware if it's not
-                if c_time.tzinfo is None:
-                    c_time = c_time.replace(tzinfo=timezone.utc)
-                
-                if c_time > time_threshold:
-                    count += 1
-                    ctype = c.threat_level.upper() if c.threat_level else "OTHER"
-                    if ctype in breakdown:
-                        breakdown[ctype] += 1
-                    else:
-                        breakdown["OTHER"] += 1
-                    
-                    if c.scammer_name:
-                        scammers.add(c.scammer_name)
-            except Exception as e:
-                logging.error(f"Error parsing timestamp {c.timestamp}: {e}")
-                pass 
-        return count, breakdown, len(scammers)
-
-    t_count, t_types, t_scammers = get_stats_for_range(day_ago)
-    w_count, w_types, w_scammers = get_stats_for_range(week_ago)
-    m_count, m_types, m_scammers = get_stats_for_range(month_ago)
+    # Time-window stats come from the hourly rollups (at most 720 rows for the month)
+    windows = summarize_rollups(db)
     
     stats = get_or_create_stats(db)
     
     return {
-        "reports_filed": stats.reports_filed,
-        "scams_detected": stats.scams_detected,
-        "types": stats.types_json,
-        "today": t_count,
-        "week": w_count,
-        "month": m_count,
-        "today_types": t_types,
-        "week_types": w_types,
-        "month_types": m_types,
-        "today_scammers": t_scammers,
-        "week_scammers": w_scammers,
-        "month_scammers": m_scammers
+        "reports_filed": stats["reports_filed"],
+        "scams_detected": stats["scams_detected"],
+        "types": stats["types"],
+        "today": windows["today"]["count"],
+        "week": windows["week"]["count"],
+        "month": windows["month"]["count"],
+        "today_types": windows["today"]["types"],
+        "week_types": windows["week"]["types"],
+        "month_types": windows["month"]["types"],
+        "today_platforms": windows["today"]["platforms"],
+        "week_platforms": windows["week"]["platforms"],
+        "month_platforms": windows["month"]["platforms"],
+        "today_scammers": windows["today"]["scammers"],
+        "week_scammers": windows["week"]["scammers"],
+        "month_scammers": windows["month"]["scammers"]
     }
 
 # --- Cases Management ---
 
+# API field name -> Case column, in response order
+CASE_FIELDS = {
+    "id": Case.id,
+    "scammerName": Case.scammer_name,
+    "platform": Case.platform,
+    "status": Case.status,
+    "threatLevel": Case.threat_level,
+    "iocs": Case.iocs,
+    "transcript": Case.transcript,
+    "timestamp": Case.timestamp,
+    "autoReported": Case.auto_reported,
+}
+MAX_CASES_PAGE = 500
+NDJSON_FETCH_SIZE = 500
+
+def parse_case_fields(fields: Optional[str]) -> List[str]:
+    """
+    Resolves the ?fields= projection. Defaults to every field.
+    """
+    if not fields:
+        return list(CASE_FIELDS)
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in CASE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown case fields: {', '.join(unknown)}")
+    return [f for f in CASE_FIELDS if f in selected]
+
+def encode_case_cursor(created_at: Optional[datetime], case_id: str) -> str:
+    payload = json.dumps([created_at.isoformat() if created_at else None, case_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_case_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, case_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at else None), str(case_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def case_listing_query(db: Session, selected: List[str], cursor: Optional[str] = None):
+    """
+    Newest-first listing keyed on (created_at, id). Only the projected
+    columns are selected, so skipping transcript never loads it. Rows
+    without a parseable timestamp sort last.
+    """
+    columns = [CASE_FIELDS[f].label(f) for f in selected]
+    query = db.query(*columns, Case.created_at.label("_created_at"), Case.id.label("_id"))
+    if cursor:
+        created_at, case_id = decode_case_cursor(cursor)
+        if created_at is not None:
+            query = query.filter(or_(
+                Case.created_at < created_at,
+                and_(Case.created_at == created_at, Case.id < case_id),
+                Case.created_at.is_(None),
+            ))
+        else:
+            query = query.filter(Case.created_at.is_(None), Case.id < case_id)
+    return query.order_by(Case.created_at.desc().nullslast(), Case.id.desc())
+
+def case_row_to_dict(row, selected: List[str]) -> Dict[str, Any]:
+    return {f: getattr(row, f) for f in selected}
+
+def stream_cases_ndjson(db: Session, query, selected: List[str], limit: Optional[int]):
+    """
+    Streams cases one JSON object per line from a server-side cursor.
+    Owns its session because the generator outlives the request dependency;
+    the query (and its cursor) is built before the response starts.
+    """
+    try:
+        if limit is not None:
+            query = query.limit(limit)
+        query = query.execution_options(stream_results=True).yield_per(NDJSON_FETCH_SIZE)
+        for row in query:
+            yield json.dumps(case_row_to_dict(row, selected)) + "\n"
+    finally:
+        db.close()
+
 @app.get("/api/cases")
 @limiter.limit("20/minute")
-def get_cases(request: Request, db: Session = Depends(get_db)):
-    cases = db.query(Case).all()
-    # Convert to list of dicts for JSON response
-    return [{
-        "id": c.id,
-        "scammerName": c.scammer_name,
-        "platform": c.platform,
-        "status": c.status,
-        "threatLevel": c.threat_level,
-        "iocs": c.iocs,
-        "transcript": c.transcript,
-        "timestamp": c.timestamp,
-        "autoReported": c.auto_reported
-    } for c in cases]
+def get_cases(request: Request, response: Response, limit: Optional[int] = None, cursor: Optional[str] = None,
+              fields: Optional[str] = None, output: str = Query("json", alias="format"),
+              db: Session = Depends(get_db)):
+    """
+    Lists cases newest first. Without limit/cursor the full list is returned
+    (legacy behaviour). With ?limit= a single page is returned and the cursor
+    for the next one is sent in the X-Next-Cursor header. ?format=ndjson
+    streams rows instead of building the whole response in memory.
+    """
+    selected = parse_case_fields(fields)
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+
+    if output == "ndjson":
+        # A bad cursor must fail with 400 here, not after the 200 headers are sent
+        stream_db = SessionLocal()
+        try:
+            query = case_listing_query(stream_db, selected, cursor)
+        except Exception:
+            stream_db.close()
+            raise
+        return StreamingResponse(stream_cases_ndjson(stream_db, query, selected, limit), media_type="application/x-ndjson")
+    if output != "json":
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+
+    query = case_listing_query(db, selected, cursor)
+    if limit is None and cursor is None:
+        return [case_row_to_dict(row, selected) for row in query]
+
+    page_size = min(limit or MAX_CASES_PAGE, MAX_CASES_PAGE)
+    rows = query.limit(page_size + 1).all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        response.headers["X-Next-Cursor"] = encode_case_cursor(rows[-1]._created_at, rows[-1]._id)
+    return [case_row_to_dict(row, selected) for row in rows]
 
 @app.post("/api/report")
 @limiter.limit("10/minute")
@@ -296,109 +440,129 @@ def submit_report(report: ReportRequest, request: Request, db: Session = Depends
     """
     logging.info(f"🚨 [REPORT RECEIVED] ID: {report.conversationId} | Type: {report.classification}")
     
-    # Update Stats
-    stats = get_or_create_stats(db)
-    stats.reports_filed += 1
-    stats.scams_detected += 1 # Increment detected counter
-    
-    scam_type = report.classification.upper()
-    current_types = dict(stats.types_json) # Copy to modify
-    current_types[scam_type] = current_types.get(scam_type, 0) + 1
-    stats.types_json = current_types # Reassign to trigger update
-    
-    # Save Case
-    existing_case = db.query(Case).filter(Case.id == report.conversationId).first()
-    if not existing_case:
-        new_case = Case(
-            id=report.conversationId,
-            scammer_name=report.scammerName,
-            platform=report.platform,
-            status="closed",
-            threat_level=report.classification,
-            iocs=report.iocs,
-            transcript=report.transcript,
-            timestamp=report.timestamp,
-            auto_reported=True
-        )
-        db.add(new_case)
-    
-    db.commit()
+    if report_queue is not None:
+        # Write-behind: durable in the journal now, in the DB after the next flush
+        report_queue.submit([report.model_dump()])
+    else:
+        file_reports(db, [report.model_dump()])
+        db.commit()
+        stats_cache.invalidate()
     
     return {"status": "received", "case_id": f"CASE-{int(time.time())}"}
 
+@app.post("/api/report/batch")
+@limiter.limit("10/minute")
+def submit_report_batch(batch: ReportBatchRequest, request: Request, db: Session = Depends(get_db)):
+    """
+    Files up to MAX_REPORT_BATCH reports in one transaction. Each item counts
+    exactly as if it had been posted to /api/report on its own; cases whose ID
+    already exists (in the DB or earlier in the batch) are not inserted again.
+    """
+    if len(batch.reports) > MAX_REPORT_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_REPORT_BATCH} reports)")
+
+    results = []
+    valid = []
+    for index, item in enumerate(batch.reports):
+        try:
+            report = ReportRequest(**item)
+        except ValidationError as e:
+            results.append({"index": index, "conversationId": item.get("conversationId"), "status": "invalid",
+                            "errors": [err["msg"] for err in e.errors()]})
+            continue
+        results.append({"index": index, "conversationId": report.conversationId, "status": None})
+        valid.append((index, report.model_dump()))
+
+    if report_queue is not None:
+        report_queue.submit([r for _, r in valid])
+        statuses = ["queued"] * len(valid)
+    else:
+        statuses = file_reports(db, [r for _, r in valid])
+        db.commit()
+        stats_cache.invalidate()
+
+    for (index, _), status in zip(valid, statuses):
+        results[index]["status"] = status
+    created = statuses.count("created")
+
+    logging.info(f"🚨 [REPORT BATCH] {len(valid)}/{len(batch.reports)} valid | {created} new cases")
+    return {
+        "status": "received",
+        "received": len(batch.reports),
+        "created": created,
+        "results": results
+    }
+
 # --- Authentication ---
 
+bootstrap_users = security.BootstrapUsers(os.path.join(os.path.dirname(os.path.abspath(__file__)), "users.json"))
+
+def find_user(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def add_user(db: Session, username: str, hashed_pw: str, role: str):
+    user = User(username=username, hashed_password=hashed_pw, role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)  # load attributes here rather than lazily on the event loop
+    return user
+
+def auth_busy():
+    # Every auth step, including the user lookup, shares the bounded auth pool
+    return HTTPException(status_code=503, detail="Authentication service busy, retry shortly",
+                         headers={"Retry-After": str(security.AUTH_RETRY_AFTER)})
+
+# Login/register are async and do their DB lookups and hashing on the
+# dedicated auth pool, never on the shared request threadpool.
 @app.post("/api/login")
 @limiter.limit("5/minute")
-def login(creds: LoginRequest, request: Request, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == creds.username).first()
-    
-    # If user doesn't exist in DB, look them up in users.json to auto-create
-    if not user:
-        try:
-            users_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "users.json")
-            with open(users_path, "r") as f:
-                valid_users = json.load(f)
-        except Exception as e:
-            logging.error(f"Could not load users.json: {e}")
-            valid_users = {"admin": "password123"}
-            
-        if creds.username in valid_users and creds.password == valid_users[creds.username]:
-            hashed_pw = security.get_password_hash(creds.password)
-            role = "admin" if creds.username == "admin" else "operator"
-            new_user = User(username=creds.username, hashed_password=hashed_pw, role=role)
-            db.add(new_user)
-            db.commit()
-            user = new_user
-        else:
+async def login(creds: LoginRequest, request: Request, db: Session = Depends(get_db)):
+    try:
+        user = await security.run_auth_task(find_user, db, creds.username)
+
+        # If user doesn't exist in DB, look them up in users.json to auto-create
+        if not user:
+            valid_users = bootstrap_users.get()
+            if creds.username in valid_users and creds.password == valid_users[creds.username]:
+                hashed_pw = await security.get_password_hash_async(creds.password)
+                role = "admin" if creds.username == "admin" else "operator"
+                user = await security.run_auth_task(add_user, db, creds.username, hashed_pw, role)
+            else:
+                raise HTTPException(status_code=401, detail="Invalid credentials")
+        elif not await security.verify_password_async(creds.password, user.hashed_password):
             raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    if not security.verify_password(creds.password, user.hashed_password):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    except security.AuthPoolBusy:
+        raise auth_busy()
     
     access_token = security.create_access_token(data={"sub": user.username, "role": user.role})
     return {"status": "success", "token": access_token}
 
 @app.post("/api/register")
 @limiter.limit("5/minute")
-def register(creds: LoginRequest, request: Request, db: Session = Depends(get_db)):
+async def register(creds: LoginRequest, request: Request, db: Session = Depends(get_db)):
     logging.info(f"--- REGISTRATION ATTEMPT: {creds.username} ---")
-    user = db.query(User).filter(User.username == creds.username).first()
-    if user:
-        logging.warning(f"Registration Blocked: {creds.username} already exists in DB.")
-        raise HTTPException(status_code=400, detail="Operator ID already exists")
-    
     try:
-        hashed_pw = security.get_password_hash(creds.password)
-        new_user = User(username=creds.username, hashed_password=hashed_pw, role="operator")
-        db.add(new_user)
-        db.commit()
+        user = await security.run_auth_task(find_user, db, creds.username)
+        if user:
+            logging.warning(f"Registration Blocked: {creds.username} already exists in DB.")
+            raise HTTPException(status_code=400, detail="Operator ID already exists")
+
+        hashed_pw = await security.get_password_hash_async(creds.password)
+        new_user = await security.run_auth_task(add_user, db, creds.username, hashed_pw, "operator")
         
         access_token = security.create_access_token(data={"sub": new_user.username, "role": new_user.role})
         return {"status": "created", "token": access_token}
+    except security.AuthPoolBusy:
+        raise auth_busy()
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Registration Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- Biometric Auth (WebAuthn) ---
-from webauthn import (
-    generate_registration_options,
-    verify_registration_response,
-    generate_authentication_options,
-    verify_authentication_response,
-)
-from webauthn.helpers import bytes_to_base64url, base64url_to_bytes, options_to_json
-from webauthn.helpers.structs import (
-    AttestationConveyancePreference,
-    AuthenticatorSelectionCriteria,
-    AuthenticatorAttachment,
-    UserVerificationRequirement,
-    ResidentKeyRequirement,
-    RegistrationCredential,
-    AuthenticationCredential,
-    AuthenticatorAttestationResponse,
-    AuthenticatorAssertionResponse,
-)
+# The webauthn package (and its crypto stack) is imported inside each endpoint,
+# so workers that never see a biometric request don't pay for loading it
 
 # Helper to get the current RP ID and Origin from the request
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "https://rakshak-ai-drab.vercel.app")
@@ -421,30 +585,46 @@ def get_webauthn_config(request: Request):
 
 RP_NAME = "Rakshak AI"
 
-# Database-backed challenge store (survives server restarts)
-def store_challenge(db: Session, key: str, challenge_bytes: bytes):
-    """Store a WebAuthn challenge in the database."""
-    existing = db.query(WebAuthnChallenge).filter(WebAuthnChallenge.key == key).first()
-    challenge_b64 = bytes_to_base64url(challenge_bytes)
-    if existing:
-        existing.challenge = challenge_b64
-    else:
-        db.add(WebAuthnChallenge(key=key, challenge=challenge_b64))
-    db.commit()
+# Challenges live in memory by default; WEBAUTHN_CHALLENGE_STORE=db shares them across workers
+challenge_store = make_challenge_store(
+    WEBAUTHN_CHALLENGES["store"], SessionLocal,
+    ttl=WEBAUTHN_CHALLENGES["ttl"], sweep_interval=WEBAUTHN_CHALLENGES["sweep_interval"],
+    max_entries=WEBAUTHN_CHALLENGES["max_entries"]
+)
 
-def get_challenge(db: Session, key: str) -> bytes:
-    """Retrieve and delete a WebAuthn challenge from the database."""
-    record = db.query(WebAuthnChallenge).filter(WebAuthnChallenge.key == key).first()
-    if not record:
+def store_challenge(key: str, challenge_bytes: bytes):
+    """Store a WebAuthn challenge until its finish call (or expiry)."""
+    challenge_store.put(key, challenge_bytes)
+
+def get_challenge(key: str) -> bytes:
+    """Retrieve and delete a WebAuthn challenge; None if missing or expired."""
+    return challenge_store.pop(key)
+
+def find_credential(db: Session, user_id: int, credential_id: Optional[str]):
+    """Indexed lookup of one of the user's registered credentials."""
+    if not credential_id:
         return None
-    challenge = base64url_to_bytes(record.challenge)
-    db.delete(record)
+    return db.query(WebAuthnCredential).filter(
+        WebAuthnCredential.credential_id == credential_id, WebAuthnCredential.user_id == user_id).first()
+
+def update_sign_count(db: Session, cred: WebAuthnCredential, sign_count: int):
+    """Single-row UPDATE of the authenticator's signature counter."""
+    db.query(WebAuthnCredential).filter(WebAuthnCredential.id == cred.id) \
+        .update({"sign_count": sign_count}, synchronize_session=False)
     db.commit()
-    return challenge
 
 @app.post("/api/auth/biometric/register/start")
 @limiter.limit("30/minute")
 def register_bio_start(username: str, request: Request, db: Session = Depends(get_db)):
+    from webauthn import generate_registration_options, options_to_json
+    from webauthn.helpers.structs import (
+        AttestationConveyancePreference,
+        AuthenticatorSelectionCriteria,
+        AuthenticatorAttachment,
+        UserVerificationRequirement,
+        ResidentKeyRequirement,
+    )
+
     user = db.query(User).filter(User.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -464,17 +644,21 @@ def register_bio_start(username: str, request: Request, db: Session = Depends(ge
         attestation=AttestationConveyancePreference.NONE,
     )
 
-    store_challenge(db, user.username, options.challenge)
+    store_challenge(user.username, options.challenge)
     return json.loads(options_to_json(options))
 
 @app.post("/api/auth/biometric/register/finish")
 @limiter.limit("30/minute")
 def register_bio_finish(response: Dict[str, Any], username: str, request: Request, db: Session = Depends(get_db)):
+    from webauthn import verify_registration_response
+    from webauthn.helpers import bytes_to_base64url, base64url_to_bytes
+    from webauthn.helpers.structs import RegistrationCredential, AuthenticatorAttestationResponse
+
     user = db.query(User).filter(User.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    challenge = get_challenge(db, user.username)
+    challenge = get_challenge(user.username)
     if not challenge:
         raise HTTPException(status_code=400, detail="No active registration challenge found")
 
@@ -499,15 +683,12 @@ def register_bio_finish(response: Dict[str, Any], username: str, request: Reques
             require_user_verification=False,
         )
 
-        new_cred = {
-            "credential_id": bytes_to_base64url(verification.credential_id),
-            "credential_public_key": bytes_to_base64url(verification.credential_public_key),
-            "sign_count": verification.sign_count,
-        }
-
-        creds = list(user.webauthn_credentials) if user.webauthn_credentials else []
-        creds.append(new_cred)
-        user.webauthn_credentials = creds
+        db.add(WebAuthnCredential(
+            user_id=user.id,
+            credential_id=bytes_to_base64url(verification.credential_id),
+            credential_public_key=bytes_to_base64url(verification.credential_public_key),
+            sign_count=verification.sign_count,
+        ))
         db.commit()
         return {"status": "registered"}
 
@@ -518,20 +699,23 @@ def register_bio_finish(response: Dict[str, Any], username: str, request: Reques
 @app.post("/api/auth/biometric/login/start")
 @limiter.limit("30/minute")
 def login_bio_start(username: str, request: Request, db: Session = Depends(get_db)):
+    from webauthn import generate_authentication_options, options_to_json
+    from webauthn.helpers import base64url_to_bytes
+    from webauthn.helpers.structs import PublicKeyCredentialDescriptor, UserVerificationRequirement
+
     user = db.query(User).filter(User.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not user.webauthn_credentials:
+    credential_ids = [cid for (cid,) in db.query(WebAuthnCredential.credential_id)
+                      .filter(WebAuthnCredential.user_id == user.id)]
+    if not credential_ids:
         raise HTTPException(status_code=400, detail="No biometric registered for this account")
 
-    from webauthn.helpers.structs import PublicKeyCredentialDescriptor
     allow_credentials = []
-    for cred in (user.webauthn_credentials or []):
+    for cid in credential_ids:
         try:
-            allow_credentials.append(
-                PublicKeyCredentialDescriptor(id=base64url_to_bytes(cred["credential_id"]))
-            )
+            allow_credentials.append(PublicKeyCredentialDescriptor(id=base64url_to_bytes(cid)))
         except Exception:
             pass
 
@@ -542,26 +726,25 @@ def login_bio_start(username: str, request: Request, db: Session = Depends(get_d
         user_verification=UserVerificationRequirement.PREFERRED,
     )
 
-    store_challenge(db, "LOGIN_" + username, options.challenge)
+    store_challenge("LOGIN_" + username, options.challenge)
     return json.loads(options_to_json(options))
 
 @app.post("/api/auth/biometric/login/finish")
 @limiter.limit("30/minute")
 def login_bio_finish(response: Dict[str, Any], username: str, request: Request, db: Session = Depends(get_db)):
+    from webauthn import verify_authentication_response
+    from webauthn.helpers import base64url_to_bytes
+    from webauthn.helpers.structs import AuthenticationCredential, AuthenticatorAssertionResponse
+
     user = db.query(User).filter(User.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    challenge = get_challenge(db, "LOGIN_" + username)
+    challenge = get_challenge("LOGIN_" + username)
     if not challenge:
         raise HTTPException(status_code=400, detail="No active login challenge found")
 
-    cred_id = response.get("id")
-    matched_cred = None
-    for c in (user.webauthn_credentials or []):
-        if c.get("credential_id") == cred_id:
-            matched_cred = c
-            break
+    matched_cred = find_credential(db, user.id, response.get("id"))
 
     if not matched_cred:
         raise HTTPException(status_code=400, detail="Credential not registered on this account")
@@ -587,14 +770,12 @@ def login_bio_finish(response: Dict[str, Any], username: str, request: Request,
             expected_challenge=challenge,
             expected_origin=origin,
             expected_rp_id=rp_id,
-            credential_public_key=base64url_to_bytes(matched_cred["credential_public_key"]),
-            credential_current_sign_count=matched_cred["sign_count"],
+            credential_public_key=base64url_to_bytes(matched_cred.credential_public_key),
+            credential_current_sign_count=matched_cred.sign_count,
             require_user_verification=False,
         )
 
-        matched_cred["sign_count"] = verification.new_sign_count
-        user.webauthn_credentials = list(user.webauthn_credentials)
-        db.commit()
+        update_sign_count(db, matched_cred, verification.new_sign_count)
 
         access_token = security.create_access_token(data={"sub": user.username, "role": user.role})
         return {"status": "success", "token": access_token}
@@ -604,24 +785,43 @@ def login_bio_finish(response: Dict[str, Any], username: str, request: Request,
         raise HTTPException(status_code=400, detail=f"Biometric auth failed: {str(e)}")
 
 # --- Discoverable / Username-less Biometric Login (auto-prompt on page load) ---
-DISCOVER_CHALLENGE_KEY = "__DISCOVER__"
+DISCOVER_CHALLENGE_PREFIX = "__DISCOVER__"
+
+def discover_challenge_key(challenge_b64: str) -> str:
+    return f"{DISCOVER_CHALLENGE_PREFIX}{challenge_b64}"
 
 @app.post("/api/auth/biometric/discover/start")
+@limiter.limit("30/minute")
 def discover_bio_start(request: Request, db: Session = Depends(get_db)):
     """Generate a challenge with no allow_credentials — browser will offer all saved passkeys."""
+    from webauthn import generate_authentication_options, options_to_json
+    from webauthn.helpers import bytes_to_base64url
+    from webauthn.helpers.structs import UserVerificationRequirement
+
     rp_id, origin = get_webauthn_config(request)
     options = generate_authentication_options(
         rp_id=rp_id,
         allow_credentials=[],   # empty = discoverable / resident key
         user_verification=UserVerificationRequirement.PREFERRED,
     )
-    store_challenge(db, DISCOVER_CHALLENGE_KEY, options.challenge)
+    # One entry per request, keyed by the challenge itself, so concurrent
+    # discoverable logins never overwrite each other's challenge
+    store_challenge(discover_challenge_key(bytes_to_base64url(options.challenge)), options.challenge)
     return json.loads(options_to_json(options))
 
 @app.post("/api/auth/biometric/discover/finish")
+@limiter.limit("30/minute")
 def discover_bio_finish(response: Dict[str, Any], request: Request, db: Session = Depends(get_db)):
     """Verify the assertion and identify the user via userHandle."""
-    challenge = get_challenge(db, DISCOVER_CHALLENGE_KEY)
+    from webauthn import verify_authentication_response
+    from webauthn.helpers import base64url_to_bytes
+    from webauthn.helpers.structs import AuthenticationCredential, AuthenticatorAssertionResponse
+
+    try:
+        client_data = json.loads(base64url_to_bytes(response["response"]["clientDataJSON"]))
+        challenge = get_challenge(discover_challenge_key(client_data["challenge"]))
+    except Exception:
+        challenge = None
     if not challenge:
         raise HTTPException(status_code=400, detail="No active discovery challenge")
 
@@ -640,12 +840,7 @@ def discover_bio_finish(response: Dict[str, Any], request: Request, db: Session
     if not user:
         raise HTTPException(status_code=404, detail="User not found from userHandle")
 
-    cred_id = response.get("id")
-    matched_cred = None
-    for c in (user.webauthn_credentials or []):
-        if c.get("credential_id") == cred_id:
-            matched_cred = c
-            break
+    matched_cred = find_credential(db, user.id, response.get("id"))
 
     if not matched_cred:
         raise HTTPException(status_code=400, detail="Credential not registered on this account")
@@ -671,14 +866,12 @@ def discover_bio_finish(response: Dict[str, Any], request: Request, db: Session
             expected_challenge=challenge,
             expected_origin=origin,
             expected_rp_id=rp_id,
-            credential_public_key=base64url_to_bytes(matched_cred["credential_public_key"]),
-            credential_current_sign_count=matched_cred["sign_count"],
+            credential_public_key=base64url_to_bytes(matched_cred.credential_public_key),
+            credential_current_sign_count=matched_cred.sign_count,
             require_user_verification=False,
         )
 
-        matched_cred["sign_count"] = verification.new_sign_count
-        user.webauthn_credentials = list(user.webauthn_credentials)
-        db.commit()
+        update_sign_count(db, matched_cred, verification.new_sign_count)
 
         access_token = security.create_access_token(data={"sub": user.username, "role": user.role})
         return {"status": "success", "token": access_token, "username": user.username}
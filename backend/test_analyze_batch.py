@@ -0,0 +1,40 @@
+"""
+/api/analyze/batch input validation: malformed messages are a 422, not a 500.
+"""
+import logging
+
+from fastapi.testclient import TestClient
+
+import server
+
+HEADERS = {"X-Rakshak-Token": "rakshak-core-v1"}
+BAD_HISTORIES = [
+    [[{"role": "scammer"}]],                              # missing content
+    [[{"content": "send the otp"}]],                      # missing role
+    [[{"role": "scammer", "content": None}]],             # content not a string
+    [[{"role": "scammer", "content": {"text": "otp"}}]],
+    [["send the otp"]],                                   # message not an object
+    [{"role": "scammer", "content": "send the otp"}],     # history not a list
+]
+
+def test_malformed_messages_rejected():
+    logging.disable(logging.INFO)
+    server.limiter.enabled = False
+    try:
+        client = TestClient(server.app)
+        for histories in BAD_HISTORIES:
+            r = client.post("/api/analyze/batch", headers=HEADERS, json={"histories": histories})
+            assert r.status_code == 422, (histories, r.status_code)
+
+        histories = [[{"role": "scammer", "content": "Send the OTP now", "ts": 1}], []]
+        r = client.post("/api/analyze/batch", headers=HEADERS, json={"histories": histories})
+        assert r.status_code == 200
+        results = r.json()["results"]
+        assert results[0]["score"] == server.analyzer.analyze(histories[0]).score
+        assert results[1]["classification"] == "unknown"
+    finally:
+        server.limiter.enabled = True
+
+if __name__ == "__main__":
+    test_malformed_messages_rejected()
+    print("[PASS] batch analysis validation")
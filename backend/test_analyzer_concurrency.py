@@ -0,0 +1,152 @@
+"""
+Stress test: one shared ScamAnalyzer (as in the server) serving thousands of
+concurrent mixed-intent requests. Every result must match a serial run of the
+same history, so no request can observe another request's score or intent.
+"""
+import logging
+import random
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+
+logging.disable(logging.INFO)
+
+from agent import HoneypotAgent
+from analysis_pool import AnalysisExecutor
+from analyzer import AnalysisResult, ScamAnalyzer
+from dispatcher import ReportDispatcher
+
+REQUESTS = 3000
+CLIENTS = 32
+
+SCRIPTS = {
+    "financial": ["Send the processing fee to my bank account today", "Transfer the money and pay the tax on your prize"],
+    "coercion": ["The police will arrest you, this is the final warning", "Legal action and jail unless you comply now"],
+    "link": ["Click the link to verify your account", "Download the attachment and install the app"],
+    "urgent": ["URGENT!!! act immediately, your account is suspended", "Hurry, only one hour left to respond"],
+    "benign": ["Hello, are we still meeting for lunch tomorrow?", "Thanks for the photos from the trip"],
+}
+
+def make_histories(n, seed=23):
+    rng = random.Random(seed)
+    kinds = list(SCRIPTS)
+    histories = []
+    for _ in range(n):
+        history = []
+        for _ in range(rng.randint(1, 4)):
+            history.append({"role": "scammer", "content": rng.choice(SCRIPTS[rng.choice(kinds)])})
+            if rng.random() < 0.5:
+                history.append({"role": "user", "content": "Who is this?"})
+        histories.append(history)
+    return histories
+
+def expected_results(histories):
+    # Fresh analyzer, one request at a time
+    serial = ScamAnalyzer()
+    return [serial.analyze(h) for h in histories]
+
+def test_shared_analyzer_under_concurrency():
+    histories = make_histories(REQUESTS)
+    expected = expected_results(histories)
+    assert len({r.intent for r in expected}) >= 3, "workload should mix intents"
+
+    shared = ScamAnalyzer()
+    with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+        results = list(clients.map(shared.analyze, histories))
+
+    assert all(isinstance(r, AnalysisResult) for r in results)
+    mismatches = [i for i, (got, want) in enumerate(zip(results, expected)) if got != want]
+    assert not mismatches, f"{len(mismatches)} results differ from serial, first at {mismatches[0]}"
+    assert not hasattr(shared, "intent") and not hasattr(shared, "sophistication_score")
+
+def test_batched_executor_matches_serial():
+    histories = make_histories(REQUESTS, seed=29)
+    expected = expected_results(histories)
+
+    executor = AnalysisExecutor(mode="thread", workers=4, analyzer=ScamAnalyzer())
+    executor.start()
+    try:
+        with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+            results = list(clients.map(executor.analyze, histories))
+    finally:
+        executor.stop()
+    assert results == expected
+
+def _failing_initializer():
+    raise RuntimeError("worker died")
+
+def broken_pool():
+    pool = ThreadPoolExecutor(max_workers=1, initializer=_failing_initializer)
+    try:
+        pool.submit(int).result()
+    except BrokenExecutor:
+        pass
+    return pool
+
+def test_executor_replaces_broken_pool():
+    histories = make_histories(200, seed=37)
+    expected = expected_results(histories)
+
+    executor = AnalysisExecutor(mode="thread", workers=2, analyzer=ScamAnalyzer(), result_timeout=30.0)
+    executor.start()
+    try:
+        executor.pool.shutdown()
+        executor.pool = broken_pool()
+        with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+            results = list(clients.map(executor.analyze, histories))
+        assert results == expected
+        assert executor.analyze_many(histories) == expected
+        assert executor.metrics()["pool_restarts"] == 1
+    finally:
+        executor.stop()
+
+def test_failed_submit_fails_batch_not_batcher():
+    history = make_histories(1, seed=43)[0]
+    executor = AnalysisExecutor(mode="thread", workers=2, analyzer=ScamAnalyzer(), result_timeout=30.0)
+    executor.start()
+    submit = executor._submit
+
+    def failing_submit(pool, histories):
+        raise RuntimeError("cannot schedule new futures")
+
+    try:
+        executor._submit = failing_submit
+        try:
+            executor.analyze(history)
+            assert False, "analyze should raise the submit error"
+        except RuntimeError:
+            pass
+        executor._submit = submit
+        assert executor.analyze(history) == expected_results([history])[0]
+        assert executor.metrics()["failed_batches"] == 1
+    finally:
+        executor.stop()
+
+def test_agent_conversations_are_isolated():
+    histories = make_histories(500, seed=31)
+    expected = expected_results(histories)
+
+    dispatcher = ReportDispatcher(coalesce_window=60.0)
+    agent = HoneypotAgent(dispatcher=dispatcher)
+
+    def run_conversation(index):
+        for m in histories[index]:
+            if m["role"] == "scammer":
+                agent.ingest({"conversation_id": f"conv-{index}", "text": m["content"]})
+        return agent.sophistication_cache.get(f"conv-{index}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+            sophistication = list(clients.map(run_conversation, range(len(histories))))
+    finally:
+        dispatcher.stop(flush=False)
+
+    for got, want in zip(sophistication, expected):
+        assert (got["score"], got["category"], got["intent"], got["matrix"]) == \
+            (want.score, want.classification, want.intent, want.neuro_matrix)
+
+if __name__ == "__main__":
+    test_shared_analyzer_under_concurrency()
+    test_batched_executor_matches_serial()
+    test_executor_replaces_broken_pool()
+    test_failed_submit_fails_batch_not_batcher()
+    test_agent_conversations_are_isolated()
+    print("[PASS] analyzer concurrency")
@@ -0,0 +1,185 @@
+"""
+Equivalence test: the incremental ConversationState path (analyze, analyze_many,
+HoneypotAgent-style update_state + analyze_state) must score exactly like the
+original joined-text analyze_behavior, kept below as a reference copy.
+Message boundaries are the interesting part: "!!!", "very" or "not" at the
+start or end of a message change the sentiment of its neighbour.
+Past the per-conversation caps the state stays flat and both paths still agree.
+"""
+import re
+import logging
+import random
+from collections import Counter
+
+logging.disable(logging.INFO)
+
+from textblob import TextBlob
+
+from analyzer import MAX_UNIQUE_WORDS, URGENCY_WINDOW, ConversationState, ScamAnalyzer
+from config import LEXICONS
+
+HISTORIES = 3000
+
+MESSAGES = [
+    "Send the processing fee to my bank account today", "Transfer the money and pay the tax on your prize",
+    "The police will arrest you, this is the final warning", "Legal action and jail unless you comply now",
+    "Click the link to verify your account", "Download the attachment and install the app",
+    "URGENT!!! act immediately, your account is suspended", "Hurry, only one hour left to respond",
+    "Hello, are we still meeting for lunch tomorrow?", "Thanks for the photos from the trip",
+    # Boundary fragments: modifiers, negations, exclamations and emoticons at either end
+    "very bad", "very", "not", "really not", "!!! good news", "! terrible", "not a good deal",
+    "this is so", "great :)", ":( sad", "kindly send", "Mr. Smith won the lottery", "never", "extremely",
+]
+
+def legacy_analyze_behavior(history, lexicons=LEXICONS):
+    """
+    The pre-ConversationState analyze_behavior, verbatim apart from returning the
+    intent instead of storing it: (score, classification, intent, neuro_matrix).
+    """
+    if not history:
+        return 0.0, "unknown", "unknown", {}
+
+    scammer_msgs = [m["content"] for m in history if m["role"] == "scammer"]
+    if not scammer_msgs:
+        return 0.0, "unknown", "unknown", {}
+
+    urgency_graph = []
+    for msg in scammer_msgs:
+        blob = TextBlob(msg.lower())
+        urgency_tokens = sum(1 for word in blob.words if word in lexicons["time_compression"] or word in lexicons["coercion_vectors"])
+        density = (urgency_tokens / max(len(blob.words), 1)) + (blob.sentiment.subjectivity * 0.2)
+        urgency_graph.append(density)
+
+    escalation_multiplier = 1.0
+    if len(urgency_graph) >= 3:
+        early_avg = sum(urgency_graph[:len(urgency_graph)//2]) / max(len(urgency_graph[:len(urgency_graph)//2]), 1)
+        late_avg = sum(urgency_graph[len(urgency_graph)//2:]) / max(len(urgency_graph[len(urgency_graph)//2:]), 1)
+        if late_avg > early_avg + 0.1:
+            escalation_multiplier = 1.4
+
+    full_text = " ".join(scammer_msgs).lower()
+    blob = TextBlob(full_text)
+    words = blob.words
+    word_freq = Counter(words)
+    total_words = max(len(words), 1)
+
+    tf_finance = sum(word_freq[w] for w in lexicons["financial_assets"] if w in word_freq) / total_words
+    tf_identity = sum(word_freq[w] for w in lexicons["identity_assets"] if w in word_freq) / total_words
+    tf_coercion = sum(word_freq[w] for w in lexicons["coercion_vectors"] if w in word_freq) / total_words
+    tf_action = sum(word_freq[w] for w in lexicons["action_verbs"] if w in word_freq) / total_words
+
+    vector_scores = {
+        "FINANCIAL_THEFT": (tf_finance * 1.5) + (tf_action * 1.0),
+        "GENERAL_PHISHING": (tf_identity * 1.8) + (tf_action * 1.0),
+        "AUTHORITY_IMPERSONATION": (tf_coercion * 2.0) + (tf_finance * 0.5),
+        "CRYPTO_SCAM": (tf_finance * 1.2) + (full_text.count("crypto") + full_text.count("btc") + full_text.count("wallet")) / total_words * 3.0,
+        "LOTTERY_SCAM": (tf_finance * 0.8) + (full_text.count("won") + full_text.count("prize") + full_text.count("lottery")) / total_words * 2.5
+    }
+    dominant_intent = max(vector_scores.items(), key=lambda x: x[1])
+
+    if dominant_intent[1] < 0.05:
+        link_pattern = r"(click|tap|visit|open|download|install).{0,30}(link|url|website|page|attachment|app|.apk|.exe)"
+        intent = "MALICIOUS_LINK" if re.search(link_pattern, full_text) else "GENERAL_INQUIRY"
+    else:
+        intent = dominant_intent[0]
+
+    risk_multiplier = 10.0
+    max_base_risk = 0.6
+    if total_words <= 8 and dominant_intent[1] > 0.4:
+        risk_multiplier = 15.0
+        max_base_risk = 0.85
+    base_risk = min(dominant_intent[1] * risk_multiplier, max_base_risk)
+    mathematical_risk = base_risk * escalation_multiplier
+    if blob.sentiment.polarity < -0.3:
+        mathematical_risk += 0.2
+
+    unique_words = len(set(words))
+    vocab_richness = unique_words / total_words
+    sophistication = 0.5
+    if vocab_richness > 0.6: sophistication += 0.2
+    if "kindly" in full_text: sophistication -= 0.3
+
+    score = max(0.0, min(1.0, mathematical_risk + (sophistication * 0.2)))
+
+    if mathematical_risk > 0.65 or intent in ["MALICIOUS_LINK"]:
+        threat_classification = "scam"
+        score = max(score, 0.90)
+    elif mathematical_risk > 0.35:
+        threat_classification = "likely_scam"
+        score = max(score, 0.70)
+    else:
+        threat_classification = "benign"
+        intent = "GENERAL_INQUIRY"
+
+    neuro_matrix = {
+        "financial_risk_node": min(1.0, tf_finance * 4.0),
+        "coercion_risk_node": min(1.0, tf_coercion * 5.0 * escalation_multiplier),
+        "urgency_spike_node": min(1.0, sum(urgency_graph) / max(len(urgency_graph), 1) * 3.0) if urgency_graph else 0.0,
+        "deception_complexity_node": score
+    }
+    return score, threat_classification, intent, neuro_matrix
+
+def make_histories(n, seed=41):
+    rng = random.Random(seed)
+    histories = []
+    for _ in range(n):
+        history = []
+        for _ in range(rng.randint(1, 5)):
+            history.append({"role": "scammer", "content": rng.choice(MESSAGES)})
+            if rng.random() < 0.3:
+                history.append({"role": "user", "content": "Who is this?"})
+        histories.append(history)
+    return histories
+
+def as_tuple(result):
+    return result.score, result.classification, result.intent, result.neuro_matrix
+
+def test_boundary_sentiment_matches_joined_text():
+    # "!!!" opening the last message boosts the assessment that closed the previous one
+    history = [{"role": "scammer", "content": c} for c in [
+        "very bad", "Thanks for the photos from the trip",
+        "Transfer the money and pay the tax on your prize",
+        "URGENT!!! act immediately, your account is suspended"
+    ]]
+    analyzer = ScamAnalyzer()
+    state = ConversationState()
+    for m in history:
+        analyzer.update_state(state, m["content"])
+    joined = TextBlob(" ".join(m["content"] for m in history).lower())
+
+    assert state.sentiment.polarity() == joined.sentiment.polarity
+    assert as_tuple(analyzer.analyze(history)) == legacy_analyze_behavior(history)
+
+def test_incremental_paths_match_legacy():
+    histories = make_histories(HISTORIES)
+    expected = [legacy_analyze_behavior(h) for h in histories]
+    analyzer = ScamAnalyzer()
+
+    mismatches = [i for i, h in enumerate(histories) if as_tuple(analyzer.analyze(h)) != expected[i]]
+    assert not mismatches, f"{len(mismatches)} analyze() results differ, first at {mismatches[0]}"
+
+    batched = [as_tuple(r) for r in analyzer.analyze_many(histories)]
+    mismatches = [i for i, (got, want) in enumerate(zip(batched, expected)) if got != want]
+    assert not mismatches, f"{len(mismatches)} analyze_many() results differ, first at {mismatches[0]}"
+
+def test_long_conversation_state_is_capped():
+    rng = random.Random(7)
+    history = []
+    for i in range(URGENCY_WINDOW + 200):
+        filler = " ".join(f"w{i}x{j}" for j in range(60))  # ~60 new words per message
+        history.append({"role": "scammer", "content": f"{rng.choice(MESSAGES)} {filler}"})
+    analyzer = ScamAnalyzer()
+    state = ConversationState()
+    for m in history:
+        analyzer.update_state(state, m["content"])
+
+    assert len(state.urgency_graph) == URGENCY_WINDOW
+    assert len(state.unique_words) == MAX_UNIQUE_WORDS
+    assert as_tuple(analyzer.analyze_state(state)) == as_tuple(analyzer.analyze(history))
+    assert as_tuple(analyzer.analyze_many([history])[0]) == as_tuple(analyzer.analyze(history))
+
+if __name__ == "__main__":
+    test_boundary_sentiment_matches_joined_text()
+    test_incremental_paths_match_legacy()
+    test_long_conversation_state_is_capped()
+    print("[PASS] analyzer equivalence")
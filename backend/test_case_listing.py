@@ -0,0 +1,30 @@
+"""
+/api/cases cursor validation: a bad cursor is a 400 in both output formats,
+and never a 200 stream that breaks after the headers are sent.
+"""
+import base64
+import logging
+
+from fastapi.testclient import TestClient
+
+import server
+
+HEADERS = {"X-Rakshak-Token": "rakshak-core-v1"}
+BAD_CURSORS = ["!!", "bm90IGpzb24", base64.urlsafe_b64encode(b'["not-a-date", "C-1"]').decode()]
+
+def test_bad_cursor_rejected_before_streaming():
+    logging.disable(logging.INFO)
+    server.limiter.enabled = False
+    try:
+        client = TestClient(server.app)
+        for cursor in BAD_CURSORS:
+            for output in ("json", "ndjson"):
+                r = client.get("/api/cases", headers=HEADERS, params={"cursor": cursor, "format": output})
+                assert r.status_code == 400, (cursor, output, r.status_code)
+                assert r.json() == {"detail": "Invalid cursor"}
+    finally:
+        server.limiter.enabled = True
+
+if __name__ == "__main__":
+    test_bad_cursor_rejected_before_streaming()
+    print("[PASS] case listing cursor validation")
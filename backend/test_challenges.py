@@ -0,0 +1,60 @@
+"""
+WebAuthn challenge stores stay bounded: past max_entries the oldest challenges
+are evicted, and the unauthenticated discoverable-login start is rate limited.
+Uses a throwaway SQLite file so the dev database is untouched.
+"""
+import logging
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import server
+from challenges import DBChallengeStore, MemoryChallengeStore
+from database import Base, WebAuthnChallenge
+
+HEADERS = {"X-Rakshak-Token": "rakshak-core-v1"}
+
+def test_memory_store_evicts_oldest():
+    store = MemoryChallengeStore(sweep_interval=0, max_entries=3)
+    for i in range(5):
+        store.put(f"k{i}", b"c%d" % i)
+    store.put("k2", b"again")  # re-issued: now the newest
+    store.put("k5", b"c5")
+    assert store.pop("k0") is None and store.pop("k1") is None and store.pop("k3") is None
+    assert store.pop("k2") == b"again"
+    assert store.metrics()["evicted"] == 3
+    assert store.metrics()["pending"] == 2
+
+def test_db_store_evicts_oldest():
+    tmp_dir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'challenges.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        store = DBChallengeStore(Session, sweep_interval=0, max_entries=3)
+        for i in range(5):
+            store.put(f"k{i}", b"c%d" % i)
+        db = Session()
+        assert sorted(k for (k,) in db.query(WebAuthnChallenge.key)) == ["k2", "k3", "k4"]
+        db.close()
+        assert store.pop("k0") is None
+        assert store.pop("k4") == b"c4"
+        assert store.metrics()["evicted"] == 2
+    finally:
+        engine.dispose()
+
+def test_discover_start_rate_limited():
+    logging.disable(logging.INFO)
+    client = TestClient(server.app)
+    codes = [client.post("/api/auth/biometric/discover/start", headers=HEADERS).status_code for _ in range(31)]
+    assert codes[:30] == [200] * 30
+    assert codes[30] == 429
+
+if __name__ == "__main__":
+    test_memory_store_evicts_oldest()
+    test_db_store_evicts_oldest()
+    test_discover_start_rate_limited()
+    print("[PASS] challenge store bounds")
@@ -0,0 +1,43 @@
+"""
+ConversationStore bounds: per-conversation indicators are capped (least recently
+seen dropped first) and every truncation shows up in metrics().
+"""
+from conversation_store import ConversationStore
+from iocs import IOC
+
+def phone(n):
+    return IOC("PHONE", f"+9198765{n:05d}")
+
+def test_iocs_capped_least_recently_seen_first():
+    store = ConversationStore(max_iocs=3)
+    conv = store.get_or_create("c1")
+
+    assert store.add_iocs(conv, [phone(1), phone(2), phone(3)]) == [phone(1), phone(2), phone(3)]
+    assert store.add_iocs(conv, [phone(1)]) == []  # seen again, now the most recent
+    assert store.add_iocs(conv, [phone(4), phone(5)]) == [phone(4), phone(5)]
+    assert list(conv.iocs) == [phone(1), phone(4), phone(5)]
+
+    metrics = store.metrics()
+    assert metrics["truncated_iocs"] == 2
+    assert metrics["iocs"] == 3
+
+def test_snapshot_survives_updates():
+    store = ConversationStore(max_iocs=2)
+    conv = store.get_or_create("c1")
+    store.add_iocs(conv, [phone(1), phone(2)])
+    snapshot = conv.iocs
+    store.add_iocs(conv, [phone(3)])
+    assert list(snapshot) == [phone(1), phone(2)]  # a report iterating the old set is unaffected
+    assert list(conv.iocs) == [phone(2), phone(3)]
+
+def test_evicted_conversation_releases_iocs():
+    store = ConversationStore(max_conversations=1, max_iocs=10)
+    store.add_iocs(store.get_or_create("c1"), [phone(1), phone(2)])
+    store.get_or_create("c2")
+    assert store.metrics()["iocs"] == 0
+
+if __name__ == "__main__":
+    test_iocs_capped_least_recently_seen_first()
+    test_snapshot_survives_updates()
+    test_evicted_conversation_releases_iocs()
+    print("[PASS] conversation store")
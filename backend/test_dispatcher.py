@@ -0,0 +1,72 @@
+"""
+ReportDispatcher: bounded delivery concurrency and path-safe report files.
+"""
+import os
+import logging
+import tempfile
+import threading
+import time
+
+logging.disable(logging.INFO)
+
+from dispatcher import LocalDirectorySink, ReportDispatcher, ReportSink
+
+TRANSCRIPT = [{"role": "scammer", "content": "Send the fee now"}]
+
+class BlockingSink(ReportSink):
+    """
+    Holds every delivery until released, recording the peak concurrency.
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.delivered = []
+
+    def deliver(self, report_id, artifacts):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait(10)
+        with self.lock:
+            self.active -= 1
+            self.delivered.append(report_id)
+
+def test_in_flight_reports_capped_at_workers():
+    sink = BlockingSink()
+    dispatcher = ReportDispatcher(sink=sink, coalesce_window=0.0, workers=2)
+    for i in range(50):
+        dispatcher.submit(f"conv-{i}", "HIGH", TRANSCRIPT)
+
+    deadline = time.monotonic() + 10
+    while sink.active < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    metrics = dispatcher.metrics()
+    assert metrics["in_flight"] == 2
+    assert metrics["pending"] == 48  # the rest wait in the bounded pending map
+
+    sink.release.set()
+    dispatcher.stop()
+    assert sink.peak == 2
+    assert len(sink.delivered) == 50
+    assert dispatcher.metrics()["delivered"] == 50
+
+def test_directory_sink_stays_inside_directory():
+    root = tempfile.mkdtemp()
+    reports = os.path.join(root, "reports")
+    dispatcher = ReportDispatcher(sink=LocalDirectorySink(reports), coalesce_window=0.0)
+    dispatcher.submit("../../escape", "HIGH", TRANSCRIPT)
+    dispatcher.submit("/etc/passwd", "HIGH", TRANSCRIPT)
+    dispatcher.stop()
+
+    written = [os.path.join(r, f) for r, _, files in os.walk(root) for f in files]
+    assert len(written) == 4
+    assert all(os.path.realpath(path).startswith(os.path.realpath(reports) + os.sep) for path in written)
+    assert dispatcher.metrics()["delivered"] == 2
+
+if __name__ == "__main__":
+    test_in_flight_reports_capped_at_workers()
+    test_directory_sink_stays_inside_directory()
+    print("[PASS] report dispatcher")
@@ -0,0 +1,86 @@
+"""
+IOC extraction: phone shapes are normalized to E.164, while dates, times,
+timestamps, card numbers and IPs are never reported as phones. The agent only
+keeps indicators that survive PII redaction unless raw evidence is enabled.
+"""
+import logging
+
+from agent import HoneypotAgent
+from config import IOC_SETTINGS
+from dispatcher import ReportDispatcher
+from iocs import IOCExtractor
+
+SETTINGS = {
+    "default_country_code": "91",
+    "domain_tlds": ["com", "net", "org", "io", "xyz", "top", "in", "info"],
+    "multi_part_suffixes": ["co.in", "co.uk"],
+}
+
+PHONES = {
+    "call +91 98765 43210 now": "+919876543210",
+    "+919876543210": "+919876543210",
+    "WhatsApp 98765-43210": "+919876543210",
+    "trunk 09876543210": "+919876543210",
+    "(555) 123-4567": "+915551234567",
+    "555.123.4567": "+915551234567",
+    "+1 (555) 123-4567.": "+15551234567",
+    "+44 20 7946 0958": "+442079460958",
+    "0044 20 7946 0958": "+442079460958",
+    "+91 98765 43210 2024-01-15": "+919876543210",
+    "at 12:30 call 9876543210": "+919876543210",
+}
+
+NOT_PHONES = [
+    "2024-01-15 12:30",
+    "2024-01-15T12:30:00Z",
+    "sent 15/01/2024 12:30",
+    "on 15.01.2024 at 12:30:45",
+    "+1 2024-01-15",
+    "epoch 1705312200",
+    "order 12345678",
+    "ref 9876543210123",
+    "card 1234-5678-9012-3456",
+    "ip 192.168.10.254",
+    "version 1.2.3.4",
+]
+
+def phones(extractor, text):
+    return [ioc.value for ioc in extractor.extract(text) if ioc.type == "PHONE"]
+
+def test_phone_shapes_normalized():
+    extractor = IOCExtractor(SETTINGS)
+    for text, expected in PHONES.items():
+        assert phones(extractor, text) == [expected], text
+
+def test_dates_and_numbers_are_not_phones():
+    extractor = IOCExtractor(SETTINGS)
+    for text in NOT_PHONES:
+        assert phones(extractor, text) == [], text
+
+def agent_iocs(text):
+    dispatcher = ReportDispatcher(coalesce_window=60.0)
+    try:
+        agent = HoneypotAgent(dispatcher=dispatcher)
+        agent.ingest({"conversation_id": "c1", "text": text})
+        return {ioc.type: ioc.value for ioc in agent.ioc_cache.get("c1")}
+    finally:
+        dispatcher.stop(flush=False)
+
+def test_agent_keeps_pii_out_of_iocs():
+    logging.disable(logging.INFO)
+    text = "Verify your wallet: mail refunds@evil-pay.xyz or call 555-123-4567 at http://evil-pay.xyz/login"
+    assert agent_iocs(text) == {"URL": "http://evil-pay.xyz/login", "DOMAIN": "evil-pay.xyz"}
+
+    IOC_SETTINGS["raw_evidence"] = True
+    try:
+        iocs = agent_iocs(text)
+    finally:
+        IOC_SETTINGS["raw_evidence"] = False
+    assert iocs["EMAIL"] == "refunds@evil-pay.xyz"
+    assert iocs["PHONE"] == "+915551234567"
+
+if __name__ == "__main__":
+    test_phone_shapes_normalized()
+    test_dates_and_numbers_are_not_phones()
+    test_agent_keeps_pii_out_of_iocs()
+    print("[PASS] IOC extraction")
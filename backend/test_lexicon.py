@@ -0,0 +1,31 @@
+"""
+LexiconIndex phrase markers: the single-scan counts match str.count per marker,
+and markers that would break that (prefixes of each other, self-overlapping)
+are rejected when the index is built.
+"""
+from config import LEXICONS, PHRASE_MARKERS
+from lexicon import LexiconIndex
+
+TEXTS = [
+    "you won the lottery prize, wonwon! claim the prizeprize",
+    "send btc to my crypto wallet, btcbtc walletwallet cryptocrypto",
+    "",
+]
+
+def test_phrase_counts_match_str_count():
+    index = LexiconIndex(LEXICONS, PHRASE_MARKERS)
+    for text in TEXTS:
+        assert index.count_phrases(text) == {m: text.count(m) for m in index.markers}, text
+
+def test_ambiguous_markers_rejected():
+    for markers in ({"x": ["aa"]}, {"x": ["abab"]}, {"x": ["win", "winner"]}):
+        try:
+            LexiconIndex(LEXICONS, markers)
+        except ValueError:
+            continue
+        raise AssertionError(f"{markers} accepted")
+
+if __name__ == "__main__":
+    test_phrase_counts_match_str_count()
+    test_ambiguous_markers_rejected()
+    print("[PASS] lexicon phrase markers")
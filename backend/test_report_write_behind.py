@@ -0,0 +1,179 @@
+"""
+ReportWriteBehind journal: replay after a crash is idempotent, filed reports
+are checkpointed and compacted away once they outnumber the pending ones, a report that keeps failing is quarantined
+instead of blocking the queue, and each queue instance (process) gets its own
+journal slot, adopting slots left behind by dead ones.
+Uses a throwaway SQLite file so the dev database is untouched.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from counters import read_counters
+from database import Base, Case
+from reports import ReportWriteBehind, journal_slot_path, read_journal
+
+logging.disable(logging.INFO)
+
+def make_db(tmp_dir):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'reports.db')}",
+                           connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def report(i, classification="job"):
+    return {"conversationId": f"wb-{i}", "scammerName": "s", "platform": "sms", "classification": classification,
+            "confidenceScore": 0.8, "transcript": [], "iocs": {}, "timestamp": "2026-10-18T00:30:00Z"}
+
+def totals(Session):
+    db = Session()
+    try:
+        return read_counters(db)["reports_filed"], db.query(Case).count()
+    finally:
+        db.close()
+
+def crash(queue):
+    """
+    Simulates the process dying: the journal and its slot lock are released, nothing is flushed.
+    """
+    queue.journal.close()
+    queue.journal_lock.close()
+
+def wait_metric(queue, metric, count, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while queue.metrics()[metric] < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_replay_after_commit_is_idempotent():
+    tmp_dir = tempfile.mkdtemp()
+    Session = make_db(tmp_dir)
+    journal = os.path.join(tmp_dir, "journal.log")
+
+    queue = ReportWriteBehind(Session, journal, flush_size=10, flush_interval=0.01)
+    queue.start()
+
+    queue._checkpoint = lambda seq: None  # batches commit, the crash loses their checkpoints
+    queue.submit([report(i) for i in range(20)])
+    wait_metric(queue, "flushed", 20)
+    assert totals(Session) == (20, 20)
+    crash(queue)
+
+    replay = ReportWriteBehind(Session, journal, flush_size=10, flush_interval=0.01)
+    replay.start()
+    replay.submit([report(5)])  # a genuine duplicate report still counts
+    replay.stop()
+    assert replay.metrics()["replayed"] == 20
+    assert totals(Session) == (21, 20)
+    assert os.path.getsize(journal) == 0
+
+def test_journal_checkpointed_then_compacted():
+    tmp_dir = tempfile.mkdtemp()
+    Session = make_db(tmp_dir)
+    journal = os.path.join(tmp_dir, "journal.log")
+
+    queue = ReportWriteBehind(Session, journal, flush_size=10, flush_interval=3600, compact_after=100)
+    queue.start()
+    queue.submit([report(i) for i in range(25)])
+    wait_metric(queue, "flushed", 20)
+    with open(journal) as f:
+        assert len(f.readlines()) == 27  # 25 reports and a checkpoint per batch, not yet compacted
+    assert [seq for seq, _ in read_journal(journal)[0]] == list(range(21, 26))
+    queue.stop()
+    assert totals(Session) == (25, 25)
+    assert os.path.getsize(journal) == 0
+
+    queue = ReportWriteBehind(Session, journal, flush_size=10, flush_interval=3600, compact_after=10)
+    queue.start()
+    compactions = queue.metrics()["compactions"]
+    queue.submit([report(i) for i in range(100, 125)])
+    wait_metric(queue, "compactions", compactions + 1)
+    with open(journal) as f:
+        assert len(f.readlines()) == 5  # 20 filed outnumber the 5 pending: only those are left
+    queue.stop()
+    assert totals(Session) == (50, 50)
+
+def test_failing_report_quarantined():
+    tmp_dir = tempfile.mkdtemp()
+    Session = make_db(tmp_dir)
+    journal = os.path.join(tmp_dir, "journal.log")
+
+    queue = ReportWriteBehind(Session, journal, flush_size=10, flush_interval=0.01, max_attempts=3)
+    queue.start()
+    reports = [report(i) for i in range(10)]
+    reports[3]["classification"] = None  # fails every time, like a NUL byte on Postgres
+    queue.submit(reports)
+    queue.submit([report(i) for i in range(10, 15)])
+    wait_metric(queue, "flushed", 14)
+    queue.stop()
+
+    metrics = queue.metrics()
+    assert metrics["quarantined"] == 1
+    assert metrics["pending"] == 0
+    assert totals(Session) == (14, 14)
+    with open(journal + ".quarantine") as f:
+        quarantined = [json.loads(line) for line in f]
+    assert [q["report"]["conversationId"] for q in quarantined] == ["wb-3"]
+
+def test_each_queue_gets_its_own_slot():
+    tmp_dir = tempfile.mkdtemp()
+    Session = make_db(tmp_dir)
+    journal = os.path.join(tmp_dir, "journal.log")
+
+    first = ReportWriteBehind(Session, journal, flush_size=1000, flush_interval=3600)
+    second = ReportWriteBehind(Session, journal, flush_size=1000, flush_interval=3600)
+    first.start()
+    second.start()
+    assert first.journal_path == journal
+    assert second.journal_path == journal_slot_path(journal, 1)
+
+    second.submit([report(i) for i in range(7)])
+    crash(second)
+
+    restarted = ReportWriteBehind(Session, journal, flush_size=1000, flush_interval=0.01)
+    restarted.start()  # slot 0 is still live, so it takes slot 1 back and replays it
+    assert restarted.journal_path == journal_slot_path(journal, 1)
+    restarted.stop()
+    assert totals(Session) == (7, 7)
+
+    first.submit([report(i) for i in range(100, 103)])
+    crash(first)
+    adopter = ReportWriteBehind(Session, journal, flush_size=1000, flush_interval=0.01)
+    adopter.start()
+    adopter.stop()
+    assert adopter.metrics()["replayed"] == 3
+    assert totals(Session) == (10, 10)
+
+def test_orphaned_slot_adopted_by_another_worker():
+    tmp_dir = tempfile.mkdtemp()
+    Session = make_db(tmp_dir)
+    journal = os.path.join(tmp_dir, "journal.log")
+
+    workers = [ReportWriteBehind(Session, journal, flush_size=1000, flush_interval=3600) for _ in range(3)]
+    for w in workers:
+        w.start()
+    workers[2].submit([report(i) for i in range(4)])
+    crash(workers[2])
+    crash(workers[1])
+
+    # A worker restarting into slot 1 also picks up the dead slot 2
+    replacement = ReportWriteBehind(Session, journal, flush_size=1000, flush_interval=0.01)
+    replacement.start()
+    assert replacement.journal_path == journal_slot_path(journal, 1)
+    assert not os.path.exists(journal_slot_path(journal, 2))
+    replacement.stop()
+    assert replacement.metrics()["replayed"] == 4
+    assert totals(Session) == (4, 4)
+    crash(workers[0])
+
+if __name__ == "__main__":
+    test_replay_after_commit_is_idempotent()
+    test_journal_checkpointed_then_compacted()
+    test_failing_report_quarantined()
+    test_each_queue_gets_its_own_slot()
+    test_orphaned_slot_adopted_by_another_worker()
+    print("[PASS] report write-behind")
@@ -0,0 +1,106 @@
+"""
+Fires parallel reports at /api/report and checks that no counter increment is lost.
+Uses a throwaway SQLite file so the dev database is untouched.
+"""
+import datetime
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import server
+from database import Base, Case, StatsRollup
+from rollups import ensure_buckets, record_cases
+
+HEADERS = {"X-Rakshak-Token": "rakshak-core-v1"}
+TYPES = ["romance", "crypto", "job", "lottery"]
+
+def test_parallel_reports_keep_totals(reports=200, workers=16):
+    logging.disable(logging.INFO)
+    tmp_dir = tempfile.mkdtemp()
+    test_engine = create_engine(
+        f"sqlite:///{os.path.join(tmp_dir, 'counters.db')}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=test_engine)
+    TestSession = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+    def override_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    server.app.dependency_overrides[server.get_db] = override_db
+    server.limiter.enabled = False
+    server.stats_cache.invalidate()
+    try:
+        client = TestClient(server.app)
+
+        def send(i):
+            payload = {
+                "conversationId": f"conv-{i}",
+                "scammerName": f"scammer-{i % 7}",
+                "platform": "sms",
+                "classification": TYPES[i % len(TYPES)],
+                "confidenceScore": 0.9,
+                "iocs": {},
+                "transcript": [],
+                "timestamp": "2026-01-01T00:00:00",
+            }
+            return client.post("/api/report", json=payload, headers=HEADERS).status_code
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            statuses = list(pool.map(send, range(reports)))
+        assert statuses == [200] * reports
+
+        stats = client.get("/api/stats", headers=HEADERS).json()
+        assert stats["reports_filed"] == reports
+        assert stats["scams_detected"] == reports
+        expected_types = {t.upper(): sum(1 for i in range(reports) if TYPES[i % len(TYPES)] == t) for t in TYPES}
+        assert stats["types"] == expected_types
+
+        db = TestSession()
+        assert db.query(Case).count() == reports
+        db.close()
+    finally:
+        server.app.dependency_overrides.pop(server.get_db, None)
+        server.limiter.enabled = True
+        server.stats_cache.invalidate()
+        test_engine.dispose()
+
+def test_rollup_bucket_created_by_upsert():
+    # Another request may create the hour's bucket first: inserting it again must be a no-op
+    tmp_dir = tempfile.mkdtemp()
+    test_engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'rollups.db')}")
+    Base.metadata.create_all(bind=test_engine)
+    TestSession = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    hour = datetime.datetime(2026, 1, 1, 10)
+    try:
+        first, second = TestSession(), TestSession()
+        ensure_buckets(first, [hour])
+        first.commit()
+        record_cases(second, [(hour.replace(minute=5), "job", "sms", "s1"), (hour.replace(minute=9), "romance", "sms", "s2")])
+        second.commit()
+        record_cases(first, [(hour.replace(minute=30), "job", "telegram", "s1")])
+        first.commit()
+
+        rollup = second.query(StatsRollup).one()
+        second.refresh(rollup)
+        assert rollup.cases == 3
+        assert rollup.types_json == {"JOB": 2, "ROMANCE": 1}
+        assert rollup.platforms_json == {"sms": 2, "telegram": 1}
+        first.close()
+        second.close()
+    finally:
+        test_engine.dispose()
+
+if __name__ == "__main__":
+    test_parallel_reports_keep_totals()
+    test_rollup_bucket_created_by_upsert()
+    print("[PASS] parallel report totals match")
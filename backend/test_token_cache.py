@@ -0,0 +1,66 @@
+"""
+Checks that the verified-token cache serves repeat lookups but never returns an expired token.
+"""
+import time
+from datetime import timedelta
+
+import security
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+def test_repeat_lookups_hit_cache():
+    cache = security.TokenCache(clock=FakeClock())
+    token = security.create_access_token({"sub": "operator"}, expires_delta=timedelta(minutes=5))
+    payload = security.decode_access_token(token)
+    cache.put(token, payload)
+    assert cache.get(token) == payload
+    assert cache.get(token) == payload
+    assert cache.stats()["hits"] == 2
+
+def test_entry_bounded_by_token_exp():
+    clock = FakeClock()
+    cache = security.TokenCache(ttl=3600, clock=clock)
+    token = security.create_access_token({"sub": "operator"}, expires_delta=timedelta(seconds=30))
+    payload = security.decode_access_token(token)
+    cache.put(token, payload)
+    clock.now = payload["exp"] - 1
+    assert cache.get(token) is not None
+    clock.now = payload["exp"]
+    assert cache.get(token) is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["size"] == 0
+
+def test_expired_token_not_served_after_caching():
+    security.token_cache.clear()
+    token = security.create_access_token({"sub": "operator"}, expires_delta=timedelta(seconds=1))
+    assert security.decode_access_token(token)["sub"] == "operator"
+    assert security.decode_access_token(token) is not None  # served from cache
+    stats = security.token_cache.stats()
+
+    # jose compares whole seconds, so wait until it rejects the token too
+    payload = security.token_cache.entries[token][0]
+    time.sleep(max(0.0, payload["exp"] + 1 - time.time()) + 0.05)
+    assert security.decode_access_token(token) is None
+    assert security.token_cache.stats()["hits"] == stats["hits"]
+    assert security.token_cache.stats()["expired"] == stats["expired"] + 1
+
+def test_size_cap_evicts_oldest():
+    cache = security.TokenCache(max_entries=2, clock=FakeClock())
+    tokens = [security.create_access_token({"sub": f"op{i}"}) for i in range(3)]
+    for token in tokens:
+        cache.put(token, security.decode_access_token(token))
+    assert cache.get(tokens[0]) is None
+    assert cache.get(tokens[2]) is not None
+    assert cache.stats()["evictions"] == 1
+
+if __name__ == "__main__":
+    test_repeat_lookups_hit_cache()
+    test_entry_bounded_by_token_exp()
+    test_expired_token_not_served_after_caching()
+    test_size_cap_evicts_oldest()
+    print("[PASS] token cache")
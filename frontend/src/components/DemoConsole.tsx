@@ -1,7 +1,7 @@
 import React, { useState } from 'react';
 
 import { Shield, ShieldAlert, CheckCircle, AlertTriangle, Play, RefreshCw, Terminal, Search, Zap } from 'lucide-react';
-import { API_BASE_URL } from '../lib/config';
+import { API_BASE_URL, DEEP_SCAN_DELAY_MS } from '../lib/config';
 
 export const DemoConsole: React.FC = () => {
     const [input, setInput] = useState('');
@@ -26,6 +26,9 @@ export const DemoConsole: React.FC = () => {
             if (res.ok) {
                 const data = await res.json();
                 console.log("Backend Analysis:", data);
+                if (DEEP_SCAN_DELAY_MS > 0) {
+                    await new Promise(resolve => setTimeout(resolve, DEEP_SCAN_DELAY_MS));
+                }
                 setResult(data);
             } else {
                 console.error("Analysis failed");
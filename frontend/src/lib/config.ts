@@ -246,3 +246,7 @@ if (!rawUrl && !import.meta.env.DEV) {
 }
 
 export const API_BASE_URL = rawUrl;
+
+// Optional cosmetic "Deep Scan" delay for the analysis lab, in ms (off unless VITE_DEEP_SCAN_DELAY_MS is set).
+// The backend no longer sleeps, so this only affects the client that asks for it.
+export const DEEP_SCAN_DELAY_MS = Number(import.meta.env.VITE_DEEP_SCAN_DELAY_MS || 0);
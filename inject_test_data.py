@@ -1,22 +1,20 @@
 import os
+import sys
 from datetime import datetime, timedelta, timezone
-from backend.database import SessionLocal, Case, Stats
 import random
 
+# Backend modules import each other by their flat names
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from database import SessionLocal, Case
+from counters import REPORTS_FILED, SCAMS_DETECTED, increment
+from rollups import record_case
+
 def inject_historical_data():
     db = SessionLocal()
     
-    # 1. Update overall stats table
-    stats = db.query(Stats).first()
-    if not stats:
-        stats = Stats(reports_filed=0, scams_detected=0, types_json={})
-        db.add(stats)
-        
-    stats.reports_filed += 45
-    stats.scams_detected += 45
-
+    # 1. Update the overall counters /api/stats reads
     types = {"ROMANCE": 12, "CRYPTO": 15, "JOB": 8, "LOTTERY": 5, "TECHNICAL_SUPPORT": 5}
-    stats.types_json = types
+    increment(db, {REPORTS_FILED: 45, SCAMS_DETECTED: 45, **types})
     
     # 2. Add historically staggered Cases
     now = datetime.now(timezone.utc)
@@ -49,6 +47,7 @@ def inject_historical_data():
             auto_reported=True
         )
         db.add(c)
+        record_case(db, c)  # today/week/month windows come from the hourly rollups
         
     db.commit()
     print("Historical case data injected successfully!")